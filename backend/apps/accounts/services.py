@@ -2,7 +2,7 @@ from django.contrib.auth import get_user_model
 from django.utils import timezone
 from django.contrib.auth import update_session_auth_hash
 from django.contrib.auth.tokens import default_token_generator
-from django.utils.http import urlsafe_base_64_encode
+from django.utils.http import urlsafe_base64_encode
 from django.utils.encoding import force_bytes
 from django.core.mail import send_mail
 from django.template.loader import render_to_string
@@ -48,7 +48,7 @@ def resend_activation_code(email):
 
 def send_password_reset_email(user):
     token = default_token_generator.make_token(user)
-    uid = urlsafe_base_64_encode(force_bytes(user.pk))
+    uid = urlsafe_base64_encode(force_bytes(user.pk))
     reset_url = f"{settings.FRONTEND_URL}/password/reset/confirm/?uid={uid}&token={token}"
     subject = "Reset your password"
     message = render_to_string(
@@ -2,6 +2,7 @@ from django.contrib import admin
 from .models.hotel_model import Hotel, HotelLocation, HotelImage, Amenity
 from .models.room_model import Room, RoomImage
 from apps.notifications.tasks import send_custom_notification
+from .api.v1.services.cached_manager import SimpleCacheManager
 
 
 class HotelImageInline(admin.TabularInline):
@@ -44,6 +45,8 @@ class HotelAdmin(admin.ModelAdmin):
     @admin.action(description="Mark selected hotels as verified")
     def mark_as_verified(self, request, queryset):
         updated = queryset.update(is_verified=True)
+        # update() bypasses the model signals: invalidate the lists once.
+        SimpleCacheManager.invalidate_model_list("hotel")
         for hotel in queryset:
             if hotel.owner:
                 send_custom_notification.delay(
@@ -58,6 +61,7 @@ class HotelAdmin(admin.ModelAdmin):
     @admin.action(description="Mark selected hotels as unverified")
     def mark_as_unverified(self, request, queryset):
         updated = queryset.update(is_verified=False)
+        SimpleCacheManager.invalidate_model_list("hotel")
         self.message_user(
             request, f"{updated} hotels successfully marked as unverified."
         )
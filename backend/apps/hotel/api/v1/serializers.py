@@ -231,6 +231,48 @@ class RoomListSerializer(serializers.ModelSerializer):
         ]
 
 
+# ----------- Room Availability Search Serializers -----------
+
+
+class RoomSearchSerializer(serializers.Serializer):
+    """Validates the query parameters of the room availability search."""
+
+    city = serializers.CharField(required=False, allow_blank=True)
+    check_in = serializers.DateField()
+    check_out = serializers.DateField()
+    guests = serializers.IntegerField(min_value=1, default=1)
+    min_price = serializers.DecimalField(
+        max_digits=10, decimal_places=2, required=False
+    )
+    max_price = serializers.DecimalField(
+        max_digits=10, decimal_places=2, required=False
+    )
+
+    def validate(self, attrs):
+        if attrs["check_in"] >= attrs["check_out"]:
+            raise serializers.ValidationError(
+                {"check_out": "Check-out date must be after check-in date."}
+            )
+
+        min_price = attrs.get("min_price")
+        max_price = attrs.get("max_price")
+        if min_price is not None and max_price is not None and min_price > max_price:
+            raise serializers.ValidationError(
+                {"max_price": "Maximum price must not be lower than minimum price."}
+            )
+        return attrs
+
+
+class AvailableRoomSerializer(RoomListSerializer):
+    hotel_name = serializers.CharField(source="hotel.name", read_only=True)
+    city = serializers.CharField(
+        source="hotel.location.city", default=None, read_only=True
+    )
+
+    class Meta(RoomListSerializer.Meta):
+        fields = RoomListSerializer.Meta.fields + ["hotel_name", "city", "capacity"]
+
+
 # ----------- Room Detail Serializer -----------
 
 
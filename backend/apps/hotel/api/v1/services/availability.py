@@ -0,0 +1,39 @@
+from django.db.models import Exists, OuterRef
+
+from apps.hotel.models import Room
+from apps.reservations.models import RoomNight
+
+
+def search_available_rooms(
+    check_in,
+    check_out,
+    city=None,
+    guests=None,
+    min_price=None,
+    max_price=None,
+):
+    """
+    Returns every bookable room that is free for the whole stay, across hotels.
+
+    Availability is resolved in a single set-based query: rooms are matched
+    against the booked-night inventory with a NOT EXISTS anti-join instead of
+    calling `is_room_available` once per room.
+    """
+    conflicts = RoomNight.objects.booked_between(check_in, check_out).filter(
+        room_id=OuterRef("pk")
+    )
+
+    rooms = Room.available.filter(hotel__is_verified=True).filter(~Exists(conflicts))
+
+    if city:
+        rooms = rooms.filter(hotel__location__city__iexact=city)
+    if guests:
+        rooms = rooms.filter(capacity__gte=guests)
+    if min_price is not None:
+        rooms = rooms.filter(price_per_night__gte=min_price)
+    if max_price is not None:
+        rooms = rooms.filter(price_per_night__lte=max_price)
+
+    return rooms.select_related("hotel", "hotel__location").order_by(
+        "price_per_night", "id"
+    )
@@ -1,12 +1,96 @@
+from collections import OrderedDict
+from urllib.parse import parse_qs, urlencode, urlsplit
+from django.conf import settings
 from django.core.cache import cache
 from django.utils.text import slugify
+from django_redis import get_redis_connection
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import replace_query_param
 import hashlib
+import threading
+import time
+import uuid
+
+
+class LocalLRUCache:
+    """
+    A small thread-safe, per-process LRU cache with a TTL on every entry.
+    Used as the first tier in front of Redis for hot, version-stamped keys.
+    """
+
+    def __init__(self, max_entries=256, timeout=30):
+        self.max_entries = max_entries
+        self.timeout = timeout
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return default
+            value, expires_at = item
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                return default
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value, timeout=None):
+        if self.max_entries <= 0:
+            return
+        ttl = self.timeout if timeout is None else min(timeout, self.timeout)
+        with self._lock:
+            self._data[key] = (value, time.monotonic() + ttl)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+_local_cache = None
+
+# Deletes the lock only if it still holds our token: once it expired, another
+# worker may own it.
+RELEASE_LOCK_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("del", KEYS[1])
+end
+return 0
+"""
+
+# Renews the lock's expiry only if it still holds our token.
+EXTEND_LOCK_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("expire", KEYS[1], ARGV[2])
+end
+return 0
+"""
+
 
 class SimpleCacheManager:
     """
     A generic cache manager for handling caching logic across models.
+
+    List entries are version-stamped instead of being deleted: every list key
+    embeds the current generation counters of its model and filter scope, so
+    invalidation is an O(1) INCR of a counter and stale entries simply stop
+    being read (they expire on their own TTL). No key scans are needed.
     """
 
+    # Scope used by list requests that are not narrowed by a scoped filter
+    # (e.g. the unfiltered hotel list or a plain search).
+    ALL_SCOPE = "all"
+
+    # get_or_set: how long a stale entry stays in Redis after its soft expiry,
+    # how long a rebuild may hold the lock, and how often waiters poll.
+    STALE_GRACE = 300
+    REBUILD_LOCK_TIMEOUT = 30
+    POLL_INTERVAL = 0.05
+
     @staticmethod
     def generate_key(model_name, **filters):
         """
@@ -20,14 +104,164 @@ class SimpleCacheManager:
         return ':'.join(key_parts)
 
     @staticmethod
-    def generate_list_key(model_name, request):
+    def _model_version_key(model_name):
+        return f"{model_name}_version"
+
+    @staticmethod
+    def _scope_version_key(model_name, **filters):
+        scope = SimpleCacheManager.generate_key(f"{model_name}_version", **filters)
+        if scope == f"{model_name}_version":
+            scope = f"{scope}:{SimpleCacheManager.ALL_SCOPE}"
+        return scope
+
+    @staticmethod
+    def _initial_version():
+        # Counters never expire, but if one is evicted it restarts from the
+        # clock rather than 1, so it can't collide with a generation that is
+        # still cached.
+        return int(time.time() * 1000)
+
+    @staticmethod
+    def get_versions(model_name, **filters):
+        """
+        Return the (model, scope) generation numbers for a list cache key.
+        Both counters are read in a single round-trip.
+        """
+        keys = [
+            SimpleCacheManager._model_version_key(model_name),
+            SimpleCacheManager._scope_version_key(model_name, **filters),
+        ]
+        versions = cache.get_many(keys)
+        for key in keys:
+            if key not in versions:
+                cache.add(key, SimpleCacheManager._initial_version(), timeout=None)
+                versions[key] = cache.get(key)
+        return tuple(versions[key] for key in keys)
+
+    @staticmethod
+    def bump_version(key):
+        """Start a new generation for the given counter (atomic INCR)."""
+        try:
+            return cache.incr(key)
+        except ValueError:
+            # Counter was never created (or evicted): start a fresh one.
+            cache.set(key, SimpleCacheManager._initial_version(), timeout=None)
+
+    # Paginator attributes naming the query params that select a page.
+    PAGINATION_PARAM_ATTRS = (
+        "page_query_param",
+        "page_size_query_param",
+        "cursor_query_param",
+        "limit_query_param",
+        "offset_query_param",
+    )
+
+    @staticmethod
+    def _list_query_params(view):
+        """Query params that can change the response of a list view."""
+        params = set()
+        filterset_fields = getattr(view, "filterset_fields", None) or []
+        if isinstance(filterset_fields, dict):
+            for field, lookups in filterset_fields.items():
+                params.update(
+                    field if lookup == "exact" else f"{field}__{lookup}"
+                    for lookup in lookups
+                )
+        else:
+            params.update(filterset_fields)
+        if getattr(view, "search_fields", None):
+            params.add(api_settings.SEARCH_PARAM)
+        if getattr(view, "ordering_fields", None):
+            params.add(api_settings.ORDERING_PARAM)
+        paginator = getattr(view, "paginator", None)
+        for attr in SimpleCacheManager.PAGINATION_PARAM_ATTRS:
+            name = getattr(paginator, attr, None)
+            if name:
+                params.add(name)
+        return params
+
+    @staticmethod
+    def canonical_query(request, view):
         """
-        Generate a unique cache key for list views based on request path.
-        Uses MD5 hash of full path to avoid overly long keys.
+        Build a canonical query string for a list request: only the params the
+        view actually uses (filters, search, ordering, pagination), in sorted
+        order, with empty values dropped and the search term case-folded.
+        Tracking params like utm_* or a reordered query share the same key.
         """
-        full_path = request.get_full_path()
+        search_param = api_settings.SEARCH_PARAM
+        parts = []
+        for name in sorted(SimpleCacheManager._list_query_params(view)):
+            values = request.query_params.getlist(name)
+            if name == search_param:
+                # SearchFilter is case-insensitive and splits on whitespace.
+                values = [" ".join(value.split()).casefold() for value in values]
+            parts.extend((name, value) for value in sorted(values) if value)
+        return urlencode(parts)
+
+    @staticmethod
+    def page_to_cache(data, paginator):
+        """
+        A cursor-paginated response body without its next/previous links.
+        Those are absolute URLs built from the request (host, tracking params),
+        so only their cursor tokens are kept for requests sharing the key.
+        """
+        param = paginator.cursor_query_param
+        cached = dict(data)
+        for link in ("next", "previous"):
+            url = cached.pop(link)
+            cached[f"{link}_cursor"] = (
+                parse_qs(urlsplit(url).query)[param][0] if url else None
+            )
+        return cached
+
+    @staticmethod
+    def page_from_cache(cached, request, paginator):
+        """Rebuild the links of a page_to_cache() body for this request."""
+        data = dict(cached)
+        url = request.build_absolute_uri()
+        for link in ("next", "previous"):
+            cursor = data.pop(f"{link}_cursor")
+            data[link] = (
+                replace_query_param(url, paginator.cursor_query_param, cursor)
+                if cursor
+                else None
+            )
+        return {"next": data.pop("next"), "previous": data.pop("previous"), **data}
+
+    @staticmethod
+    def generate_list_key(model_name, request, view=None, **filters):
+        """
+        Generate a unique cache key for list views based on the request query.
+        Uses MD5 hash of the query to avoid overly long keys, and embeds the
+        model and scope generations so invalidated entries are never read.
+        When the view is given, the query is canonicalized (see canonical_query),
+        otherwise the full path is used verbatim.
+        Example: generate_list_key('hotel', request, view=self, city='tehran')
+        """
+        model_version, scope_version = SimpleCacheManager.get_versions(
+            model_name, **filters
+        )
+        if view is not None:
+            query = SimpleCacheManager.canonical_query(request, view)
+            full_path = f"{request.path}?{query}"
+        else:
+            full_path = request.get_full_path()
         path_hash = hashlib.md5(full_path.encode()).hexdigest()[:12]
-        return f"{model_name}_list:{path_hash}"
+        scope = SimpleCacheManager.generate_key(f"{model_name}_list", **filters)
+        return f"{scope}:v{model_version}.{scope_version}:{path_hash}"
+
+    @staticmethod
+    def local_cache():
+        """
+        Return this process's LRU tier, sized from SIMPLE_CACHE_LOCAL_* settings.
+        """
+        global _local_cache
+        if _local_cache is None:
+            _local_cache = LocalLRUCache(
+                max_entries=getattr(settings, "SIMPLE_CACHE_LOCAL_MAX_ENTRIES", 256),
+                timeout=getattr(settings, "SIMPLE_CACHE_LOCAL_TIMEOUT", 30),
+            )
+        return _local_cache
 
     @staticmethod
     def get(key):
@@ -40,29 +274,120 @@ class SimpleCacheManager:
         cache.set(key, data, timeout)
 
     @staticmethod
-    def invalidate_pattern(pattern):
+    def _store_envelope(key, value, timeout, local=False):
+        envelope = {"value": value, "fresh_until": time.time() + timeout}
+        cache.set(key, envelope, timeout + SimpleCacheManager.STALE_GRACE)
+        if local:
+            SimpleCacheManager.local_cache().set(key, envelope, timeout)
+
+    @staticmethod
+    def _rebuild(key, builder, timeout, local=False):
+        value = builder()
+        SimpleCacheManager._store_envelope(key, value, timeout, local=local)
+        return value
+
+    @staticmethod
+    def acquire_lock(lock_key, timeout=None):
+        """
+        Take the lock with a unique token (SET NX EX); None if it is held.
+        The lock expires after `timeout` seconds (REBUILD_LOCK_TIMEOUT).
+        """
+        token = uuid.uuid4().hex
+        acquired = get_redis_connection("default").set(
+            cache.make_key(lock_key),
+            token,
+            nx=True,
+            ex=timeout or SimpleCacheManager.REBUILD_LOCK_TIMEOUT,
+        )
+        return token if acquired else None
+
+    @staticmethod
+    def extend_lock(lock_key, token, timeout):
+        """Push the lock's expiry out; False if it is no longer ours."""
+        return bool(
+            get_redis_connection("default").eval(
+                EXTEND_LOCK_SCRIPT, 1, cache.make_key(lock_key), token, timeout
+            )
+        )
+
+    @staticmethod
+    def release_lock(lock_key, token):
+        """Release the lock, unless it expired and another worker took it."""
+        get_redis_connection("default").eval(
+            RELEASE_LOCK_SCRIPT, 1, cache.make_key(lock_key), token
+        )
+
+    @staticmethod
+    def get_or_set(key, builder, timeout=300, local=False, wait=2.0):
         """
-        Delete all cache keys matching a given pattern.
-        Useful for bulk invalidation.
+        Return the cached value for key, computing it with builder() on a miss.
+
+        Only one worker recomputes an entry at a time (single-flight):
+        - fresh entry: returned as is.
+        - stale entry (past `timeout` but within STALE_GRACE): the worker that
+          wins the rebuild lock recomputes it, everyone else keeps serving
+          the stale value meanwhile.
+        - cold miss: the lock winner builds it, the others wait up to `wait`
+          seconds for the result before building it themselves.
         """
-        cache.delete_pattern(pattern)
+        now = time.time()
+        envelope = None
+        if local:
+            envelope = SimpleCacheManager.local_cache().get(key)
+        if envelope is None:
+            envelope = cache.get(key)
+            if local and envelope is not None and envelope["fresh_until"] > now:
+                SimpleCacheManager.local_cache().set(
+                    key, envelope, envelope["fresh_until"] - now
+                )
+        if envelope is not None and envelope["fresh_until"] > now:
+            return envelope["value"]
+
+        lock_key = f"{key}:rebuild"
+        token = SimpleCacheManager.acquire_lock(lock_key)
+        if token is not None:
+            try:
+                return SimpleCacheManager._rebuild(key, builder, timeout, local)
+            finally:
+                SimpleCacheManager.release_lock(lock_key, token)
+
+        if envelope is not None:
+            # Someone else is refreshing it: serve stale while revalidating.
+            return envelope["value"]
+
+        deadline = now + wait
+        while time.time() < deadline:
+            time.sleep(SimpleCacheManager.POLL_INTERVAL)
+            envelope = cache.get(key)
+            if envelope is not None:
+                return envelope["value"]
+        return SimpleCacheManager._rebuild(key, builder, timeout, local)
 
     @staticmethod
     def invalidate_model_list(model_name):
         """
-        Delete all list cache entries for a given model.
+        Invalidate all list cache entries for a given model, whatever their scope.
         """
-        cache.delete_pattern(f"{model_name}_list:*")
+        SimpleCacheManager.bump_version(
+            SimpleCacheManager._model_version_key(model_name)
+        )
 
     @staticmethod
     def invalidate_by_filters(model_name, **filters):
         """
         Smart invalidation based on filters.
         Example: invalidate_by_filters('hotel', city='tehran')
+
+        Invalidates lists scoped to these filters plus the unscoped lists
+        (which contain every row); lists scoped to other values stay cached.
         """
-        if filters:
-            pattern = SimpleCacheManager.generate_key(model_name, **filters) + "*"
-            cache.delete_pattern(pattern)
+        if any(filters.values()):
+            SimpleCacheManager.bump_version(
+                SimpleCacheManager._scope_version_key(model_name, **filters)
+            )
+            SimpleCacheManager.bump_version(
+                SimpleCacheManager._scope_version_key(model_name)
+            )
         else:
             # If no filters provided, invalidate all list caches for the model
-            SimpleCacheManager.invalidate_model_list(model_name)
\ No newline at end of file
+            SimpleCacheManager.invalidate_model_list(model_name)
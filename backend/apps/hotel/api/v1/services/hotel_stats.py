@@ -0,0 +1,93 @@
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import Count, F, FloatField, OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Cast, Coalesce, NullIf
+
+from apps.hotel.models import Hotel, HotelStats, Room
+from apps.reservations.models import COUNTED_BOOKING_STATUSES, Reservation
+from apps.reviews.models import Review
+
+
+def _per_hotel(queryset, hotel_field, aggregate):
+    """
+    Correlated subquery aggregating the rows of `queryset` that belong to the
+    outer hotel. Each relation is aggregated on its own, so rooms, reservations
+    and reviews never get joined together and multiplied.
+    """
+    return Subquery(
+        queryset.filter(**{hotel_field: OuterRef("pk")})
+        .order_by()
+        .values(hotel_field)
+        .annotate(value=aggregate)
+        .values("value")
+    )
+
+
+def annotate_stored_stats(queryset):
+    """
+    Annotates hotels with their HotelStats counters: room_count,
+    total_reviews, reservations_count and total_revenue (bookings in
+    COUNTED_BOOKING_STATUSES) and avg_rating (top-level reviews only).
+    A single LEFT JOIN on the one-to-one table instead of aggregating joins.
+    """
+    return queryset.annotate(
+        room_count=Coalesce(F("stats__room_count"), 0),
+        total_reviews=Coalesce(F("stats__review_count"), 0),
+        reservations_count=Coalesce(F("stats__confirmed_reservations"), 0),
+        total_revenue=Coalesce(F("stats__revenue"), Value(Decimal("0"))),
+        avg_rating=Cast("stats__rating_sum", FloatField())
+        / NullIf(F("stats__rating_count"), 0),
+    )
+
+
+@transaction.atomic
+def rebuild_hotel_stats(batch_size=500):
+    """
+    Recomputes every HotelStats row from the source tables and upserts it.
+    Returns the number of hotels processed.
+    """
+    confirmed = Reservation.objects.filter(booking_status__in=COUNTED_BOOKING_STATUSES)
+    top_level = Review.objects.filter(parent__isnull=True)
+    hotels = Hotel.objects.order_by().annotate(
+        room_total=Coalesce(_per_hotel(Room.objects.all(), "hotel", Count("id")), 0),
+        review_total=Coalesce(
+            _per_hotel(Review.objects.all(), "hotel", Count("id")), 0
+        ),
+        rating_total=Coalesce(_per_hotel(top_level, "hotel", Sum("rating")), 0),
+        rated_total=Coalesce(_per_hotel(top_level, "hotel", Count("id")), 0),
+        confirmed_total=Coalesce(
+            _per_hotel(confirmed, "room__hotel", Count("id")), 0
+        ),
+        revenue_total=Coalesce(
+            _per_hotel(confirmed, "room__hotel", Sum("total_price")),
+            Value(Decimal("0")),
+        ),
+    )
+    stats = [
+        HotelStats(
+            hotel_id=hotel.id,
+            room_count=hotel.room_total,
+            review_count=hotel.review_total,
+            rating_sum=hotel.rating_total,
+            rating_count=hotel.rated_total,
+            confirmed_reservations=hotel.confirmed_total,
+            revenue=hotel.revenue_total,
+        )
+        for hotel in hotels.iterator(chunk_size=batch_size)
+    ]
+    HotelStats.objects.bulk_create(
+        stats,
+        batch_size=batch_size,
+        update_conflicts=True,
+        unique_fields=["hotel"],
+        update_fields=[
+            "room_count",
+            "review_count",
+            "rating_sum",
+            "rating_count",
+            "confirmed_reservations",
+            "revenue",
+        ],
+    )
+    return len(stats)
@@ -52,6 +52,11 @@ urlpatterns = [
         views.RoomListCreateView.as_view(),
         name="room-list-create",
     ),  # List or create rooms for a hotel
+    path(
+        "rooms/search/",
+        views.RoomAvailabilitySearchView.as_view(),
+        name="room-search",
+    ),  # Date-range availability search across hotels
     path(
         "rooms/<slug:slug>/", views.RoomDetailView.as_view(), name="room-detail"
     ),  # Room detail view by slug
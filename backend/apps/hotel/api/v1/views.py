@@ -1,12 +1,16 @@
 # Core Django & DRF
 from django.db import connection, reset_queries
 from django.shortcuts import get_object_or_404
-from django.db.models import Count, F, Sum, Avg
+from django.db.models import Count, F
 from django.db.models import Prefetch
 from rest_framework import generics
 from rest_framework.decorators import api_view
 from rest_framework.exceptions import ValidationError
-from rest_framework.permissions import IsAuthenticated, IsAuthenticatedOrReadOnly
+from rest_framework.permissions import (
+    AllowAny,
+    IsAuthenticated,
+    IsAuthenticatedOrReadOnly,
+)
 from rest_framework.response import Response
 from rest_framework import viewsets
 from django_filters.rest_framework import DjangoFilterBackend
@@ -26,13 +30,18 @@ from .serializers import (
     RoomListSerializer,
     RoomImageSerializer,
     RoomDetailSerializer,
+    RoomSearchSerializer,
+    AvailableRoomSerializer,
     AmenitySerializer,
 )
+from core.pagination import CreatedAtCursorPagination, PriceCursorPagination
 from apps.hotel.models import Hotel, HotelImage, Amenity, HotelLocation, Room, RoomImage
 from apps.reservations.models import Reservation
 from apps.notifications.tasks import send_custom_notification
 from .filters import RoomFilter
 from .services.cached_manager import SimpleCacheManager
+from .services.availability import search_available_rooms
+from .services.hotel_stats import annotate_stored_stats
 from django.conf import settings
 
 @api_view(["GET"])
@@ -46,6 +55,7 @@ def api_overview(request):
             "hotels/<int:hotel_id>/images/": "GET (list) | POST (create)",
             "hotels/<int:hotel_id>/images/<int:image_id>/": "GET | PUT | DELETE",
             "hotels/<int:hotel_id>/rooms/": "GET (list) | POST (create)",
+            "rooms/search/": "GET (available rooms across hotels for a date range)",
             "rooms/<slug>/": "GET (detail)",
             "rooms/<int:room_id>/images/": "GET (list) | POST (create)",
             "hotels/<int:hotel_id>/amenities/": "GET (list) | POST (add) | DELETE (remove)",
@@ -66,33 +76,45 @@ class HotelListCreateView(generics.ListCreateAPIView):
     filterset_fields = ["location__city"]
     search_fields = ["name", "description"]
     ordering_fields = ["created_at"]
+    ordering = ["-created_at", "-id"]
     filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
+    pagination_class = CreatedAtCursorPagination
 
     def list(self, request, *args, **kwargs):
         """
         Returns a cached list of verified hotels unless in DEBUG mode.
-        Cache key is generated based on request path.
+        Cache key is generated from the canonical query and is scoped by city,
+        so a change in one city doesn't evict the lists of other cities.
         """
         if settings.DEBUG:
             return super().list(request, *args, **kwargs)
 
-        cache_key = SimpleCacheManager.generate_list_key('hotel', request)
-        cached_data = SimpleCacheManager.get(cache_key)
-
-        if cached_data is not None:
-            # Optional: log cache hit
-            return Response(cached_data)
-
-        response = super().list(request, *args, **kwargs)
-        SimpleCacheManager.set(cache_key, response.data, timeout=300)  # 5 minutes
-        return response
+        cache_key = SimpleCacheManager.generate_list_key(
+            'hotel',
+            request,
+            view=self,
+            city=request.query_params.get("location__city"),
+        )
+        uncached_list = super().list
+        # Warm pages come from the in-process tier; Redis is only asked for the
+        # two version counters in the key (one round-trip). Only one worker
+        # rebuilds an expired page (5 minutes TTL).
+        data = SimpleCacheManager.get_or_set(
+            cache_key,
+            lambda: SimpleCacheManager.page_to_cache(
+                uncached_list(request, *args, **kwargs).data, self.paginator
+            ),
+            timeout=300,
+            local=True,
+        )
+        return Response(
+            SimpleCacheManager.page_from_cache(data, request, self.paginator)
+        )
 
     def get_queryset(self):
+        # Counters come from the HotelStats table, no aggregation per request
         queryset = (
-            Hotel.verified.annotate(
-                room_count=Count("rooms", distinct=True),
-                total_reviews=Count("reviews", distinct=True),
-            )
+            annotate_stored_stats(Hotel.verified.all())
             .only("id", "name", "description", "owner_id", "created_at", "location")
             .select_related("owner", "location")
             .prefetch_related(
@@ -129,10 +151,7 @@ class HotelDetailView(generics.RetrieveUpdateAPIView):
 
     permission_classes = [IsHotelOwnerOrReadOnly]
     queryset = (
-        Hotel.verified.annotate(
-            room_count=Count("rooms", distinct=True),
-            total_reviews=Count("reviews", distinct=True),
-        )
+        annotate_stored_stats(Hotel.verified.all())
         .select_related("owner", "location")
         .prefetch_related(
             "images", Prefetch(
@@ -188,7 +207,7 @@ class HotelImageDetailView(generics.RetrieveUpdateDestroyAPIView):
 
     def get_object(self):
         hotel_id = self.kwargs["hotel_id"]
-        image_id = self.kwargs["pk"]
+        image_id = self.kwargs["image_id"]
         return get_object_or_404(HotelImage, id=image_id, hotel_id=hotel_id)
 
 
@@ -240,9 +259,9 @@ class HotelAmenitiesViewSet(viewsets.ModelViewSet):
 class OnwerHotelListView(generics.ListAPIView):
     """
     Lists hotels owned by the authenticated user along with stats:
-      - reservations_count
-      - total_revenue
-      - avg_rating
+      - reservations_count (confirmed, checked-in and checked-out bookings)
+      - total_revenue (of those bookings)
+      - avg_rating (top-level reviews; replies don't rate the hotel)
       - popular_rooms (top 3 rooms by reservations)
     """
 
@@ -250,17 +269,22 @@ class OnwerHotelListView(generics.ListAPIView):
     serializer_class = HotelListSerializer
 
     def get_queryset(self):
+        # Stats are read from the HotelStats counters, no aggregation per request.
         return (
-            Hotel.verified.filter(owner=self.request.user)
-            .annotate(
-                room_count=Count("rooms", distinct=True),
-                total_reviews=Count("reviews", distinct=True),
-                reservations_count=Count("rooms__reservations", distinct=True),
-                total_revenue=Sum("rooms__reservations__total_price"),
-                avg_rating=Avg("reviews__rating"),
-            )
+            annotate_stored_stats(Hotel.verified.filter(owner=self.request.user))
             .select_related("location", "owner")
-            .prefetch_related("images")
+            .prefetch_related(
+                "images",
+                # Sliced prefetch: Django runs one query for the whole page with
+                # ROW_NUMBER() OVER (PARTITION BY hotel_id ...) <= 3.
+                Prefetch(
+                    "rooms",
+                    queryset=Room.objects.annotate(
+                        reservations_count=Count("reservations")
+                    ).order_by("-reservations_count", "id")[:3],
+                    to_attr="popular_rooms",
+                ),
+            )
         )
 
     def list(self, request, *args, **kwargs):
@@ -292,13 +316,8 @@ class OnwerHotelListView(generics.ListAPIView):
                 float(avg_rating) if avg_rating is not None else None
             )
 
-            top_rooms = (
-                Room.objects.filter(hotel=hotel)
-                .annotate(reservations_count=Count("reservations"))
-                .order_by("-reservations_count")[:3]
-            )
             data[idx]["popular_rooms"] = RoomListSerializer(
-                top_rooms, many=True, context={"request": request}
+                hotel.popular_rooms, many=True, context={"request": request}
             ).data
 
         if page is not None:
@@ -318,12 +337,12 @@ class RoomListCreateView(generics.ListCreateAPIView):
     filterset_class = RoomFilter
     search_fields = ["title", "description"]
     ordering_fields = ["price_per_night", "capacity", "floor"]
+    ordering = ["price_per_night", "id"]
+    pagination_class = PriceCursorPagination
 
     def get_queryset(self):
-        return (
-            Room.available.filter(hotel_id=self.kwargs["hotel_id"])
-            .select_related("hotel")
-            .order_by("price_per_night")
+        return Room.available.filter(hotel_id=self.kwargs["hotel_id"]).select_related(
+            "hotel"
         )
 
     def get_serializer_class(self):
@@ -340,6 +359,28 @@ class RoomListCreateView(generics.ListCreateAPIView):
         serializer.save(hotel=hotel)
 
 
+class RoomAvailabilitySearchView(generics.ListAPIView):
+    """
+    Searches free rooms across all verified hotels for a date range.
+
+    Query params: ?check_in=YYYY-MM-DD&check_out=YYYY-MM-DD
+    Optional: &city=<name>&guests=<n>&min_price=<amount>&max_price=<amount>
+    Results are cursor-paginated, cheapest first.
+    """
+
+    serializer_class = AvailableRoomSerializer
+    permission_classes = [AllowAny]
+    filter_backends = [OrderingFilter]
+    ordering_fields = ["price_per_night", "capacity"]
+    ordering = ["price_per_night", "id"]
+    pagination_class = PriceCursorPagination
+
+    def get_queryset(self):
+        params = RoomSearchSerializer(data=self.request.query_params)
+        params.is_valid(raise_exception=True)
+        return search_available_rooms(**params.validated_data)
+
+
 class RoomDetailView(generics.RetrieveUpdateDestroyAPIView):
     """Retrieve, update or delete a single room by slug."""
 
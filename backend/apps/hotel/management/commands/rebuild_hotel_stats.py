@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from apps.hotel.api.v1.services.hotel_stats import rebuild_hotel_stats
+
+
+class Command(BaseCommand):
+    help = "Recompute the denormalized HotelStats counters from scratch."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=500)
+
+    def handle(self, *args, **options):
+        count = rebuild_hotel_stats(batch_size=options["batch_size"])
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt stats for {count} hotels."))
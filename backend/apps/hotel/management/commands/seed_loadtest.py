@@ -0,0 +1,102 @@
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from apps.accounts.models import HotelOwnerProfile, User
+from apps.hotel.models import Hotel, HotelLocation, Room
+
+CITIES = ["Tehran", "Shiraz", "Isfahan", "Tabriz", "Mashhad", "Kish"]
+ROOM_TYPES = ["Single", "Double", "Suite", "Deluxe"]
+
+
+class Command(BaseCommand):
+    help = (
+        "Create the verified owners, customers, hotels and rooms used by "
+        "locust/locustfile.py. Safe to run again: existing rows are kept."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--owners", type=int, default=5)
+        parser.add_argument("--customers", type=int, default=200)
+        parser.add_argument("--hotels-per-owner", type=int, default=10)
+        parser.add_argument("--rooms-per-hotel", type=int, default=6)
+        parser.add_argument("--password", default="loadtest-pass")
+
+    def _user(self, email, phone_number, role, password):
+        user, created = User.objects.get_or_create(
+            email=email,
+            defaults={"phone_number": phone_number, "role": role, "is_active": True},
+        )
+        if created:
+            user.set_password(password)
+            user.save(update_fields=["password"])
+        return user
+
+    @transaction.atomic
+    def handle(self, *args, **options):
+        password = options["password"]
+
+        for i in range(options["customers"]):
+            self._user(
+                f"loadtest-customer-{i}@example.com",
+                f"0991{i:07d}",
+                "customer",
+                password,
+            )
+
+        hotels = 0
+        for i in range(options["owners"]):
+            owner = self._user(
+                f"loadtest-owner-{i}@example.com",
+                f"0990{i:07d}",
+                "hotel_owner",
+                password,
+            )
+            HotelOwnerProfile.objects.get_or_create(
+                user=owner,
+                defaults={
+                    "company_name": f"Loadtest Company {i}",
+                    "business_license_number": f"LOADTEST-{i}",
+                    "is_verified": True,
+                },
+            )
+            for j in range(options["hotels_per_owner"]):
+                hotel, created = Hotel.objects.get_or_create(
+                    slug=f"loadtest-hotel-{i}-{j}",
+                    defaults={
+                        "owner": owner,
+                        "name": f"Loadtest Hotel {i}-{j}",
+                        "description": "Seeded for load testing.",
+                        "is_verified": True,
+                        "policy": "No smoking.",
+                    },
+                )
+                hotels += 1
+                if not created:
+                    continue
+                HotelLocation.objects.create(
+                    hotel=hotel,
+                    country="Iran",
+                    city=CITIES[(i + j) % len(CITIES)],
+                    address=f"{j} Loadtest Street",
+                )
+                for k in range(options["rooms_per_hotel"]):
+                    Room.objects.create(
+                        hotel=hotel,
+                        room_type=ROOM_TYPES[k % len(ROOM_TYPES)],
+                        title=f"Loadtest Room {i}-{j}-{k}",
+                        slug=f"loadtest-room-{i}-{j}-{k}",
+                        room_details="Seeded for load testing.",
+                        price_per_night=Decimal(80 + 20 * k),
+                        capacity=1 + k % 4,
+                        floor=1 + k // 2,
+                        main_image="room/images/main_image/loadtest.jpg",
+                    )
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Seeded {options['customers']} customers, {options['owners']} "
+                f"owners and {hotels} hotels (password: {password})."
+            )
+        )
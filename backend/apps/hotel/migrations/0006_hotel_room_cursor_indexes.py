@@ -0,0 +1,26 @@
+# Generated by Django 4.2.5 on 2026-10-18 08:29
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("hotel", "0005_alter_hotel_amenities"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="hotel",
+            index=models.Index(
+                fields=["-created_at", "-id"], name="hotel_hotel_created_86bcd9_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="room",
+            index=models.Index(
+                fields=["hotel", "price_per_night", "id"],
+                name="hotel_room_hotel_i_47b380_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,95 @@
+# Generated by Django 4.2.5 on 2026-10-18 08:36
+
+from django.db import migrations, models
+from django.db.models import Count, Q, Sum
+import django.db.models.deletion
+
+
+def backfill_hotel_stats(apps, schema_editor):
+    """Fills the counters of existing hotels from the source tables."""
+    Hotel = apps.get_model("hotel", "Hotel")
+    HotelStats = apps.get_model("hotel", "HotelStats")
+    Room = apps.get_model("hotel", "Room")
+    Review = apps.get_model("reviews", "Review")
+    Reservation = apps.get_model("reservations", "Reservation")
+
+    def per_hotel(queryset, hotel_field, **aggregates):
+        rows = queryset.order_by().values(hotel_field).annotate(**aggregates)
+        return {row.pop(hotel_field): row for row in rows}
+
+    rooms = per_hotel(Room.objects.all(), "hotel", count=Count("id"))
+    # Replies count as reviews but only top-level reviews carry a rating.
+    top_level = Q(parent__isnull=True)
+    reviews = per_hotel(
+        Review.objects.all(),
+        "hotel",
+        count=Count("id"),
+        rating=Sum("rating", filter=top_level),
+        rated=Count("id", filter=top_level),
+    )
+    confirmed = per_hotel(
+        Reservation.objects.filter(
+            booking_status__in=["confirmed", "checked_in", "checked_out"]
+        ),
+        "room__hotel",
+        count=Count("id"),
+        revenue=Sum("total_price"),
+    )
+
+    HotelStats.objects.bulk_create(
+        [
+            HotelStats(
+                hotel_id=hotel_id,
+                room_count=rooms.get(hotel_id, {}).get("count", 0),
+                review_count=reviews.get(hotel_id, {}).get("count", 0),
+                rating_sum=reviews.get(hotel_id, {}).get("rating") or 0,
+                rating_count=reviews.get(hotel_id, {}).get("rated", 0),
+                confirmed_reservations=confirmed.get(hotel_id, {}).get("count", 0),
+                revenue=confirmed.get(hotel_id, {}).get("revenue") or 0,
+            )
+            for hotel_id in Hotel.objects.values_list("id", flat=True)
+        ],
+        batch_size=500,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("hotel", "0006_hotel_room_cursor_indexes"),
+        ("reservations", "0005_reservation_booking_date_indexes"),
+        ("reviews", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="HotelStats",
+            fields=[
+                (
+                    "hotel",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="stats",
+                        serialize=False,
+                        to="hotel.hotel",
+                    ),
+                ),
+                ("room_count", models.IntegerField(default=0)),
+                ("review_count", models.IntegerField(default=0)),
+                ("rating_sum", models.IntegerField(default=0)),
+                ("rating_count", models.IntegerField(default=0)),
+                ("confirmed_reservations", models.IntegerField(default=0)),
+                (
+                    "revenue",
+                    models.DecimalField(decimal_places=2, default=0, max_digits=14),
+                ),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "verbose_name": "Hotel stats",
+                "verbose_name_plural": "Hotel stats",
+            },
+        ),
+        migrations.RunPython(backfill_hotel_stats, migrations.RunPython.noop),
+    ]
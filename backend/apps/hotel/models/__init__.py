@@ -1,2 +1,3 @@
 from .hotel_model import *
 from .room_model import *
+from .stats_model import *
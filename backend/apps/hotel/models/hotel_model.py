@@ -57,6 +57,7 @@ class Hotel(models.Model):
             models.Index(fields=["is_verified"]),
             models.Index(fields=["owner"]),
             models.Index(fields=["slug"]),
+            models.Index(fields=["-created_at", "-id"]),
         ]
         verbose_name = _("Hotel")
         verbose_name_plural = _("Hotels")
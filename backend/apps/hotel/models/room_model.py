@@ -51,6 +51,11 @@ class Room(models.Model):
     objects = models.Manager()  # default manager
     available = AvailableRoomManager()  # custom manager
 
+    class Meta:
+        indexes = [
+            models.Index(fields=["hotel", "price_per_night", "id"]),
+        ]
+
     def __str__(self):
         return f"{self.title} - {self.hotel.name}"
 
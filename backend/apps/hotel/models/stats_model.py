@@ -0,0 +1,55 @@
+from django.db import models
+from django.db.models import F
+from django.utils.translation import gettext_lazy as _
+
+from .hotel_model import Hotel
+
+
+class HotelStatsManager(models.Manager):
+    def apply(self, hotel_id, create=True, **deltas):
+        """
+        Atomically adds deltas to a hotel's counters with F() expressions,
+        e.g. apply(hotel.id, room_count=1). With create=False a missing row
+        is left alone (used on deletes, where the hotel may be going away).
+        """
+        updates = {field: F(field) + delta for field, delta in deltas.items() if delta}
+        if hotel_id is None or not updates:
+            return
+        if self.filter(hotel_id=hotel_id).update(**updates) or not create:
+            return
+        self.get_or_create(hotel_id=hotel_id)
+        self.filter(hotel_id=hotel_id).update(**updates)
+
+
+class HotelStats(models.Model):
+    """
+    Denormalized per-hotel counters, kept up to date by signals
+    (see apps.hotel.signals) so list endpoints don't aggregate joins.
+    Rebuild from scratch with `manage.py rebuild_hotel_stats`.
+    """
+
+    hotel = models.OneToOneField(
+        Hotel, on_delete=models.CASCADE, primary_key=True, related_name="stats"
+    )
+    room_count = models.IntegerField(default=0)
+    review_count = models.IntegerField(default=0)
+    rating_sum = models.IntegerField(default=0)
+    rating_count = models.IntegerField(default=0)
+    confirmed_reservations = models.IntegerField(default=0)
+    revenue = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    objects = HotelStatsManager()
+
+    class Meta:
+        verbose_name = _("Hotel stats")
+        verbose_name_plural = _("Hotel stats")
+
+    @property
+    def avg_rating(self):
+        if not self.rating_count:
+            return None
+        return self.rating_sum / self.rating_count
+
+    def __str__(self):
+        return f"Stats for hotel #{self.hotel_id}"
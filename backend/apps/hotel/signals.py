@@ -1,23 +1,36 @@
-from django.db.models.signals import post_save, post_delete, pre_save
+from django.db.models.signals import post_save, post_delete, pre_delete, pre_save
 from django.dispatch import receiver
 from .models import Hotel, Room
 from django.core.cache import cache
 from apps.notifications.tasks import send_custom_notification
 
 
-from .models import Hotel, Room
+from decimal import Decimal
+
+from django.db.models import Count, Sum
+from django.utils import timezone
+
+from apps.reservations.models import COUNTED_BOOKING_STATUSES, Reservation
+from apps.reviews.models import Review
+from .models import Hotel, HotelLocation, HotelStats, Room
 from .api.v1.services.cached_manager import SimpleCacheManager
 
 
+def _hotel_city(hotel):
+    """Return the hotel's city, or None if it has no location yet."""
+    location = getattr(hotel, "location", None)
+    return location.city if location else None
+
+
 @receiver([post_save, post_delete], sender=Hotel)
 def invalidate_hotel_cache(sender, instance, **kwargs):
     """
     Invalidate hotel list cache when a hotel is created, updated, or deleted.
     """
-    if instance.location and instance.location.city:
+    city = _hotel_city(instance)
+    if city:
         # Invalidate cache for the specific city
-        SimpleCacheManager.invalidate_by_filters(
-            'hotel', city=instance.location.city)
+        SimpleCacheManager.invalidate_by_filters('hotel', city=city)
     else:
         # If no city is defined, invalidate all hotel list caches
         SimpleCacheManager.invalidate_model_list('hotel')
@@ -29,9 +42,34 @@ def invalidate_room_cache(sender, instance, **kwargs):
     Invalidate hotel list cache when a room is created, updated, or deleted.
     Assumes hotel list includes room-related data (e.g., room count).
     """
-    if instance.hotel and instance.hotel.location and instance.hotel.location.city:
-        SimpleCacheManager.invalidate_by_filters(
-            'hotel', city=instance.hotel.location.city)
+    city = _hotel_city(instance.hotel)
+    if city:
+        SimpleCacheManager.invalidate_by_filters('hotel', city=city)
+
+
+@receiver(pre_save, sender=HotelLocation)
+def store_previous_city(sender, instance, **kwargs):
+    """
+    Store the previous city before saving, so lists of the old city are
+    invalidated too when a hotel moves.
+    """
+    instance._previous_city = (
+        HotelLocation.objects.filter(pk=instance.pk)
+        .values_list("city", flat=True)
+        .first()
+        if instance.pk
+        else None
+    )
+
+
+@receiver([post_save, post_delete], sender=HotelLocation)
+def invalidate_location_cache(sender, instance, **kwargs):
+    """
+    Invalidate hotel list cache when a hotel's location changes.
+    """
+    previous_city = getattr(instance, "_previous_city", None)
+    for city in {instance.city, previous_city} - {None, ""}:
+        SimpleCacheManager.invalidate_by_filters('hotel', city=city)
 
 
 @receiver(pre_save, sender=Hotel)
@@ -65,3 +103,174 @@ def notify_owner_on_verification(sender, instance, created, **kwargs):
                 priority="success",
                 redirect_url=f"/hotels/{instance.id}/",
             )
+
+
+# Hotel stats: counters are adjusted with F() deltas, never recounted.
+
+
+def _deleted_with(origin, *models):
+    """Whether a delete cascades from one of `models` (instance or queryset)."""
+    return isinstance(origin, models) or getattr(origin, "model", None) in models
+
+
+def _review_share(hotel_id, rating, parent_id=None):
+    share = {"review_count": 1}
+    if parent_id is None:
+        # Replies carry a rating field too, but only reviews rate the hotel.
+        share.update(rating_sum=rating, rating_count=1)
+    return hotel_id, share
+
+
+@receiver(pre_save, sender=Review)
+def store_previous_review_share(sender, instance, **kwargs):
+    previous = (
+        Review.objects.filter(pk=instance.pk)
+        .values_list("hotel_id", "rating", "parent_id")
+        .first()
+        if instance.pk
+        else None
+    )
+    instance._previous_stats_share = _review_share(*previous) if previous else None
+
+
+def _reservation_share(reservation):
+    if reservation.booking_status not in COUNTED_BOOKING_STATUSES:
+        return reservation.room.hotel_id, {}
+    return reservation.room.hotel_id, {
+        "confirmed_reservations": 1,
+        "revenue": Decimal(str(reservation.total_price)),
+    }
+
+
+# Only these fields change a reservation's contribution to the stats.
+RESERVATION_STATS_FIELDS = {"booking_status", "total_price", "room"}
+
+
+def _touches_reservation_stats(update_fields):
+    return update_fields is None or bool(RESERVATION_STATS_FIELDS & set(update_fields))
+
+
+@receiver(pre_save, sender=Reservation)
+def store_previous_reservation_share(sender, instance, update_fields=None, **kwargs):
+    instance._previous_stats_share = None
+    if instance.pk and _touches_reservation_stats(update_fields):
+        previous = (
+            Reservation.objects.select_related("room").filter(pk=instance.pk).first()
+        )
+        if previous:
+            instance._previous_stats_share = _reservation_share(previous)
+
+
+def _move_stats_share(previous, current):
+    """Subtract an object's previous contribution and add its current one."""
+    if previous == current:
+        return
+    if previous:
+        hotel_id, share = previous
+        HotelStats.objects.apply(
+            hotel_id, **{field: -value for field, value in share.items()}
+        )
+    if current:
+        hotel_id, share = current
+        HotelStats.objects.apply(hotel_id, **share)
+
+
+@receiver(pre_save, sender=Room)
+def store_previous_room_hotel(sender, instance, update_fields=None, **kwargs):
+    instance._previous_hotel_id = None
+    if instance.pk and (update_fields is None or "hotel" in update_fields):
+        instance._previous_hotel_id = (
+            Room.objects.filter(pk=instance.pk).values_list("hotel_id", flat=True).first()
+        )
+
+
+def _room_share(room):
+    """A room's whole contribution: itself plus its counted reservations."""
+    counted = Reservation.objects.filter(
+        room=room, booking_status__in=COUNTED_BOOKING_STATUSES
+    ).aggregate(confirmed_reservations=Count("id"), revenue=Sum("total_price"))
+    return {
+        "room_count": 1,
+        "confirmed_reservations": counted["confirmed_reservations"],
+        "revenue": counted["revenue"] or Decimal("0"),
+    }
+
+
+@receiver(post_save, sender=Room)
+def count_saved_room(sender, instance, created, **kwargs):
+    if created:
+        HotelStats.objects.apply(instance.hotel_id, room_count=1)
+        return
+    previous_hotel_id = getattr(instance, "_previous_hotel_id", None)
+    if previous_hotel_id is not None and previous_hotel_id != instance.hotel_id:
+        # Moved to another hotel: its counts move with it.
+        share = _room_share(instance)
+        _move_stats_share((previous_hotel_id, share), (instance.hotel_id, share))
+        # The report rollups are keyed by hotel too; touching the room's
+        # reservations makes the next incremental refresh recompute its days
+        # for both hotels (see refresh_daily_rollups).
+        Reservation.objects.filter(room=instance).update(updated_at=timezone.now())
+
+
+@receiver(pre_delete, sender=Room)
+def count_deleted_room(sender, instance, origin=None, **kwargs):
+    # The room's reservations are deleted with it; subtract them in one
+    # aggregate here rather than one by one (see store_deleted_reservation).
+    if _deleted_with(origin, Hotel):
+        return  # the stats row is deleted with the hotel
+    HotelStats.objects.apply(
+        instance.hotel_id,
+        create=False,
+        **{field: -value for field, value in _room_share(instance).items()},
+    )
+
+
+@receiver(post_save, sender=Review)
+def count_saved_review(sender, instance, **kwargs):
+    _move_stats_share(
+        getattr(instance, "_previous_stats_share", None),
+        _review_share(instance.hotel_id, instance.rating, instance.parent_id),
+    )
+
+
+@receiver(post_save, sender=Reservation)
+def count_saved_reservation(sender, instance, update_fields=None, **kwargs):
+    if not _touches_reservation_stats(update_fields):
+        return
+    _move_stats_share(
+        getattr(instance, "_previous_stats_share", None),
+        _reservation_share(instance),
+    )
+
+
+@receiver(post_delete, sender=Review)
+def count_deleted_review(sender, instance, origin=None, **kwargs):
+    if _deleted_with(origin, Hotel):
+        return
+    hotel_id, share = _review_share(
+        instance.hotel_id, instance.rating, instance.parent_id
+    )
+    HotelStats.objects.apply(
+        hotel_id, create=False, **{field: -value for field, value in share.items()}
+    )
+
+
+@receiver(pre_delete, sender=Reservation)
+def store_deleted_reservation(sender, instance, origin=None, **kwargs):
+    # Only counted bookings need their hotel looked up; rooms and hotels
+    # account for the reservations deleted with them.
+    instance._deleted_stats_share = None
+    if instance.booking_status in COUNTED_BOOKING_STATUSES and not _deleted_with(
+        origin, Hotel, Room
+    ):
+        instance._deleted_stats_share = _reservation_share(instance)
+
+
+@receiver(post_delete, sender=Reservation)
+def count_deleted_reservation(sender, instance, **kwargs):
+    if getattr(instance, "_deleted_stats_share", None) is None:
+        return
+    hotel_id, share = instance._deleted_stats_share
+    HotelStats.objects.apply(
+        hotel_id, create=False, **{field: -value for field, value in share.items()}
+    )
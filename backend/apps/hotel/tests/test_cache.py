@@ -0,0 +1,206 @@
+import time
+
+import pytest
+from django.core.cache import cache
+from django.urls import reverse
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from apps.hotel.api.v1.services.cached_manager import (
+    LocalLRUCache,
+    SimpleCacheManager,
+)
+from apps.hotel.api.v1.views import HotelListCreateView
+from apps.accounts.tests.factories import UserFactory
+from .factories import HotelLocationFactory
+
+
+@pytest.fixture
+def list_request():
+    return APIRequestFactory().get("/hotel/api/v1/hotels/?search=sea")
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    SimpleCacheManager.local_cache().clear()
+    yield
+    cache.clear()
+    SimpleCacheManager.local_cache().clear()
+
+
+class TestSimpleCacheManagerVersions:
+    def test_city_invalidation_keeps_other_cities(self, list_request):
+        shiraz = SimpleCacheManager.generate_list_key(
+            "hotel", list_request, city="Shiraz"
+        )
+        tehran = SimpleCacheManager.generate_list_key(
+            "hotel", list_request, city="Tehran"
+        )
+        unscoped = SimpleCacheManager.generate_list_key("hotel", list_request)
+
+        SimpleCacheManager.invalidate_by_filters("hotel", city="Shiraz")
+
+        assert (
+            SimpleCacheManager.generate_list_key("hotel", list_request, city="Shiraz")
+            != shiraz
+        )
+        assert SimpleCacheManager.generate_list_key("hotel", list_request) != unscoped
+        assert (
+            SimpleCacheManager.generate_list_key("hotel", list_request, city="Tehran")
+            == tehran
+        )
+
+    def test_model_invalidation_changes_every_scope(self, list_request):
+        tehran = SimpleCacheManager.generate_list_key(
+            "hotel", list_request, city="Tehran"
+        )
+        unscoped = SimpleCacheManager.generate_list_key("hotel", list_request)
+
+        SimpleCacheManager.invalidate_model_list("hotel")
+
+        assert (
+            SimpleCacheManager.generate_list_key("hotel", list_request, city="Tehran")
+            != tehran
+        )
+        assert SimpleCacheManager.generate_list_key("hotel", list_request) != unscoped
+
+
+class TestCanonicalListKey:
+    def _key(self, query):
+        request = Request(APIRequestFactory().get(f"/hotel/api/v1/hotels/{query}"))
+        return SimpleCacheManager.generate_list_key(
+            "hotel", request, view=HotelListCreateView()
+        )
+
+    def test_param_order_and_tracking_params_share_a_key(self):
+        assert self._key("?search=sea&ordering=created_at") == self._key(
+            "?ordering=created_at&utm_source=mail&search=sea"
+        )
+
+    def test_search_term_is_case_folded(self):
+        assert self._key("?search=Sea%20%20View") == self._key("?search=sea+view")
+
+    def test_different_filters_get_different_keys(self):
+        assert self._key("?location__city=Shiraz") != self._key(
+            "?location__city=Tehran"
+        )
+
+
+class TestLocalTier:
+    def test_lru_evicts_least_recently_used(self):
+        lru = LocalLRUCache(max_entries=2, timeout=30)
+        lru.set("a", 1)
+        lru.set("b", 2)
+        lru.get("a")
+        lru.set("c", 3)
+
+        assert lru.get("a") == 1
+        assert lru.get("b") is None
+        assert lru.get("c") == 3
+
+    def test_lru_entries_expire(self, monkeypatch):
+        lru = LocalLRUCache(max_entries=2, timeout=30)
+        lru.set("a", 1, timeout=5)
+        now = time.monotonic()
+        monkeypatch.setattr(time, "monotonic", lambda: now + 6)
+
+        assert lru.get("a") is None
+
+    def test_local_tier_serves_fresh_entries_without_redis(self):
+        calls = []
+        SimpleCacheManager.get_or_set(
+            "hotel_list:v1.1:abc", lambda: calls.append(1) or ["cached"], local=True
+        )
+        cache.delete("hotel_list:v1.1:abc")
+
+        value = SimpleCacheManager.get_or_set(
+            "hotel_list:v1.1:abc", lambda: calls.append(2) or ["rebuilt"], local=True
+        )
+
+        assert value == ["cached"]
+        assert calls == [1]
+
+
+class TestGetOrSet:
+    def _builder(self, calls, value):
+        def build():
+            calls.append(value)
+            return value
+
+        return build
+
+    def test_fresh_entry_is_not_rebuilt(self):
+        calls = []
+        first = SimpleCacheManager.get_or_set("k", self._builder(calls, "v1"))
+        second = SimpleCacheManager.get_or_set("k", self._builder(calls, "v2"))
+
+        assert first == second == "v1"
+        assert calls == ["v1"]
+
+    def test_stale_entry_is_served_while_another_worker_rebuilds(self):
+        calls = []
+        cache.set("k", {"value": "old", "fresh_until": time.time() - 1}, 60)
+        cache.add("k:rebuild", 1, 30)  # another worker holds the rebuild lock
+
+        value = SimpleCacheManager.get_or_set("k", self._builder(calls, "new"))
+
+        assert value == "old"
+        assert calls == []
+
+    def test_stale_entry_is_rebuilt_by_lock_winner(self):
+        calls = []
+        cache.set("k", {"value": "old", "fresh_until": time.time() - 1}, 60)
+
+        value = SimpleCacheManager.get_or_set("k", self._builder(calls, "new"))
+
+        assert value == "new"
+        assert calls == ["new"]
+        assert cache.get("k:rebuild") is None
+        assert SimpleCacheManager.get_or_set("k", self._builder(calls, "x")) == "new"
+
+    def test_expired_lock_taken_by_another_worker_is_not_released(self):
+        def slow_build():
+            # Our lock expired mid-build and another worker took it over.
+            cache.delete("k:rebuild")
+            cache.add("k:rebuild", "other-worker", 30)
+            return "new"
+
+        assert SimpleCacheManager.get_or_set("k", slow_build) == "new"
+        assert cache.get("k:rebuild") == "other-worker"
+
+
+@pytest.mark.django_db
+def test_hotel_list_cache_is_refreshed_after_hotel_change(api_client, settings):
+    settings.DEBUG = False
+    url = reverse("hotel:api_v1:hotel-list-create")
+    api_client.force_authenticate(user=UserFactory())
+    hotel = HotelLocationFactory(city="Shiraz").hotel
+
+    first = api_client.get(url, {"location__city": "Shiraz"})
+    hotel.name = "Renamed Hotel"
+    hotel.save()
+    second = api_client.get(url, {"location__city": "Shiraz"})
+
+    assert first.data["results"][0]["name"] != "Renamed Hotel"
+    assert second.data["results"][0]["name"] == "Renamed Hotel"
+
+
+@pytest.mark.django_db
+def test_cached_page_links_are_built_for_each_request(api_client, settings):
+    settings.DEBUG = False
+    url = reverse("hotel:api_v1:hotel-list-create")
+    HotelLocationFactory()
+    HotelLocationFactory()
+
+    first = api_client.get(
+        url, {"page_size": 1, "utm_source": "mail"}, HTTP_HOST="localhost"
+    )
+    second = api_client.get(url, {"page_size": 1})
+
+    assert "utm_source" in first.data["next"]
+    assert second.data["next"].startswith("http://testserver/")
+    assert "utm_source" not in second.data["next"]
+    assert second.data["results"] == first.data["results"]
+    following = api_client.get(second.data["next"])
+    assert following.data["results"][0]["id"] != first.data["results"][0]["id"]
@@ -0,0 +1,149 @@
+import pytest
+from datetime import date
+from decimal import Decimal
+
+from django.core.management import call_command
+
+from apps.accounts.tests.factories import UserFactory
+from apps.hotel.models import HotelStats
+from apps.reservations.models import BookingStatus, Reservation
+from apps.reviews.models import Review
+from .factories import HotelFactory, RoomFactory
+
+pytestmark = pytest.mark.django_db
+
+
+def _stats(hotel):
+    return HotelStats.objects.get(hotel=hotel)
+
+
+def _book(room, status=BookingStatus.CONFIRMED, day=1):
+    guest = UserFactory(role="customer")
+    return Reservation.objects.create(
+        user=guest.customer_profile,
+        room=room,
+        checking_date=date(2030, 1, day),
+        checkout_date=date(2030, 1, day + 2),
+        nights=2,
+        total_price=Decimal("200.00"),
+        booking_status=status,
+    )
+
+
+def test_rooms_and_reviews_update_counters():
+    hotel = HotelFactory()
+    rooms = [RoomFactory(hotel=hotel) for _ in range(2)]
+    review = Review.objects.create(hotel=hotel, user=hotel.owner, rating=4)
+    Review.objects.create(hotel=hotel, user=hotel.owner, rating=2)
+
+    review.rating = 5
+    review.save()
+    rooms[0].delete()
+
+    stats = _stats(hotel)
+    assert stats.room_count == 1
+    assert stats.review_count == 2
+    assert stats.avg_rating == 3.5
+
+
+def test_replies_count_as_reviews_but_not_towards_the_rating():
+    hotel = HotelFactory()
+    review = Review.objects.create(hotel=hotel, user=hotel.owner, rating=4)
+    reply = Review.objects.create(
+        hotel=hotel, user=hotel.owner, rating=0, parent=review
+    )
+    reply.rating = 1
+    reply.save()
+
+    stats = _stats(hotel)
+    assert stats.review_count == 2
+    assert (stats.rating_sum, stats.rating_count) == (4, 1)
+
+    reply.delete()
+    stats = _stats(hotel)
+    assert stats.review_count == 1
+    assert (stats.rating_sum, stats.rating_count) == (4, 1)
+
+
+def test_only_confirmed_reservations_count_towards_revenue():
+    room = RoomFactory(price_per_night=Decimal("100.00"))
+    pending = _book(room, status=BookingStatus.PENDING)
+    confirmed = _book(room, day=5)
+
+    pending.booking_status = BookingStatus.CONFIRMED
+    pending.save(update_fields=["booking_status"])
+    confirmed.booking_status = BookingStatus.CANCELLED
+    confirmed.save(update_fields=["booking_status"])
+
+    stats = _stats(room.hotel)
+    assert stats.confirmed_reservations == 1
+    assert stats.revenue == Decimal("200.00")
+
+
+def test_deleting_reservations_and_rooms_subtracts_their_counts():
+    room = RoomFactory()
+    other_room = RoomFactory(hotel=room.hotel)
+    _book(room)
+    _book(room, day=5)
+    _book(other_room).delete()
+
+    stats = _stats(room.hotel)
+    assert (stats.room_count, stats.confirmed_reservations) == (2, 2)
+
+    room.delete()
+    stats = _stats(room.hotel)
+    assert (stats.room_count, stats.confirmed_reservations, stats.revenue) == (
+        1,
+        0,
+        Decimal("0"),
+    )
+
+
+def test_rebuild_command_recomputes_counters():
+    room = RoomFactory(price_per_night=Decimal("100.00"))
+    _book(room)
+    review = Review.objects.create(hotel=room.hotel, user=room.hotel.owner, rating=3)
+    Review.objects.create(
+        hotel=room.hotel, user=room.hotel.owner, rating=5, parent=review
+    )
+    expected = _stats(room.hotel)
+    HotelStats.objects.all().delete()
+
+    call_command("rebuild_hotel_stats")
+
+    stats = _stats(room.hotel)
+    assert (
+        stats.room_count,
+        stats.review_count,
+        stats.rating_sum,
+        stats.rating_count,
+    ) == (
+        expected.room_count,
+        expected.review_count,
+        expected.rating_sum,
+        expected.rating_count,
+    )
+    assert stats.confirmed_reservations == 1
+    assert stats.revenue == Decimal("200.00")
+
+
+def test_moving_a_room_moves_its_counts_to_the_new_hotel():
+    room = RoomFactory()
+    _book(room)
+    _book(room, status=BookingStatus.PENDING, day=5)
+    old_hotel, new_hotel = room.hotel, HotelFactory()
+
+    room.hotel = new_hotel
+    room.save()
+
+    old, new = _stats(old_hotel), _stats(new_hotel)
+    assert (old.room_count, old.confirmed_reservations, old.revenue) == (
+        0,
+        0,
+        Decimal("0"),
+    )
+    assert (new.room_count, new.confirmed_reservations, new.revenue) == (
+        1,
+        1,
+        Decimal("200.00"),
+    )
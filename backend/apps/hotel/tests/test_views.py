@@ -1,9 +1,16 @@
 import pytest
+from datetime import date
+from decimal import Decimal
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from apps.hotel.models import Hotel
+from apps.reservations.models import Reservation
+from apps.reviews.models import Review
 from .conftest import api_client
 
-from .factories import HotelFactory, AmenityFactory
+from .factories import HotelFactory, AmenityFactory, HotelLocationFactory, RoomFactory
 from apps.accounts.tests.factories import UserFactory, HotelOwnerProfileFactory
 
 
@@ -17,8 +24,8 @@ class TestHotelListCreateView:
         response = api_client.get(self.url)
 
         assert response.status_code == 200
-        assert len(response.data) == 1
-        assert response.data[0]["name"] == "Test Hotel"
+        assert len(response.data["results"]) == 1
+        assert response.data["results"][0]["name"] == "Test Hotel"
 
     def test_create_hotel_by_anonymous_user_fails(self, api_client):
         """Anonymous user cannot create a hotel."""
@@ -137,3 +144,239 @@ class TestHotelDetailView:
         response = api_client.delete(url)
         assert response.status_code == 403
         assert Hotel.objects.filter(pk=hotel.pk).exists()
+
+
+@pytest.mark.django_db
+class TestRoomAvailabilitySearchView:
+    url = reverse("hotel:api_v1:room-search")
+
+    def _book(self, room, check_in, check_out, status="confirmed"):
+        guest = UserFactory(role="customer")
+        return Reservation.objects.create(
+            user=guest.customer_profile,
+            room=room,
+            checking_date=check_in,
+            checkout_date=check_out,
+            nights=(check_out - check_in).days,
+            total_price=room.price_per_night,
+            booking_status=status,
+        )
+
+    def test_search_excludes_rooms_with_overlapping_bookings(self, api_client):
+        hotel = HotelLocationFactory(city="Shiraz").hotel
+        free_room = RoomFactory(hotel=hotel)
+        booked_room = RoomFactory(hotel=hotel)
+        cancelled_room = RoomFactory(hotel=hotel)
+        self._book(booked_room, date(2030, 1, 9), date(2030, 1, 11))
+        self._book(
+            cancelled_room, date(2030, 1, 10), date(2030, 1, 12), status="cancelled"
+        )
+
+        api_client.force_authenticate(user=UserFactory())
+        response = api_client.get(
+            self.url,
+            {"city": "shiraz", "check_in": "2030-01-10", "check_out": "2030-01-12"},
+        )
+
+        assert response.status_code == 200
+        ids = {room["id"] for room in response.data["results"]}
+        assert ids == {free_room.id, cancelled_room.id}
+
+    def test_search_filters_by_guests_price_and_city(self, api_client):
+        hotel = HotelLocationFactory(city="Shiraz").hotel
+        other_city = HotelLocationFactory(city="Tehran").hotel
+        match = RoomFactory(hotel=hotel, capacity=4, price_per_night=120)
+        RoomFactory(hotel=hotel, capacity=1, price_per_night=120)
+        RoomFactory(hotel=hotel, capacity=4, price_per_night=900)
+        RoomFactory(hotel=other_city, capacity=4, price_per_night=120)
+
+        api_client.force_authenticate(user=UserFactory())
+        response = api_client.get(
+            self.url,
+            {
+                "city": "Shiraz",
+                "check_in": "2030-02-01",
+                "check_out": "2030-02-03",
+                "guests": 3,
+                "min_price": 100,
+                "max_price": 200,
+            },
+        )
+
+        assert response.status_code == 200
+        results = response.data["results"]
+        assert [room["id"] for room in results] == [match.id]
+        assert results[0]["city"] == "Shiraz"
+
+    def test_search_pages_through_rooms_cheapest_first(self, api_client):
+        hotel = HotelLocationFactory(city="Shiraz").hotel
+        rooms = [
+            RoomFactory(hotel=hotel, price_per_night=price)
+            for price in (300, 100, 200, 100)
+        ]
+        expected = [
+            room.id
+            for room in sorted(rooms, key=lambda r: (r.price_per_night, r.id))
+        ]
+
+        url = self.url + "?check_in=2030-03-01&check_out=2030-03-02&page_size=3"
+        seen = []
+        while url:
+            data = api_client.get(url).data
+            seen += [room["id"] for room in data["results"]]
+            url = data["next"]
+
+        assert seen == expected
+
+    def test_search_rejects_inverted_date_range(self, api_client):
+        api_client.force_authenticate(user=UserFactory())
+        response = api_client.get(
+            self.url, {"check_in": "2030-02-03", "check_out": "2030-02-01"}
+        )
+        assert response.status_code == 400
+
+
+@pytest.mark.django_db
+class TestOwnerHotelListView:
+    url = reverse("hotel:api_v1:my-hotels")
+
+    def _book(self, room, day):
+        guest = UserFactory(role="customer")
+        return Reservation.objects.create(
+            user=guest.customer_profile,
+            room=room,
+            checking_date=date(2030, 1, day),
+            checkout_date=date(2030, 1, day + 1),
+            nights=1,
+            total_price=room.price_per_night,
+            booking_status="confirmed",
+        )
+
+    def _hotel_with_rooms(self, owner, rooms=4):
+        hotel = HotelFactory(owner=owner)
+        return hotel, [RoomFactory(hotel=hotel) for _ in range(rooms)]
+
+    def test_popular_rooms_are_top_three_per_hotel(self, api_client):
+        owner = UserFactory(role="hotel_owner")
+        hotel, rooms = self._hotel_with_rooms(owner)
+        self._book(rooms[2], 1)
+        self._book(rooms[2], 2)
+        self._book(rooms[3], 1)
+        api_client.force_authenticate(user=owner)
+
+        response = api_client.get(self.url)
+
+        assert response.status_code == 200
+        popular = [room["id"] for room in response.data[0]["popular_rooms"]]
+        assert popular == [rooms[2].id, rooms[3].id, rooms[0].id]
+
+    def test_query_count_does_not_grow_with_hotels(self, api_client):
+        owner = UserFactory(role="hotel_owner")
+        self._hotel_with_rooms(owner)
+        api_client.force_authenticate(user=owner)
+
+        with CaptureQueriesContext(connection) as one_hotel:
+            api_client.get(self.url)
+        self._hotel_with_rooms(owner)
+        self._hotel_with_rooms(owner)
+        with CaptureQueriesContext(connection) as three_hotels:
+            response = api_client.get(self.url)
+
+        assert len(response.data) == 3
+        assert self._app_queries(three_hotels) == self._app_queries(one_hotel) == 3
+
+    def test_stats_are_not_inflated_by_reviews(self, api_client):
+        owner = UserFactory(role="hotel_owner")
+        hotel, rooms = self._hotel_with_rooms(owner, rooms=2)
+        self._book(rooms[0], 1)
+        self._book(rooms[0], 2)
+        self._book(rooms[1], 1)
+        cancelled = self._book(rooms[1], 3)
+        cancelled.booking_status = "cancelled"
+        cancelled.save()
+        reviews = [
+            Review.objects.create(hotel=hotel, user=owner, rating=rating)
+            for rating in (4, 5, 3)
+        ]
+        Review.objects.create(hotel=hotel, user=owner, rating=0, parent=reviews[0])
+        api_client.force_authenticate(user=owner)
+
+        response = api_client.get(self.url)
+
+        stats = response.data[0]
+        assert stats["reservations_count"] == 3
+        prices = [Decimal(str(room.price_per_night)) for room in rooms]
+        assert stats["total_revenue"] == float(prices[0] * 2 + prices[1])
+        assert stats["avg_rating"] == 4.0
+        assert stats["total_reviews"] == 4
+        assert stats["room_count"] == 2
+
+    @staticmethod
+    def _app_queries(context):
+        # Ignore the profiler's own bookkeeping (silk) and transaction noise.
+        return len(
+            [
+                q
+                for q in context.captured_queries
+                if q["sql"].startswith("SELECT") and "silk_" not in q["sql"]
+            ]
+        )
+
+
+@pytest.mark.django_db
+class TestRoomListPagination:
+    @pytest.fixture(autouse=True)
+    def reset_throttle(self):
+        cache.clear()  # anonymous requests are throttled per minute
+
+    def _walk(self, api_client, url, params, link="next"):
+        pages = []
+        response = api_client.get(url, params)
+        while True:
+            assert response.status_code == 200, response.data
+            pages.append([room["id"] for room in response.data["results"]])
+            if not response.data[link]:
+                return pages, response
+            response = api_client.get(response.data[link])
+
+    def test_equal_prices_are_paged_by_id_without_offset(self, api_client):
+        hotel = HotelFactory()
+        rooms = [RoomFactory(hotel=hotel, price_per_night=100) for _ in range(5)]
+        rooms += [
+            RoomFactory(hotel=hotel, price_per_night=50),
+            RoomFactory(hotel=hotel, price_per_night=200),
+        ]
+        expected = [
+            room.id
+            for room in sorted(rooms, key=lambda r: (r.price_per_night, r.id))
+        ]
+        url = reverse("hotel:api_v1:room-list-create", args=[hotel.id])
+
+        with CaptureQueriesContext(connection) as context:
+            pages, last = self._walk(api_client, url, {"page_size": 2})
+            back, _ = self._walk(api_client, last.data["previous"], {}, "previous")
+
+        assert sum(pages, []) == expected
+        assert sum(reversed(back), []) + pages[-1] == expected
+        room_queries = [
+            q["sql"] for q in context.captured_queries if '"hotel_room"' in q["sql"]
+        ]
+        assert room_queries and not any("OFFSET" in sql for sql in room_queries)
+
+    def test_mixed_direction_ordering_pages_every_room_once(self, api_client):
+        hotel = HotelFactory()
+        rooms = [
+            RoomFactory(hotel=hotel, capacity=2 + i % 2, floor=i % 3)
+            for i in range(7)
+        ]
+        expected = [
+            room.id
+            for room in sorted(rooms, key=lambda r: (-r.capacity, r.floor, -r.id))
+        ]
+        url = reverse("hotel:api_v1:room-list-create", args=[hotel.id])
+
+        pages, _ = self._walk(
+            api_client, url, {"page_size": 2, "ordering": "-capacity,floor"}
+        )
+
+        assert sum(pages, []) == expected
@@ -8,6 +8,10 @@ User = get_user_model()
 
 
 class NotificationSerializer(serializers.ModelSerializer):
+    # Global notifications are shared rows: their read state is per user and
+    # comes from context["global_read_state"] (a GlobalNotificationReadState).
+    is_read = serializers.SerializerMethodField()
+
     class Meta:
         model = Notification
         fields = [
@@ -23,6 +27,12 @@ class NotificationSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = ["created_at", "is_read"]
 
+    def get_is_read(self, obj):
+        if not obj.is_global:
+            return obj.is_read
+        state = self.context.get("global_read_state")
+        return state is not None and state.has_read(obj.id)
+
 
 class CustomNotificationSerializer(serializers.Serializer):
     user_id = serializers.IntegerField()
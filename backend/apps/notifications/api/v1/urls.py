@@ -14,6 +14,22 @@ urlpatterns = [
         views.MarkNotificationReadView.as_view(),
         name="mark-read-notification",
     ),
+    path(
+        "read-all/",
+        views.MarkAllNotificationsReadView.as_view(),
+        name="mark-all-read-notifications",
+    ),
+    path(
+        "unread-count/",
+        views.UnreadNotificationCountView.as_view(),
+        name="unread-notification-count",
+    ),
+    path(
+        "stream/ticket/",
+        views.NotificationStreamTicketView.as_view(),
+        name="notification-stream-ticket",
+    ),
+    path("stream/", views.notification_stream, name="notification-stream"),
     path(
         "custom/",
         views.SendCustomNotificationAPIView.as_view(),
@@ -1,18 +1,36 @@
+from asgiref.sync import sync_to_async
 from django.contrib.auth import get_user_model
+from django.core.handlers.asgi import ASGIRequest
 from django.db import models
+from django.http import HttpResponseNotAllowed, JsonResponse, StreamingHttpResponse
+from rest_framework.exceptions import AuthenticationFailed
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.views import APIView
 from rest_framework.decorators import api_view
 from rest_framework.response import Response
 from rest_framework import status
+from rest_framework_simplejwt.authentication import JWTAuthentication
 
 from apps.notifications.tasks import send_custom_notification, send_global_notification
-from apps.notifications.models import Notification
+from apps.notifications.counters import (
+    adjust_unread_counts,
+    get_unread_count,
+    invalidate_unread_count,
+)
+from apps.notifications.models import GlobalNotificationReadState, Notification
+from apps.notifications.push import (
+    STREAM_TICKET_TIMEOUT,
+    issue_stream_ticket,
+    notification_events,
+    redeem_stream_ticket,
+)
+from core.pagination import CreatedAtCursorPagination
 from .serializers import (
     NotificationSerializer,
     CustomNotificationSerializer,
     GlobalNotificationSerializer,
 )
+
 # Import the stricter permission class
 from apps.accounts.api.v1.permissions import IsVerifiedHotelOwner
 
@@ -29,6 +47,10 @@ def api_overview(request):
             "API Overview": "overview/",
             "List Notifications (GET)": "notifications/",
             "Mark Notification as Read (POST)": "notifications/<int:pk>/read/",
+            "Mark All Notifications as Read (POST)": "notifications/read-all/",
+            "Unread Notification Count (GET)": "notifications/unread-count/",
+            "Notification Stream Ticket (POST)": "notifications/stream/ticket/",
+            "Notification Stream (GET, text/event-stream)": "notifications/stream/",
             "Send Custom Notification (POST)": "notifications/custom/",
             "Send Global Notification (POST)": "notifications/global/",
         }
@@ -43,20 +65,28 @@ class UserNotificationsListView(APIView):
 
     permission_classes = [IsAuthenticated]
 
+    pagination_class = CreatedAtCursorPagination
+
     def get(self, request):
         """
         List all notifications for the authenticated user.
         Includes global notifications.
 
         Returns:
-        - A JSON response with a list of notifications for the authenticated user.
+        - A cursor-paginated JSON response (`next`, `previous`, `results`) with
+          the notifications for the authenticated user, newest first.
         """
         user = request.user
-        qs = Notification.objects.filter(
-            models.Q(user=user) | models.Q(is_global=True)
-        ).order_by("-created_at")
-        serializer = NotificationSerializer(qs, many=True)
-        return Response(serializer.data)
+        qs = Notification.objects.feed(user)
+        paginator = self.pagination_class()
+        page = paginator.paginate_queryset(qs, request, view=self)
+        global_read_state = None
+        if any(notification.is_global for notification in page):
+            global_read_state = GlobalNotificationReadState.objects.for_user(user)
+        serializer = NotificationSerializer(
+            page, many=True, context={"global_read_state": global_read_state}
+        )
+        return paginator.get_paginated_response(serializer.data)
 
 
 class MarkNotificationReadView(APIView):
@@ -78,9 +108,23 @@ class MarkNotificationReadView(APIView):
         - A JSON response with an error message if the notification is not found.
         """
         try:
-            notif = Notification.objects.get(pk=pk, user=request.user)
-            notif.is_read = True
-            notif.save()
+            notif = Notification.objects.get(
+                models.Q(user=request.user) | models.Q(is_global=True), pk=pk
+            )
+            if notif.is_global:
+                # Shared row: record the read in the user's own read state.
+                newly_read = GlobalNotificationReadState.objects.mark_read(
+                    request.user, notif.id
+                )
+            else:
+                # Conditional update, so concurrent requests decrement once.
+                newly_read = bool(
+                    Notification.objects.filter(pk=notif.pk, is_read=False).update(
+                        is_read=True
+                    )
+                )
+            if newly_read:
+                adjust_unread_counts({request.user.id: -1})
             return Response({"detail": "Notification marked as read"})
         except Notification.DoesNotExist:
             return Response(
@@ -88,6 +132,117 @@ class MarkNotificationReadView(APIView):
             )
 
 
+class MarkAllNotificationsReadView(APIView):
+    """
+    Mark all of the user's notifications, personal and global, as read.
+    """
+
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request):
+        Notification.objects.filter(
+            user=request.user, is_global=False, is_read=False
+        ).update(is_read=True)
+        GlobalNotificationReadState.objects.mark_all_read(request.user)
+        invalidate_unread_count(request.user.id)
+        return Response({"detail": "All notifications marked as read"})
+
+
+class UnreadNotificationCountView(APIView):
+    """
+    Number of unread notifications (personal + global) for badge polling.
+    Served from a per-user Redis counter; see apps.notifications.counters.
+    """
+
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        return Response({"unread": get_unread_count(request.user)})
+
+
+class NotificationStreamTicketView(APIView):
+    """
+    Issue a single-use ticket for opening the notification stream.
+    EventSource can't send an Authorization header, so browsers open
+    stream/?ticket=<ticket> instead; the ticket expires within seconds.
+    """
+
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request):
+        return Response(
+            {
+                "ticket": issue_stream_ticket(request.user.id),
+                "expires_in": STREAM_TICKET_TIMEOUT,
+            },
+            status=status.HTTP_201_CREATED,
+        )
+
+
+async def _stream_user(request):
+    """
+    User of a stream request: the JWT from the Authorization header, or a
+    ticket from NotificationStreamTicketView as ?ticket=. Access tokens are
+    never read from the query string, where they would end up in logs.
+    """
+    auth = JWTAuthentication()
+    header = auth.get_header(request)
+    if header:
+        try:
+            raw_token = auth.get_raw_token(header)
+            if not raw_token:
+                return None
+            validated_token = auth.get_validated_token(raw_token)
+            return await sync_to_async(auth.get_user)(validated_token)
+        except AuthenticationFailed:
+            return None
+    ticket = request.GET.get("ticket")
+    if not ticket:
+        return None
+    user_id = await sync_to_async(redeem_stream_ticket)(ticket)
+    if user_id is None:
+        return None
+    return await User.objects.filter(pk=user_id, is_active=True).afirst()
+
+
+async def notification_stream(request):
+    """
+    Server-sent events with the user's new notifications, as they are
+    created; replaces polling the list endpoint. Needs an ASGI server
+    (core.asgi, as in every docker-compose file), since every open stream
+    holds its request; under WSGI it answers 501.
+
+    Authenticate with the Authorization header, or with ?ticket= from
+    stream/ticket/ (EventSource). Events are `notification` with the
+    NotificationSerializer JSON as data. Clients reconnecting with
+    Last-Event-ID first get what they missed.
+    """
+    if request.method != "GET":
+        return HttpResponseNotAllowed(["GET"])
+    if not isinstance(request, ASGIRequest):
+        # Under WSGI Django reads the whole stream before sending anything.
+        return JsonResponse(
+            {"detail": "The notification stream needs an ASGI server."},
+            status=status.HTTP_501_NOT_IMPLEMENTED,
+        )
+    user = await _stream_user(request)
+    if user is None:
+        return JsonResponse(
+            {"detail": "Authentication credentials were not provided."},
+            status=status.HTTP_401_UNAUTHORIZED,
+        )
+    last_event_id = request.headers.get("Last-Event-ID", "")
+    response = StreamingHttpResponse(
+        notification_events(
+            user.id, int(last_event_id) if last_event_id.isdigit() else None
+        ),
+        content_type="text/event-stream",
+    )
+    response["Cache-Control"] = "no-cache"
+    response["X-Accel-Buffering"] = "no"  # nginx: pass events through unbuffered
+    return response
+
+
 class SendCustomNotificationAPIView(APIView):
     # Updated permission to ensure only verified owners can send
     permission_classes = [IsVerifiedHotelOwner]
@@ -124,4 +279,4 @@ class SendGlobalNotificationAPIView(APIView):
         )
         return Response(
             {"message": "Global notification sent"}, status=status.HTTP_200_OK
-        )
\ No newline at end of file
+        )
@@ -0,0 +1,135 @@
+import time
+import uuid
+from collections import Counter
+
+from django.core.cache import cache
+from django_redis import get_redis_connection
+
+from apps.notifications.models import GlobalNotificationReadState, Notification
+
+# Counters rebuild from the database after this long even if never touched.
+UNREAD_COUNT_TIMEOUT = 60 * 60
+# A rebuild must store its count within this long or it is discarded.
+UNREAD_BUILD_TIMEOUT = 30
+# Bumped on every global notification. It is part of each counter key, so a
+# broadcast invalidates every user's count with one INCR instead of fanning
+# out; counts are then rebuilt lazily by the users who actually poll.
+GLOBAL_VERSION_KEY = "notifications:global_version"
+
+
+# Stores the rebuilt count only if the build marker is still ours: a counter
+# update that found no counter deletes the marker, so a count read from the
+# database before that update is never cached.
+STORE_REBUILT_COUNT_SCRIPT = """
+if redis.call("get", KEYS[2]) ~= ARGV[1] then
+    return 0
+end
+redis.call("del", KEYS[2])
+return redis.call("set", KEYS[1], ARGV[2], "EX", ARGV[3], "NX") and 1 or 0
+"""
+
+
+def _global_version():
+    version = cache.get(GLOBAL_VERSION_KEY)
+    if version is None:
+        # Start from the clock so an evicted counter can't reuse old keys.
+        cache.add(GLOBAL_VERSION_KEY, int(time.time() * 1000), timeout=None)
+        version = cache.get(GLOBAL_VERSION_KEY)
+    return version
+
+
+def _unread_key(user_id, version=None):
+    version = _global_version() if version is None else version
+    return f"notifications:unread:{user_id}:g{version}"
+
+
+def _build_key(key):
+    return cache.make_key(f"{key}:building")
+
+
+def count_unread_from_db(user):
+    """Unread personal notifications plus unread global ones."""
+    personal = Notification.objects.filter(
+        user=user, is_global=False, is_read=False
+    ).count()
+    state = GlobalNotificationReadState.objects.for_user(user)
+    unread_global = Notification.objects.filter(
+        is_global=True, id__gt=state.read_through
+    ).exclude(id__in=state.read_ids)
+    return personal + unread_global.count()
+
+
+def get_unread_count(user):
+    """The user's unread count from Redis, rebuilt from the database on a miss."""
+    key = _unread_key(user.id)
+    count = cache.get(key)
+    if count is None:
+        redis = get_redis_connection("default")
+        # Marked before counting; see STORE_REBUILT_COUNT_SCRIPT.
+        token = uuid.uuid4().hex
+        redis.set(_build_key(key), token, ex=UNREAD_BUILD_TIMEOUT)
+        count = count_unread_from_db(user)
+        redis.eval(
+            STORE_REBUILT_COUNT_SCRIPT,
+            2,
+            cache.make_key(key),
+            _build_key(key),
+            token,
+            count,
+            UNREAD_COUNT_TIMEOUT,
+        )
+    return count
+
+
+def adjust_unread_counts(deltas):
+    """
+    Apply {user_id: delta} to the cached counters. Counters that aren't
+    cached are left alone: they are rebuilt from the database when read, and
+    a rebuild already counting may have missed this change, so it is
+    cancelled.
+    """
+    version = _global_version()
+    for user_id, delta in deltas.items():
+        if not delta:
+            continue
+        key = _unread_key(user_id, version)
+        try:
+            if cache.incr(key, delta) < 0:
+                cache.delete(key)  # drifted: rebuild on next read
+        except ValueError:
+            get_redis_connection("default").delete(_build_key(key))
+
+
+def invalidate_unread_count(user_id):
+    """
+    Drop the user's counter and any rebuild in progress, e.g. after marking
+    everything read. Setting it to 0 instead would lose notifications
+    created between the update and this call.
+    """
+    key = _unread_key(user_id)
+    get_redis_connection("default").delete(cache.make_key(key), _build_key(key))
+
+
+def global_notification_created():
+    try:
+        cache.incr(GLOBAL_VERSION_KEY)
+    except ValueError:
+        cache.set(GLOBAL_VERSION_KEY, int(time.time() * 1000), timeout=None)
+
+
+def notifications_created(notifications):
+    """
+    Count new notifications into the cached counters. Called on commit
+    through dispatcher.notifications_committed().
+    """
+    if any(notification.is_global for notification in notifications):
+        global_notification_created()
+    adjust_unread_counts(
+        Counter(
+            notification.user_id
+            for notification in notifications
+            if notification.user_id
+            and not notification.is_global
+            and not notification.is_read
+        )
+    )
@@ -0,0 +1,244 @@
+import json
+import logging
+
+from django.db import transaction
+from django_redis import get_redis_connection
+from django_redis.exceptions import ConnectionInterrupted
+from redis.exceptions import RedisError
+
+from apps.notifications.counters import notifications_created
+from apps.notifications.models import Notification
+from apps.notifications.push import publish_notifications
+from apps.reservations.models import Reservation
+
+# Rows per bulk_create, and buffered events that trigger a flush.
+NOTIFICATION_BATCH_SIZE = 500
+# Redis list of pending events (JSON), drained by dispatch_queued_notifications.
+NOTIFICATION_QUEUE_KEY = "notifications:queue"
+# Items claimed by the running dispatch until they are written (at least once).
+NOTIFICATION_PROCESSING_KEY = "notifications:queue:processing"
+
+# Everything the reservation messages read, loaded in the same query.
+RESERVATION_RELATED = ("room__hotel", "user__user")
+
+logger = logging.getLogger(__name__)
+
+
+def _new_booking(reservation):
+    hotel = reservation.room.hotel
+    return (
+        hotel.owner_id,
+        f"You have a new booking for {hotel.name} by {reservation.user.user.email}.",
+        "reserved",
+    )
+
+
+def _booking_cancelled(reservation):
+    hotel = reservation.room.hotel
+    return (
+        hotel.owner_id,
+        f"Booking #{reservation.id} for {hotel.name} has been cancelled.",
+        "cancelled",
+    )
+
+
+def _checkin_reminder(reservation):
+    return (
+        reservation.user.user_id,
+        f"Reminder: Your check-in for {reservation.room.hotel.name} is tomorrow.",
+        "checkin_reminder",
+    )
+
+
+def _checked_in(reservation):
+    return (
+        reservation.room.hotel.owner_id,
+        f"Guest {reservation.user.user.email} has checked in.",
+        "checked_in",
+    )
+
+
+def _checked_out(reservation):
+    return (
+        reservation.room.hotel.owner_id,
+        f"Guest {reservation.user.user.email} has checked out.",
+        "checked_out",
+    )
+
+
+# event name -> reservation -> (recipient user id, message, notification_type)
+RESERVATION_EVENTS = {
+    "new_booking": _new_booking,
+    "booking_cancelled": _booking_cancelled,
+    "checkin_reminder": _checkin_reminder,
+    "checked_in": _checked_in,
+    "checked_out": _checked_out,
+}
+
+
+def notifications_committed(notifications):
+    """
+    Once new notifications are committed: count them into the unread
+    counters and push them to connected streams. Called from post_save and
+    from NotificationDispatcher.flush().
+
+    The rows are already committed, so a Redis outage is only logged: the
+    counters rebuild from the database once they expire, and streams
+    replay what they missed on reconnect.
+    """
+    try:
+        notifications_created(notifications)
+    except (RedisError, ConnectionInterrupted):
+        logger.exception("Could not update unread notification counters")
+    try:
+        publish_notifications(notifications)
+    except (RedisError, ConnectionInterrupted):
+        logger.exception("Could not publish new notifications")
+
+
+class NotificationDispatcher:
+    """
+    Buffers notification events and writes them with bulk_create.
+
+    Reservation events may name the reservation by id; all ids buffered
+    before a flush are resolved together with one select_related query, so
+    a flush costs two queries however many events it holds. The buffer is
+    flushed every NOTIFICATION_BATCH_SIZE events and when used as a context
+    manager, on exit.
+
+    bulk_create skips post_save, so flush() calls notifications_committed()
+    itself.
+    """
+
+    def __init__(self, batch_size=NOTIFICATION_BATCH_SIZE):
+        self.batch_size = batch_size
+        self.created = 0
+        self._events = []
+        self._notifications = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.flush()
+
+    def add(self, event, reservation):
+        """Buffer a RESERVATION_EVENTS event for a reservation (or its id)."""
+        if event not in RESERVATION_EVENTS:
+            raise ValueError(f"Unknown notification event: {event}")
+        self._events.append((event, reservation))
+        self._flush_if_full()
+
+    def notify(self, user_id, message, notification_type, **fields):
+        """Buffer a ready-made notification for a user."""
+        self._notifications.append(
+            Notification(
+                user_id=user_id,
+                message=message,
+                notification_type=notification_type,
+                **fields,
+            )
+        )
+        self._flush_if_full()
+
+    def add_queued(self, item):
+        """Buffer an item popped from the Redis queue (see enqueue_notifications)."""
+        if "event" in item:
+            self.add(item["event"], item["reservation_id"])
+        else:
+            self.notify(**item)
+
+    def _flush_if_full(self):
+        if len(self._events) + len(self._notifications) >= self.batch_size:
+            self.flush()
+
+    def _resolve_events(self):
+        ids = [r for _, r in self._events if not isinstance(r, Reservation)]
+        reservations = (
+            Reservation.objects.select_related(*RESERVATION_RELATED).in_bulk(ids)
+            if ids
+            else {}
+        )
+        for event, reservation in self._events:
+            if not isinstance(reservation, Reservation):
+                reservation = reservations.get(reservation)
+                if reservation is None:
+                    continue  # deleted since the event was queued
+            user_id, message, notification_type = RESERVATION_EVENTS[event](reservation)
+            self._notifications.append(
+                Notification(
+                    user_id=user_id,
+                    message=message,
+                    notification_type=notification_type,
+                )
+            )
+        self._events = []
+
+    def flush(self):
+        """Write everything buffered so far. Returns the created notifications."""
+        self._resolve_events()
+        notifications, self._notifications = self._notifications, []
+        created = Notification.objects.bulk_create(
+            notifications, batch_size=self.batch_size
+        )
+        self.created += len(created)
+        transaction.on_commit(lambda: notifications_committed(created))
+        return created
+
+
+def push_queued(items):
+    """Append notification items (dicts) to the Redis queue in one RPUSH."""
+    if items:
+        get_redis_connection("default").rpush(
+            NOTIFICATION_QUEUE_KEY, *[json.dumps(item) for item in items]
+        )
+
+
+# Moves up to ARGV[1] items from the head of the queue to the processing
+# list and returns them, atomically.
+CLAIM_SCRIPT = """
+local items = redis.call("lrange", KEYS[1], 0, tonumber(ARGV[1]) - 1)
+if #items > 0 then
+    redis.call("ltrim", KEYS[1], #items, -1)
+    redis.call("rpush", KEYS[2], unpack(items))
+end
+return items
+"""
+
+# Puts everything in the processing list back at the head of the queue,
+# keeping its order.
+REQUEUE_SCRIPT = """
+local moved = 0
+while redis.call("rpoplpush", KEYS[1], KEYS[2]) do
+    moved = moved + 1
+end
+return moved
+"""
+
+
+def claim_queued(count):
+    """
+    Take up to `count` raw items from the head of the queue. They stay in
+    NOTIFICATION_PROCESSING_KEY until ack_queued(), so a run that dies
+    before writing them loses nothing (see requeue_processing).
+    """
+    return get_redis_connection("default").eval(
+        CLAIM_SCRIPT, 2, NOTIFICATION_QUEUE_KEY, NOTIFICATION_PROCESSING_KEY, count
+    )
+
+
+def ack_queued(raw_items):
+    """Drop written (or discarded) items from the processing list."""
+    if raw_items:
+        with get_redis_connection("default").pipeline() as pipe:
+            for raw in raw_items:
+                pipe.lrem(NOTIFICATION_PROCESSING_KEY, 1, raw)
+            pipe.execute()
+
+
+def requeue_processing():
+    """Return the items of a run that never acked them to the queue."""
+    return get_redis_connection("default").eval(
+        REQUEUE_SCRIPT, 2, NOTIFICATION_PROCESSING_KEY, NOTIFICATION_QUEUE_KEY
+    )
@@ -0,0 +1,20 @@
+# Generated by Django 4.2.5 on 2026-10-18 08:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("notifications", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="notification",
+            index=models.Index(
+                fields=["user", "-created_at", "-id"],
+                name="notificatio_user_id_dfa1d2_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,43 @@
+# Generated by Django 4.2.5 on 2026-10-18 09:04
+
+from django.conf import settings
+import django.contrib.postgres.fields
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0003_alter_customerprofile_user_and_more"),
+        ("notifications", "0002_notification_user_created_index"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="GlobalNotificationReadState",
+            fields=[
+                (
+                    "user",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="global_notification_read_state",
+                        serialize=False,
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+                ("read_through", models.BigIntegerField(default=0)),
+                (
+                    "read_ids",
+                    django.contrib.postgres.fields.ArrayField(
+                        base_field=models.BigIntegerField(),
+                        blank=True,
+                        default=list,
+                        size=None,
+                    ),
+                ),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+        ),
+    ]
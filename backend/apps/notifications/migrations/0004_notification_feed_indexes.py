@@ -0,0 +1,32 @@
+# Generated by Django 4.2.5 on 2026-10-18 09:14
+
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    # Build the indexes without locking writes on a large notifications table.
+    atomic = False
+
+    dependencies = [
+        ("notifications", "0003_globalnotificationreadstate"),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name="notification",
+            index=models.Index(
+                condition=models.Q(("is_global", True)),
+                fields=["-created_at", "-id"],
+                name="notification_global_feed_idx",
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="notification",
+            index=models.Index(
+                condition=models.Q(("is_global", False), ("is_read", False)),
+                fields=["user"],
+                name="notification_unread_idx",
+            ),
+        ),
+    ]
@@ -1,10 +1,24 @@
 from django.contrib.auth import get_user_model
-from django.db import models
+from django.contrib.postgres.fields import ArrayField
+from django.db import models, transaction
+from django.db.models import OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
 from django.core.validators import MaxValueValidator, MinValueValidator
 
+from core.pagination import KeysetUnion
+
 User = get_user_model()
 
 
+class NotificationQuerySet(models.QuerySet):
+    def feed(self, user):
+        """
+        The user's notifications plus global ones, as a union of the two
+        indexed branches (see KeysetUnion) for cursor pagination.
+        """
+        return KeysetUnion(self.filter(user=user), self.filter(is_global=True))
+
+
 class Notification(models.Model):
     TYPE_CHOICES = [
         ("reserved", "Reserved"),
@@ -38,9 +52,132 @@ class Notification(models.Model):
 
     created_at = models.DateTimeField(auto_now_add=True)
 
+    objects = NotificationQuerySet.as_manager()
+
     class Meta:
         db_table = "notifications"
         ordering = ["-created_at"]
+        indexes = [
+            models.Index(fields=["user", "-created_at", "-id"]),
+            # Global rows are few; this keeps their feed branch tiny.
+            models.Index(
+                fields=["-created_at", "-id"],
+                name="notification_global_feed_idx",
+                condition=models.Q(is_global=True),
+            ),
+            # Unread counts and mark-all-read only touch unread personal rows.
+            models.Index(
+                fields=["user"],
+                name="notification_unread_idx",
+                condition=models.Q(is_read=False, is_global=False),
+            ),
+        ]
 
     def __str__(self):
         return f"🔔 {self.user or 'ALL'} → {self.notification_type} ({self.priority})"
+
+
+class GlobalNotificationReadStateManager(models.Manager):
+    @staticmethod
+    def _sent_before(date_joined):
+        """
+        The latest global notification sent before the user joined: older
+        broadcasts were never meant for them, so they start out read.
+        """
+        return (
+            Notification.objects.filter(is_global=True, created_at__lte=date_joined)
+            .order_by("-id")
+            .values("id")[:1]
+        )
+
+    def joined_watermark(self, user):
+        latest = self._sent_before(user.date_joined).values_list("id", flat=True)
+        return latest.first() or 0
+
+    def for_user(self, user):
+        """
+        A read-only snapshot of the user's read state, starting at their join
+        date if they have not read any global notification yet. Fetched in a
+        single query whether or not the user has a state row.
+        """
+        state = self.filter(user=OuterRef("pk"))
+        read_through, read_ids = (
+            User.objects.filter(pk=user.pk)
+            .values_list(
+                Coalesce(
+                    Subquery(state.values("read_through")),
+                    Subquery(self._sent_before(OuterRef("date_joined"))),
+                    Value(0),
+                    output_field=models.BigIntegerField(),
+                ),
+                Subquery(state.values("read_ids")),
+            )
+            .get()
+        )
+        return self.model(user=user, read_through=read_through, read_ids=read_ids or [])
+
+    @transaction.atomic
+    def mark_read(self, user, notification_id):
+        """
+        Mark one global notification as read for the user.
+        Returns False if it already was.
+        """
+        state, _ = self.select_for_update().get_or_create(
+            user=user, defaults={"read_through": self.joined_watermark(user)}
+        )
+        if state.has_read(notification_id):
+            return False
+        read = set(state.read_ids) | {notification_id}
+        # Move the watermark over the global notifications now read in a row.
+        following = (
+            Notification.objects.filter(is_global=True, id__gt=state.read_through)
+            .order_by("id")
+            .values_list("id", flat=True)[: len(read)]
+        )
+        for global_id in following:
+            if global_id not in read:
+                break
+            state.read_through = global_id
+            read.discard(global_id)
+        state.read_ids = sorted(read)
+        state.save(update_fields=["read_through", "read_ids", "updated_at"])
+        return True
+
+    def mark_all_read(self, user):
+        """Mark every global notification sent so far as read for the user."""
+        latest = (
+            Notification.objects.filter(is_global=True)
+            .order_by("-id")
+            .values_list("id", flat=True)
+            .first()
+        )
+        self.update_or_create(
+            user=user, defaults={"read_through": latest or 0, "read_ids": []}
+        )
+
+
+class GlobalNotificationReadState(models.Model):
+    """
+    A user's read state for global notifications, so a broadcast never fans
+    out into one row per user: every global notification with an id up to
+    `read_through` is read, plus those listed in `read_ids` above it.
+    Reads are folded into the watermark as soon as they are contiguous.
+    """
+
+    user = models.OneToOneField(
+        User,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="global_notification_read_state",
+    )
+    read_through = models.BigIntegerField(default=0)
+    read_ids = ArrayField(models.BigIntegerField(), default=list, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    objects = GlobalNotificationReadStateManager()
+
+    def has_read(self, notification_id):
+        return notification_id <= self.read_through or notification_id in self.read_ids
+
+    def __str__(self):
+        return f"Global notifications read by {self.user_id}"
@@ -0,0 +1,148 @@
+import asyncio
+import json
+import secrets
+import weakref
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.db import models
+from django_redis import get_redis_connection
+from redis import asyncio as aioredis
+
+from apps.notifications.api.v1.serializers import NotificationSerializer
+from apps.notifications.models import Notification
+
+# Every subscriber listens here as well as on its own user channel.
+GLOBAL_CHANNEL = "notifications:global"
+# Comment line sent when the stream is idle, so proxies keep it open.
+KEEPALIVE_INTERVAL = 15
+# Django 4.2 doesn't notice a client going away mid-stream, so streams end
+# after this long; EventSource reconnects and replays what it missed.
+STREAM_MAX_AGE = 5 * 60
+RECONNECT_DELAY_MS = 3000
+# Notifications replayed at most on reconnect (Last-Event-ID).
+REPLAY_LIMIT = 100
+# Stream tickets must be redeemed within this long, and only once.
+STREAM_TICKET_TIMEOUT = 30
+
+# One async Redis client (and connection pool) per event loop, i.e. per
+# worker under uvicorn; streams only open their own pubsub on it.
+_redis_clients = weakref.WeakKeyDictionary()
+
+
+def user_channel(user_id):
+    return f"notifications:user:{user_id}"
+
+
+def _ticket_key(ticket):
+    return cache.make_key(f"notifications:stream_ticket:{ticket}")
+
+
+def issue_stream_ticket(user_id):
+    """
+    A short-lived, single-use ticket opening one stream for the user.
+    EventSource can't send headers, and the ticket goes in the query string
+    instead of the access token, which lives far longer.
+    """
+    ticket = secrets.token_urlsafe(32)
+    get_redis_connection("default").set(
+        _ticket_key(ticket), user_id, ex=STREAM_TICKET_TIMEOUT
+    )
+    return ticket
+
+
+def redeem_stream_ticket(ticket):
+    """User id the ticket was issued to, or None; the ticket is used up."""
+    user_id = get_redis_connection("default").getdel(_ticket_key(ticket))
+    return int(user_id) if user_id is not None else None
+
+
+def _redis_client():
+    loop = asyncio.get_running_loop()
+    client = _redis_clients.get(loop)
+    if client is None:
+        client = _redis_clients[loop] = aioredis.from_url(
+            settings.CACHES["default"]["LOCATION"]
+        )
+    return client
+
+
+def _payload(notification):
+    return json.dumps(NotificationSerializer(notification).data)
+
+
+def publish_notifications(notifications):
+    """
+    Publish new notifications to their subscribers in one pipeline.
+    Called on commit, from the same places as counters.notifications_created.
+    """
+    messages = [
+        (
+            (
+                GLOBAL_CHANNEL
+                if notification.is_global
+                else user_channel(notification.user_id)
+            ),
+            _payload(notification),
+        )
+        for notification in notifications
+        if notification.is_global or notification.user_id
+    ]
+    if not messages:
+        return
+    with get_redis_connection("default").pipeline(transaction=False) as pipe:
+        for channel, payload in messages:
+            pipe.publish(channel, payload)
+        pipe.execute()
+
+
+@sync_to_async
+def _missed_notifications(user_id, last_event_id):
+    notifications = Notification.objects.filter(
+        models.Q(user_id=user_id) | models.Q(is_global=True), id__gt=last_event_id
+    ).order_by("id")[:REPLAY_LIMIT]
+    return [_payload(notification) for notification in notifications]
+
+
+def _event(payload, notification_id):
+    return f"id: {notification_id}\nevent: notification\ndata: {payload}\n\n"
+
+
+async def notification_events(user_id, last_event_id=None, max_age=STREAM_MAX_AGE):
+    """
+    Server-sent events for a user: one `notification` event per new
+    notification (data is the NotificationSerializer JSON), with keepalive
+    comments in between. With `last_event_id`, newer notifications stored
+    meanwhile are sent first.
+    """
+    pubsub = _redis_client().pubsub()
+    try:
+        # Subscribe before the replay query so nothing falls in between.
+        await pubsub.subscribe(user_channel(user_id), GLOBAL_CHANNEL)
+        yield f"retry: {RECONNECT_DELAY_MS}\n\n"
+
+        replayed = set()
+        if last_event_id is not None:
+            for payload in await _missed_notifications(user_id, last_event_id):
+                notification_id = json.loads(payload)["id"]
+                replayed.add(notification_id)
+                yield _event(payload, notification_id)
+
+        loop_time = asyncio.get_running_loop().time
+        deadline = loop_time() + max_age
+        while loop_time() < deadline:
+            message = await pubsub.get_message(
+                ignore_subscribe_messages=True,
+                timeout=min(KEEPALIVE_INTERVAL, max(deadline - loop_time(), 0)),
+            )
+            if message is None:
+                yield ": keepalive\n\n"
+                continue
+            payload = message["data"].decode()
+            notification_id = json.loads(payload)["id"]
+            if notification_id not in replayed:
+                yield _event(payload, notification_id)
+    finally:
+        # Hands the connection back to the shared pool.
+        await pubsub.aclose()
@@ -1,36 +1,40 @@
+from django.core.exceptions import ObjectDoesNotExist
+from django.db import transaction
 from django.db.models.signals import post_save, post_delete
 from django.dispatch import receiver
 from apps.notifications.models import Notification
 from apps.reviews.models import Review
 from apps.reservations.models import Reservation
 from apps.accounts.models import HotelOwnerProfile
-from apps.notifications.tasks import (
-    notify_new_booking,
-    notify_booking_cancelled,
-    remind_checkin,
-    notify_checked_in,
-    notify_checked_out,
-    send_custom_notification,
-)
+from apps.notifications.dispatcher import notifications_committed
+from apps.notifications.tasks import enqueue_notifications
+
+# Reservation status -> notification event sent when a booking reaches it.
+STATUS_EVENTS = {"checked_in": "checked_in", "checked_out": "checked_out"}
 
 
 @receiver(post_save, sender=Reservation)
 def handle_reservation_created_or_updated(sender, instance, created, **kwargs):
-    if created:
-        # new booking
-        notify_new_booking.delay(instance.id)
-    else:
-        # booking updated, check status
-        if instance.booking_status == "checked_in":
-            notify_checked_in.delay(instance.id)
-        elif instance.booking_status == "checked_out":
-            notify_checked_out.delay(instance.id)
+    # new booking, or a status the owner is told about
+    event = "new_booking" if created else STATUS_EVENTS.get(instance.booking_status)
+    if event:
+        item = {"event": event, "reservation_id": instance.id}
+        transaction.on_commit(lambda: enqueue_notifications(item))
 
 
 @receiver(post_delete, sender=Reservation)
 def handle_reservation_deleted(sender, instance, **kwargs):
-    # booking cancelled
-    notify_booking_cancelled.delay(instance.id)
+    # booking cancelled: the row is gone, so the message is built right away
+    try:
+        hotel = instance.room.hotel
+    except ObjectDoesNotExist:
+        return  # deleted together with its room or hotel
+    item = {
+        "user_id": hotel.owner_id,
+        "message": f"Booking #{instance.id} for {hotel.name} has been cancelled.",
+        "notification_type": "cancelled",
+    }
+    transaction.on_commit(lambda: enqueue_notifications(item))
 
 
 @receiver(post_save, sender=Review)
@@ -56,3 +60,10 @@ def review_or_reply_notification(sender, instance, created, **kwargs):
             notification_type="reply_submitted",
             priority="info",
         )
+
+
+@receiver(post_save, sender=Notification)
+def new_notification_committed(sender, instance, created, **kwargs):
+    # Bulk writes go through NotificationDispatcher, which does this itself.
+    if created:
+        transaction.on_commit(lambda: notifications_committed([instance]))
@@ -1,9 +1,25 @@
+import json
+import logging
+
 from celery import shared_task
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import DatabaseError, transaction
+from .dispatcher import (
+    NOTIFICATION_BATCH_SIZE,
+    RESERVATION_RELATED,
+    NotificationDispatcher,
+    ack_queued,
+    claim_queued,
+    push_queued,
+    requeue_processing,
+)
 from .models import Notification
+from apps.hotel.api.v1.services.cached_manager import SimpleCacheManager
 from apps.reservations.models import Reservation
 
 User = get_user_model()
+logger = logging.getLogger(__name__)
 
 
 @shared_task
@@ -44,19 +60,110 @@ def send_global_notification(message, priority="info", redirect_url=None):
     return "Global notification created for all users."
 
 
+# Set while a dispatch_queued_notifications run is scheduled.
+FLUSH_SCHEDULED_KEY = "notifications:queue:flush_scheduled"
+# Events are collected for this many seconds before they are written.
+FLUSH_DELAY = 1
+
+
+def enqueue_notifications(*items):
+    """
+    Queue notification items for batched writing: either reservation events
+    ({"event": "new_booking", "reservation_id": 1}) or ready-made ones
+    ({"user_id": 1, "message": "...", "notification_type": "custom"}).
+    Schedules one dispatch_queued_notifications run for the whole burst.
+    """
+    push_queued(items)
+    if cache.add(FLUSH_SCHEDULED_KEY, 1, timeout=60):
+        dispatch_queued_notifications.apply_async(countdown=FLUSH_DELAY)
+
+
+# Held by the dispatch run draining the queue; refreshed for every chunk.
+DISPATCH_LOCK_KEY = "notifications:queue:dispatching"
+DISPATCH_LOCK_TIMEOUT = 5 * 60
+
+
+def _write_queued(raw_items):
+    """
+    Write one claimed chunk in a transaction. Malformed items are dropped.
+    If the insert fails (e.g. a user was deleted meanwhile), the items are
+    written one by one and only those that still fail are dropped.
+    """
+    # Sized so nothing is flushed before the transaction below.
+    dispatcher = NotificationDispatcher(batch_size=len(raw_items) + 1)
+    items = []
+    for raw in raw_items:
+        try:
+            item = json.loads(raw)
+            dispatcher.add_queued(item)
+        except (KeyError, TypeError, ValueError):
+            logger.warning("Dropping malformed queued notification: %s", raw)
+            continue
+        items.append(item)
+
+    try:
+        with transaction.atomic():
+            dispatcher.flush()
+        return dispatcher.created
+    except DatabaseError:
+        logger.warning("Queued notification chunk failed, writing items one by one")
+
+    created = 0
+    for item in items:
+        try:
+            with transaction.atomic(), NotificationDispatcher() as dispatcher:
+                dispatcher.add_queued(item)
+            created += dispatcher.created
+        except DatabaseError:
+            logger.exception("Dropping queued notification: %s", item)
+    return created
+
+
+@shared_task(bind=True, max_retries=5)
+def dispatch_queued_notifications(self):
+    """
+    Drains the Redis notification queue in NOTIFICATION_BATCH_SIZE chunks,
+    two queries per chunk (see NotificationDispatcher).
+
+    Delivery is at least once: a chunk is only removed from the processing
+    list after it is committed, and whatever a crashed run left there is
+    queued again by the next one. Only one run drains at a time.
+    """
+    # Items queued from now on schedule a new run.
+    cache.delete(FLUSH_SCHEDULED_KEY)
+    token = SimpleCacheManager.acquire_lock(DISPATCH_LOCK_KEY, DISPATCH_LOCK_TIMEOUT)
+    if token is None:
+        return 0  # another run is draining the queue
+    created = 0
+    try:
+        requeue_processing()
+        while SimpleCacheManager.extend_lock(
+            DISPATCH_LOCK_KEY, token, DISPATCH_LOCK_TIMEOUT
+        ):
+            raw_items = claim_queued(NOTIFICATION_BATCH_SIZE)
+            if not raw_items:
+                break
+            created += _write_queued(raw_items)
+            ack_queued(raw_items)
+    except Exception as exc:
+        # The claimed chunk stays in the processing list for the retry.
+        raise self.retry(exc=exc, countdown=30 * 2**self.request.retries)
+    finally:
+        SimpleCacheManager.release_lock(DISPATCH_LOCK_KEY, token)
+    return created
+
+
+def _dispatch(event, reservation_id):
+    with NotificationDispatcher() as dispatcher:
+        dispatcher.add(event, reservation_id)
+
+
 @shared_task
 def notify_new_booking(reservation_id):
     """
     Notify hotel owner about a new reservation.
     """
-    reservation = Reservation.objects.get(id=reservation_id)
-    hotel = reservation.room.hotel
-    hotel_owner = hotel.owner
-    guest_email = reservation.user.user.email  # CustomerProfile → user
-    msg = f"You have a new booking for {hotel.name} by {guest_email}."
-    Notification.objects.create(
-        user=hotel_owner, message=msg, notification_type="reserved"
-    )
+    _dispatch("new_booking", reservation_id)
 
 
 @shared_task
@@ -64,13 +171,7 @@ def notify_booking_cancelled(reservation_id):
     """
     Notify hotel owner that a booking was cancelled.
     """
-    reservation = Reservation.objects.get(id=reservation_id)
-    hotel = reservation.room.hotel
-    hotel_owner = hotel.owner
-    msg = f"Booking #{reservation.id} for {hotel.name} has been cancelled."
-    Notification.objects.create(
-        user=hotel_owner, message=msg, notification_type="cancelled"
-    )
+    _dispatch("booking_cancelled", reservation_id)
 
 
 @shared_task
@@ -78,13 +179,7 @@ def remind_checkin(reservation_id):
     """
     Remind guest to check in tomorrow.
     """
-    reservation = Reservation.objects.get(id=reservation_id)
-    guest_user = reservation.user.user  # CustomerProfile → user
-    hotel_name = reservation.room.hotel.name
-    msg = f"Reminder: Your check-in for {hotel_name} is tomorrow."
-    Notification.objects.create(
-        user=guest_user, message=msg, notification_type="checkin_reminder"
-    )
+    _dispatch("checkin_reminder", reservation_id)
 
 
 @shared_task
@@ -92,14 +187,7 @@ def notify_checked_in(reservation_id):
     """
     Notify hotel owner when guest has checked in.
     """
-    reservation = Reservation.objects.get(id=reservation_id)
-    hotel = reservation.room.hotel
-    hotel_owner = hotel.owner
-    guest_email = reservation.user.user.email
-    msg = f"Guest {guest_email} has checked in."
-    Notification.objects.create(
-        user=hotel_owner, message=msg, notification_type="checked_in"
-    )
+    _dispatch("checked_in", reservation_id)
 
 
 @shared_task
@@ -107,14 +195,7 @@ def notify_checked_out(reservation_id):
     """
     Notify hotel owner when guest has checked out.
     """
-    reservation = Reservation.objects.get(id=reservation_id)
-    hotel = reservation.room.hotel
-    hotel_owner = hotel.owner
-    guest_email = reservation.user.user.email
-    msg = f"Guest {guest_email} has checked out."
-    Notification.objects.create(
-        user=hotel_owner, message=msg, notification_type="checked_out"
-    )
+    _dispatch("checked_out", reservation_id)
 
 
 @shared_task
@@ -130,7 +211,8 @@ def daily_checkin_reminders():
     tomorrow = date.today() + timedelta(days=1)
     reservations = Reservation.objects.filter(
         checking_date=tomorrow, booking_status="pending"
-    )
-    for reservation in reservations:
-        remind_checkin.delay(reservation.id)
-    return f"Sent reminders for {reservations.count()} reservations"
+    ).select_related(*RESERVATION_RELATED)
+    with NotificationDispatcher() as dispatcher:
+        for reservation in reservations.iterator(chunk_size=NOTIFICATION_BATCH_SIZE):
+            dispatcher.add("checkin_reminder", reservation)
+    return f"Sent reminders for {dispatcher.created} reservations"
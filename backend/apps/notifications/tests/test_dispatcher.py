@@ -0,0 +1,204 @@
+import pytest
+from celery.exceptions import Retry
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django_redis import get_redis_connection
+
+from apps.notifications import tasks
+from apps.notifications.dispatcher import (
+    NOTIFICATION_PROCESSING_KEY,
+    NOTIFICATION_QUEUE_KEY,
+    NotificationDispatcher,
+    claim_queued,
+)
+from apps.notifications.models import Notification
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def queue(monkeypatch):
+    """Empty notification queue; scheduled flushes are recorded, not sent."""
+    scheduled = []
+    monkeypatch.setattr(
+        tasks.dispatch_queued_notifications,
+        "apply_async",
+        lambda **kwargs: scheduled.append(kwargs),
+    )
+    get_redis_connection("default").delete(
+        NOTIFICATION_QUEUE_KEY, NOTIFICATION_PROCESSING_KEY
+    )
+    cache.delete_many([tasks.FLUSH_SCHEDULED_KEY, tasks.DISPATCH_LOCK_KEY])
+    yield scheduled
+    get_redis_connection("default").delete(
+        NOTIFICATION_QUEUE_KEY, NOTIFICATION_PROCESSING_KEY
+    )
+    cache.delete_many([tasks.FLUSH_SCHEDULED_KEY, tasks.DISPATCH_LOCK_KEY])
+
+
+def _app_queries(context):
+    # Ignore the profiler's own bookkeeping (silk) and transaction noise.
+    return [
+        q["sql"]
+        for q in context.captured_queries
+        if "silk_" not in q["sql"]
+        and not q["sql"].startswith(("SAVEPOINT", "RELEASE", "EXPLAIN"))
+    ]
+
+
+def test_flush_costs_two_queries_for_any_number_of_events(reservation_factory):
+    reservations = [reservation_factory(hotel_name=f"Hotel {n}") for n in range(5)]
+
+    with CaptureQueriesContext(connection) as context:
+        with NotificationDispatcher() as dispatcher:
+            for reservation in reservations:
+                dispatcher.add("new_booking", reservation.id)
+                dispatcher.add("checked_in", reservation.id)
+
+    assert len(_app_queries(context)) == 2
+    assert dispatcher.created == 10
+    owner = reservations[0].room.hotel.owner
+    messages = set(Notification.objects.filter(user=owner).values_list("message"))
+    assert messages == {
+        (f"You have a new booking for Hotel 0 by {reservations[0].user.user.email}.",),
+        (f"Guest {reservations[0].user.user.email} has checked in.",),
+    }
+
+
+def test_buffer_is_flushed_every_batch(reservation_factory):
+    reservation = reservation_factory()
+
+    dispatcher = NotificationDispatcher(batch_size=2)
+    for _ in range(3):
+        dispatcher.add("new_booking", reservation.id)
+
+    assert dispatcher.created == 2
+    dispatcher.flush()
+    assert Notification.objects.count() == 3
+
+
+def test_deleted_reservations_are_skipped(reservation_factory):
+    reservation = reservation_factory()
+    reservation_id = reservation.id
+    reservation.delete()
+    Notification.objects.all().delete()
+
+    with NotificationDispatcher() as dispatcher:
+        dispatcher.add("new_booking", reservation_id)
+
+    assert dispatcher.created == 0
+
+
+def test_unknown_event_is_rejected():
+    with pytest.raises(ValueError):
+        NotificationDispatcher().add("no_such_event", 1)
+
+
+def test_queued_burst_is_written_by_one_scheduled_run(
+    queue, reservation_factory, user_factory
+):
+    reservations = [reservation_factory(hotel_name=f"Hotel {n}") for n in range(3)]
+    user = user_factory()
+
+    for reservation in reservations:
+        tasks.enqueue_notifications(
+            {"event": "new_booking", "reservation_id": reservation.id}
+        )
+    tasks.enqueue_notifications(
+        {"user_id": user.id, "message": "Hi", "notification_type": "custom"}
+    )
+    assert len(queue) == 1
+
+    assert tasks.dispatch_queued_notifications() == 4
+    assert Notification.objects.filter(notification_type="reserved").count() == 3
+    assert Notification.objects.get(user=user).message == "Hi"
+    assert get_redis_connection("default").llen(NOTIFICATION_QUEUE_KEY) == 0
+
+
+def test_malformed_queued_items_are_dropped_alone(queue, user_factory):
+    user = user_factory()
+    get_redis_connection("default").rpush(
+        NOTIFICATION_QUEUE_KEY,
+        "not json",
+        '{"event": "no_such_event", "reservation_id": 1}',
+        '{"user_id": %d, "no_such_field": 1}' % user.id,
+    )
+    tasks.enqueue_notifications(
+        {"user_id": user.id, "message": "Hi", "notification_type": "custom"}
+    )
+
+    assert tasks.dispatch_queued_notifications() == 1
+    assert Notification.objects.get(user=user).message == "Hi"
+    redis = get_redis_connection("default")
+    assert redis.llen(NOTIFICATION_QUEUE_KEY) == 0
+    assert redis.llen(NOTIFICATION_PROCESSING_KEY) == 0
+
+
+def test_chunk_of_a_crashed_run_is_written_by_the_next(
+    queue, monkeypatch, user_factory
+):
+    users = [user_factory() for _ in range(3)]
+    tasks.enqueue_notifications(
+        *(
+            {"user_id": user.id, "message": "Hi", "notification_type": "custom"}
+            for user in users
+        )
+    )
+    claim_queued(2)  # a run that died before writing its chunk
+
+    def fail(raw_items):
+        raise ConnectionError
+
+    with monkeypatch.context() as patch:
+        patch.setattr(tasks, "_write_queued", fail)
+        with pytest.raises(Retry):
+            tasks.dispatch_queued_notifications.apply(throw=True)
+    assert not Notification.objects.exists()
+    assert get_redis_connection("default").llen(NOTIFICATION_PROCESSING_KEY) == 3
+
+    assert tasks.dispatch_queued_notifications() == 3
+    assert set(Notification.objects.values_list("user", flat=True)) == {
+        user.id for user in users
+    }
+    redis = get_redis_connection("default")
+    assert redis.llen(NOTIFICATION_QUEUE_KEY) == 0
+    assert redis.llen(NOTIFICATION_PROCESSING_KEY) == 0
+
+
+def test_run_stops_and_keeps_a_lock_taken_over_by_another_run(
+    queue, monkeypatch, user_factory
+):
+    users = [user_factory() for _ in range(2)]
+    tasks.enqueue_notifications(
+        *(
+            {"user_id": user.id, "message": "Hi", "notification_type": "custom"}
+            for user in users
+        )
+    )
+    write_queued = tasks._write_queued
+
+    def slow_write(raw_items):
+        # Our lock expired mid-chunk and another run took it over.
+        cache.delete(tasks.DISPATCH_LOCK_KEY)
+        cache.add(tasks.DISPATCH_LOCK_KEY, "other-run", 60)
+        return write_queued(raw_items)
+
+    monkeypatch.setattr(tasks, "NOTIFICATION_BATCH_SIZE", 1)
+    monkeypatch.setattr(tasks, "_write_queued", slow_write)
+
+    assert tasks.dispatch_queued_notifications() == 1
+    assert cache.get(tasks.DISPATCH_LOCK_KEY) == "other-run"
+    assert get_redis_connection("default").llen(NOTIFICATION_QUEUE_KEY) == 1
+
+
+def test_reservation_signal_queues_on_commit(
+    queue, reservation_factory, django_capture_on_commit_callbacks
+):
+    with django_capture_on_commit_callbacks(execute=True):
+        reservation = reservation_factory()
+
+    tasks.dispatch_queued_notifications()
+
+    notification = Notification.objects.get(user=reservation.room.hotel.owner)
+    assert notification.notification_type == "reserved"
@@ -1,7 +1,11 @@
 import pytest
 from django.urls import reverse
+from django.utils import timezone
+from django.db import connection
+from django.db.models import Q
+from django.test.utils import CaptureQueriesContext
 from rest_framework.test import APIClient
-from apps.notifications.models import Notification
+from apps.notifications.models import GlobalNotificationReadState, Notification
 
 pytestmark = pytest.mark.django_db
 
@@ -29,11 +33,28 @@ def test_user_can_list_their_notifications(user_factory):
     response = client.get(url)
 
     assert response.status_code == 200
-    assert len(response.data) == 2
-    messages = [n["message"] for n in response.data]
+    assert len(response.data["results"]) == 2
+    messages = [n["message"] for n in response.data["results"]]
     assert "Test Notification" in messages
 
 
+def test_notifications_are_cursor_paginated(user_factory):
+    """✅ Should page through notifications newest first with a cursor."""
+    user = user_factory()
+    created = [create_notification(user=user) for _ in range(3)]
+
+    client = APIClient()
+    client.force_authenticate(user=user)
+
+    url = reverse("notifications:list-notifications")
+    first = client.get(url, {"page_size": 2})
+    second = client.get(first.data["next"])
+
+    ids = [n["id"] for n in first.data["results"] + second.data["results"]]
+    assert ids == [n.id for n in reversed(created)]
+    assert second.data["next"] is None
+
+
 def test_unauthenticated_user_cannot_list_notifications():
     """✅ Should return 401 for anonymous users."""
     client = APIClient()
@@ -77,3 +98,73 @@ def test_user_cannot_mark_other_users_notification(user_factory):
     assert response.status_code == 404
     notif.refresh_from_db()
     assert notif.is_read is False
+
+
+def test_user_can_mark_global_notification_as_read(user_factory):
+    """✅ Global notifications are read per user, without touching the shared row."""
+    reader = user_factory()
+    other = user_factory()
+    notif = create_notification(user=None, is_global=True)
+    url = reverse("notifications:list-notifications")
+
+    client = APIClient()
+    client.force_authenticate(user=reader)
+    response = client.post(
+        reverse("notifications:mark-read-notification", args=[notif.id])
+    )
+    assert response.status_code == 200
+    assert client.get(url).data["results"][0]["is_read"] is True
+
+    client.force_authenticate(user=other)
+    assert client.get(url).data["results"][0]["is_read"] is False
+    notif.refresh_from_db()
+    assert notif.is_read is False
+
+
+def test_global_read_state_folds_contiguous_reads_into_watermark(user_factory):
+    """✅ Out-of-order reads are kept as ids until the gap is read."""
+    user = user_factory()
+    first, second, third = [
+        create_notification(user=None, is_global=True) for _ in range(3)
+    ]
+
+    assert GlobalNotificationReadState.objects.mark_read(user, second.id)
+    state = GlobalNotificationReadState.objects.get(user=user)
+    assert (state.read_through, state.read_ids) == (0, [second.id])
+    assert not state.has_read(first.id)
+
+    assert GlobalNotificationReadState.objects.mark_read(user, first.id)
+    assert not GlobalNotificationReadState.objects.mark_read(user, first.id)
+    state = GlobalNotificationReadState.objects.get(user=user)
+    assert (state.read_through, state.read_ids) == (second.id, [])
+    assert state.has_read(first.id) and not state.has_read(third.id)
+
+
+def test_notification_feed_pages_through_union_of_personal_and_global(user_factory):
+    """✅ The feed is a UNION of two branches and pages like the OR'd query."""
+    user = user_factory()
+    other = user_factory()
+    for i in range(9):
+        create_notification(user=user, is_global=i % 3 == 0)
+        create_notification(user=other)
+    # Ties on created_at are resolved by the cursor's offset.
+    tied = Notification.objects.filter(user=user).order_by("id")[:3]
+    Notification.objects.filter(id__in=tied).update(created_at=timezone.now())
+    expected = list(
+        Notification.objects.filter(Q(user=user) | Q(is_global=True))
+        .order_by("-created_at", "-id")
+        .values_list("id", flat=True)
+    )
+
+    client = APIClient()
+    client.force_authenticate(user=user)
+    url = reverse("notifications:list-notifications") + "?page_size=2"
+    seen = []
+    with CaptureQueriesContext(connection) as context:
+        while url:
+            data = client.get(url).data
+            seen += [notification["id"] for notification in data["results"]]
+            url = data["next"]
+
+    assert seen == expected
+    assert any(" UNION " in query["sql"] for query in context.captured_queries)
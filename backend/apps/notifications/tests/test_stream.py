@@ -0,0 +1,198 @@
+import asyncio
+import json
+
+import pytest
+import redis
+from django.conf import settings
+from django.test import AsyncClient, Client
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from apps.notifications.dispatcher import NotificationDispatcher
+from apps.notifications.models import Notification
+from apps.notifications.push import (
+    GLOBAL_CHANNEL,
+    _redis_client,
+    issue_stream_ticket,
+    notification_events,
+    publish_notifications,
+    redeem_stream_ticket,
+    user_channel,
+)
+
+STREAM_URL = reverse("notifications:notification-stream")
+
+
+@pytest.fixture
+def subscribe():
+    client = redis.from_url(settings.CACHES["default"]["LOCATION"])
+    pubsub = client.pubsub()
+
+    def _subscribe(*channels):
+        pubsub.subscribe(*channels)
+        for _ in channels:
+            pubsub.get_message(timeout=1)  # subscription confirmations
+        return pubsub
+
+    yield _subscribe
+    pubsub.close()
+    client.close()
+
+
+def _received(pubsub):
+    received = []
+    while message := pubsub.get_message(timeout=0.5):
+        received.append((message["channel"].decode(), json.loads(message["data"])))
+    return received
+
+
+def _notify(user=None):
+    return Notification.objects.create(
+        user=user,
+        message="Test Notification",
+        notification_type="custom",
+        is_global=user is None,
+    )
+
+
+@pytest.mark.django_db
+def test_new_notifications_are_published_on_commit(
+    user_factory, subscribe, django_capture_on_commit_callbacks
+):
+    user = user_factory()
+    pubsub = subscribe(user_channel(user.id), GLOBAL_CHANNEL)
+
+    with django_capture_on_commit_callbacks(execute=True):
+        personal = _notify(user)
+        broadcast = _notify()
+        assert _received(pubsub) == []
+
+    received = _received(pubsub)
+    assert [(channel, data["id"]) for channel, data in received] == [
+        (user_channel(user.id), personal.id),
+        (GLOBAL_CHANNEL, broadcast.id),
+    ]
+    assert received[0][1]["message"] == "Test Notification"
+    assert received[0][1]["is_read"] is False
+
+
+@pytest.mark.django_db
+def test_dispatcher_publishes_bulk_created_notifications(
+    user_factory, subscribe, django_capture_on_commit_callbacks
+):
+    users = [user_factory() for _ in range(3)]
+    pubsub = subscribe(*(user_channel(user.id) for user in users))
+
+    with django_capture_on_commit_callbacks(execute=True):
+        with NotificationDispatcher() as dispatcher:
+            for user in users:
+                dispatcher.notify(user.id, "Hello", "custom")
+
+    assert sorted(channel for channel, _ in _received(pubsub)) == sorted(
+        user_channel(user.id) for user in users
+    )
+
+
+@pytest.mark.django_db
+def test_stream_yields_published_notifications(user_factory):
+    user, other = user_factory(), user_factory()
+    mine, theirs, broadcast = _notify(user), _notify(other), _notify()
+
+    async def read_stream():
+        events = notification_events(user.id, max_age=2)
+        chunks = [await anext(events)]  # subscribed
+        publish_notifications([theirs, mine, broadcast])
+        chunks += [chunk async for chunk in events]
+        return chunks
+
+    chunks = asyncio.run(read_stream())
+
+    assert chunks[0].startswith("retry:")
+    events = [chunk for chunk in chunks if chunk.startswith("id:")]
+    assert [event.split("\n")[0] for event in events] == [
+        f"id: {mine.id}",
+        f"id: {broadcast.id}",
+    ]
+    assert "event: notification" in events[0]
+
+
+@pytest.mark.django_db(transaction=True)
+def test_stream_replays_notifications_after_last_event_id(user_factory):
+    user = user_factory()
+    seen = _notify(user)
+    missed = [_notify(user), _notify()]
+
+    async def read_stream():
+        events = notification_events(user.id, last_event_id=seen.id, max_age=0)
+        return [chunk async for chunk in events]
+
+    chunks = asyncio.run(read_stream())
+
+    assert [chunk.split("\n")[0] for chunk in chunks if chunk.startswith("id:")] == [
+        f"id: {notification.id}" for notification in missed
+    ]
+
+
+def test_streams_share_one_redis_client_per_event_loop():
+    async def clients():
+        return _redis_client(), _redis_client()
+
+    first, second = asyncio.run(clients())
+
+    assert first is second
+    assert asyncio.run(clients())[0] is not first
+
+
+def _get(*args, **kwargs):
+    """GET the stream through the ASGI handler; the body is left unread."""
+    response = asyncio.run(AsyncClient().get(*args, **kwargs))
+    response.close()
+    return response
+
+
+@pytest.mark.django_db(transaction=True)
+def test_stream_requires_a_valid_token(user_factory):
+    token = str(AccessToken.for_user(user_factory()))
+
+    assert _get(STREAM_URL).status_code == 401
+    assert _get(STREAM_URL, {"ticket": "not-a-ticket"}).status_code == 401
+    # Access tokens are only accepted in the Authorization header.
+    assert _get(STREAM_URL, {"token": token}).status_code == 401
+
+
+@pytest.mark.django_db(transaction=True)
+def test_stream_accepts_header_or_ticket(user_factory):
+    user = user_factory()
+    token = str(AccessToken.for_user(user))
+
+    for response in (
+        _get(STREAM_URL, headers={"Authorization": f"Bearer {token}"}),
+        _get(STREAM_URL, {"ticket": issue_stream_ticket(user.id)}),
+    ):
+        assert response.status_code == 200
+        assert response["Content-Type"] == "text/event-stream"
+        assert response.streaming
+
+
+@pytest.mark.django_db
+def test_stream_ticket_is_issued_to_the_user_and_single_use(user_factory):
+    user = user_factory()
+    client = APIClient()
+    client.force_authenticate(user)
+
+    response = client.post(reverse("notifications:notification-stream-ticket"))
+
+    assert response.status_code == 201
+    ticket = response.data["ticket"]
+    assert redeem_stream_ticket(ticket) == user.id
+    assert redeem_stream_ticket(ticket) is None
+
+
+@pytest.mark.django_db
+def test_stream_refuses_wsgi(user_factory):
+    token = str(AccessToken.for_user(user_factory()))
+
+    response = Client().get(STREAM_URL, HTTP_AUTHORIZATION=f"Bearer {token}")
+
+    assert response.status_code == 501
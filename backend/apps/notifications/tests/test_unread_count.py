@@ -0,0 +1,202 @@
+from unittest.mock import patch
+
+import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from redis.exceptions import ConnectionError as RedisConnectionError
+from rest_framework.test import APIClient
+
+from apps.notifications import counters, dispatcher
+from apps.notifications.counters import count_unread_from_db
+from apps.notifications.dispatcher import NotificationDispatcher
+from apps.notifications.models import GlobalNotificationReadState, Notification
+
+pytestmark = pytest.mark.django_db
+
+COUNT_URL = reverse("notifications:unread-notification-count")
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.fixture
+def user(user_factory):
+    return user_factory()
+
+
+@pytest.fixture
+def client(user):
+    client = APIClient()
+    client.force_authenticate(user=user)
+    return client
+
+
+def _notify(user=None, **fields):
+    return Notification.objects.create(
+        user=user,
+        message="Test Notification",
+        notification_type="custom",
+        is_global=user is None,
+        **fields,
+    )
+
+
+def _unread(client):
+    return client.get(COUNT_URL).data["unread"]
+
+
+def test_count_is_rebuilt_from_db_then_served_from_cache(client, user):
+    _notify(user)
+    _notify(user, is_read=True)
+    _notify()
+
+    assert _unread(client) == 2
+    with CaptureQueriesContext(connection) as context:
+        assert _unread(client) == 2
+    # Only the profiler's own bookkeeping (silk) hits the database.
+    assert not [
+        q
+        for q in context.captured_queries
+        if "silk_" not in q["sql"] and not q["sql"].startswith(("SAVEPOINT", "RELEASE"))
+    ]
+
+
+def test_counter_follows_creates_and_reads(
+    client, user, django_capture_on_commit_callbacks
+):
+    personal = _notify(user)
+    assert _unread(client) == 1
+
+    with django_capture_on_commit_callbacks(execute=True):
+        _notify(user)
+        with NotificationDispatcher() as dispatcher:
+            dispatcher.notify(user.id, "Batched", "custom")
+    assert _unread(client) == 3
+
+    client.post(reverse("notifications:mark-read-notification", args=[personal.id]))
+    client.post(reverse("notifications:mark-read-notification", args=[personal.id]))
+    assert _unread(client) == 2
+    assert _unread(client) == count_unread_from_db(user)
+
+
+def test_concurrent_mark_read_decrements_once(client, user):
+    personal = _notify(user)
+    _notify(user)
+    assert _unread(client) == 2
+    url = reverse("notifications:mark-read-notification", args=[personal.id])
+
+    # Both requests loaded the notification while it was still unread.
+    stale = Notification.objects.get(pk=personal.pk)
+    with patch.object(Notification.objects, "get", return_value=stale):
+        client.post(url)
+        client.post(url)
+
+    assert _unread(client) == 1
+    assert count_unread_from_db(user) == 1
+
+
+def test_global_notification_invalidates_every_counter(
+    client, user, django_capture_on_commit_callbacks
+):
+    assert _unread(client) == 0
+
+    with django_capture_on_commit_callbacks(execute=True):
+        notification = _notify()
+    assert _unread(client) == 1
+
+    client.post(reverse("notifications:mark-read-notification", args=[notification.id]))
+    assert _unread(client) == 0
+
+
+def test_redis_outage_after_commit_does_not_fail_the_write(
+    monkeypatch, user, django_capture_on_commit_callbacks
+):
+    def redis_down(notifications):
+        raise RedisConnectionError("Redis is down")
+
+    monkeypatch.setattr(dispatcher, "notifications_created", redis_down)
+    monkeypatch.setattr(dispatcher, "publish_notifications", redis_down)
+
+    with django_capture_on_commit_callbacks(execute=True):
+        notification = _notify(user)
+
+    assert Notification.objects.filter(pk=notification.pk).exists()
+
+
+def test_mark_all_read(client, user):
+    _notify(user)
+    _notify()
+    assert _unread(client) == 2
+
+    response = client.post(reverse("notifications:mark-all-read-notifications"))
+
+    assert response.status_code == 200
+    assert _unread(client) == 0
+    assert count_unread_from_db(user) == 0
+    results = client.get(reverse("notifications:list-notifications")).data["results"]
+    assert [n["is_read"] for n in results] == [True, True]
+
+
+def test_global_notifications_sent_before_joining_start_out_read(user_factory):
+    _notify()
+    user = user_factory()
+    latest = _notify()
+    client = APIClient()
+    client.force_authenticate(user=user)
+
+    assert _unread(client) == 1
+    results = client.get(reverse("notifications:list-notifications")).data["results"]
+    assert [(n["id"], n["is_read"]) for n in results][0] == (latest.id, False)
+    assert [n["is_read"] for n in results[1:]] == [True]
+
+    assert GlobalNotificationReadState.objects.mark_read(user, latest.id)
+    state = GlobalNotificationReadState.objects.get(user=user)
+    assert (state.read_through, state.read_ids) == (latest.id, [])
+    assert count_unread_from_db(user) == 0
+
+
+def test_rebuild_missing_a_concurrent_notification_is_not_cached(
+    client, user, monkeypatch, django_capture_on_commit_callbacks
+):
+    def count_then_notify(user):
+        count = count_unread_from_db(user)
+        with django_capture_on_commit_callbacks(execute=True):
+            _notify(user)  # lands after the count, before it is stored
+        return count
+
+    monkeypatch.setattr(counters, "count_unread_from_db", count_then_notify)
+    assert _unread(client) == 0
+    monkeypatch.undo()
+
+    assert cache.get(counters._unread_key(user.id)) is None
+    assert _unread(client) == 1
+
+
+def test_mark_all_read_keeps_notifications_created_meanwhile(
+    client, user, monkeypatch, django_capture_on_commit_callbacks
+):
+    _notify(user)
+    assert _unread(client) == 1
+    mark_all_read = GlobalNotificationReadState.objects.mark_all_read
+
+    def mark_all_read_then_notify(user):
+        mark_all_read(user)
+        with django_capture_on_commit_callbacks(execute=True):
+            _notify(user)
+
+    monkeypatch.setattr(
+        GlobalNotificationReadState.objects, "mark_all_read", mark_all_read_then_notify
+    )
+    client.post(reverse("notifications:mark-all-read-notifications"))
+
+    assert _unread(client) == 1 == count_unread_from_db(user)
+
+
+def test_unread_count_requires_authentication():
+    assert APIClient().get(COUNT_URL).status_code == 401
@@ -3,7 +3,8 @@ from rest_framework.exceptions import ValidationError
 
 
 
-from apps.reservations.models import Reservation
+from apps.hotel.models import Room
+from apps.reservations.models import Reservation, PreferredPaymentStatus
 
 from apps.reservations.services import create_reservation
 
@@ -34,7 +35,9 @@ class ReservationCreateSerializer(serializers.ModelSerializer):
             raise ValidationError("Check-in date must be before check-out date.")
 
         # Use the manager method for the initial availability check.
-        if not Reservation.objects.is_room_available(room.id, check_in, check_out):
+        if not room.is_available or not Reservation.objects.is_room_available(
+            room.id, check_in, check_out
+        ):
             raise ValidationError(
                 "This room is not available for the selected date range."
             )
@@ -60,6 +63,41 @@ class ReservationCreateSerializer(serializers.ModelSerializer):
         return reservation
 
 
+class BulkReservationCreateSerializer(serializers.Serializer):
+    """
+    Validates a group booking: one stay applied to up to MAX_ROOMS rooms.
+    All requested rooms are loaded with a single query.
+    """
+
+    MAX_ROOMS = 50
+
+    rooms = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        allow_empty=False,
+        max_length=MAX_ROOMS,
+    )
+    checking_date = serializers.DateField()
+    checkout_date = serializers.DateField()
+    prefered_payment_method = serializers.ChoiceField(
+        choices=PreferredPaymentStatus.choices,
+        default=PreferredPaymentStatus.PREPAID,
+    )
+    coupon_code = serializers.CharField(required=False, allow_blank=True)
+
+    def validate_rooms(self, value):
+        room_ids = list(dict.fromkeys(value))  # de-duplicate, keep order
+        rooms = Room.objects.in_bulk(room_ids)
+        missing = [room_id for room_id in room_ids if room_id not in rooms]
+        if missing:
+            raise ValidationError(f"Rooms not found: {missing}")
+        return [rooms[room_id] for room_id in room_ids]
+
+    def validate(self, data):
+        if data["checking_date"] >= data["checkout_date"]:
+            raise ValidationError("Check-in date must be before check-out date.")
+        return data
+
+
 #  Reservation List
 class ReservationListSerializer(serializers.ModelSerializer):
     room_title = serializers.CharField(source="room.title")
@@ -14,6 +14,11 @@ urlpatterns = [
         views.RoomReservationCreateView.as_view(),
         name="room-reserve",
     ),  # Create a reservation for a room
+    path(
+        "rooms/reserve/bulk/",
+        views.BulkRoomReservationCreateView.as_view(),
+        name="room-reserve-bulk",
+    ),  # Reserve several rooms for the same stay in one request
     path(
         "my/", views.UserReservationListView.as_view(), name="user-reservations"
     ),  # List current user's reservations
@@ -28,6 +33,11 @@ urlpatterns = [
         views.HotelOwnerReservationListView.as_view(),
         name="owner-reservations",
     ),  # List reservations for hotels owned by current user
+    path(
+        "owner/export/",
+        views.HotelOwnerReservationExportView.as_view(),
+        name="owner-reservations-export",
+    ),  # Stream the owner's reservations as CSV or NDJSON
     #  Invoice & Reporting
     path(
         "<int:pk>/invoice/",
@@ -47,4 +57,9 @@ urlpatterns = [
         views.RoomWiseReservationReportView.as_view(),
         name="room-wise-report",
     ),
+    path(
+        "report/export/",
+        views.ReservationReportExportView.as_view(),
+        name="reservation-report-export",
+    ),
 ]
@@ -1,8 +1,7 @@
 from datetime import date, timedelta, datetime
 from django.utils import timezone
-from django.db.models import Sum, Count
+from django.db.models import F, Sum
 from django.db.models.functions import (
-    TruncDate,
     TruncMonth,
     TruncDay,
     TruncWeek,
@@ -16,21 +15,28 @@ from rest_framework.response import Response
 from rest_framework.views import APIView
 from rest_framework import generics, status
 
-from core.redis_client import redis_client
-
 
 from django.shortcuts import get_object_or_404
 
 # Local app imports
 from .serializers import (
     ReservationCreateSerializer,
+    BulkReservationCreateSerializer,
     ReservationListSerializer,
     OwnerReservationSerializer,
     ReservationInvoiceSerializer,
 )
+from core.pagination import BookingDateCursorPagination
+from apps.accounts.api.v1.permissions import IsCustomer
 from apps.hotel.models import Room
-from apps.reservations.models import Reservation, BookingStatus
+from apps.reservations.models import (
+    Reservation,
+    ReservationDailyRollup,
+    BookingStatus,
+)
 from apps.reservations.tasks import send_reservation_cancellation_email
+from apps.reservations.services import create_bulk_reservations
+from .exports import stream_export
 
 
 @api_view(["GET"])
@@ -44,14 +50,17 @@ def api_overview(request):
     return Response(
         {
             "Reserve Room": "rooms/<int:room_id>/reserve/",
+            "Reserve Rooms In Bulk": "rooms/reserve/bulk/",
             "My Reservations": "my/",
             "Cancel Reservation": "<int:pk>/cancel/",
             "Owner Reservations": "owner/",
+            "Export Owner Reservations": "owner/export/?output=csv|ndjson",
             "Reservation Invoice": "<int:pk>/invoice/",
             # Reports
             "Daily & Summary Report": "report/",
             "Monthly Reservation Report": "report/monthly/?range=month|week|day|quarter|year",
             "Room Popularity Report": "report/by-room/",
+            "Export Daily Report": "report/export/?output=csv|ndjson",
         }
     )
 
@@ -67,60 +76,75 @@ class RoomReservationCreateView(generics.CreateAPIView):
 
     Allows authenticated users to create a reservation for a specific room.
     The room ID is typically passed in the serializer payload or URL.
+
+    No application lock is taken: the serializer rejects dates that are
+    already booked (400), and if a concurrent request claims the same nights
+    between that check and the insert, the RoomNight unique constraint makes
+    the service fail fast with 409 Conflict.
     """
 
     queryset = Reservation.objects.all()
     serializer_class = ReservationCreateSerializer
     permission_classes = [IsAuthenticated]
 
-    def create(self, request, *args, **kwargs):
-        serializer = self.get_serializer(data=request.data)
-        serializer.is_valid(raise_exception=True)
 
-        # Extract data needed for the lock and final check
-        room = serializer.validated_data["room"]
-        checkin_date = serializer.validated_data["checking_date"]
-        checkout_date = serializer.validated_data["checkout_date"]
-
-        # Define the lock key for Redis
-        lock_key = f"lock:room:{room.id}"
-        lock_timeout_seconds = 15  # The lock will auto-release after 15s
-
-        # Acquire the lock from our redis_client
-        lock = redis_client.lock(lock_key, timeout=lock_timeout_seconds)
-
-        try:
-            # Attempt to acquire the lock. If it's not acquired within 600 seconds,
-            # it means the room is being booked by someone else right now.
-            if not lock.acquire(blocking=True, blocking_timeout=600):
-                raise ValidationError(
-                    "This room is currently being booked by another user. Please try again in a moment.",
-                    code="service_unavailable",
-                )
+class BulkRoomReservationCreateView(APIView):
+    """
+    Endpoint: POST /api/v1/reservations/rooms/reserve/bulk/
 
-            # --- CRITICAL SECTION ---
-            # Now that we have the lock, we perform one final check to ensure the
-            # room wasn't booked in the milliseconds before we acquired the lock.
-            if not Reservation.objects.is_room_available(
-                room.id, checkin_date, checkout_date
-            ):
-                raise ValidationError(
-                    "Sorry, this room has just been booked for the selected dates.",
-                    code="conflict",
-                )
+    Books up to 50 rooms for the same stay in one round-trip (group bookings).
+    Payload: {"rooms": [ids], "checking_date", "checkout_date",
+              "prefered_payment_method", "coupon_code"}
 
-            # If the room is still available, proceed with saving the reservation.
-            # The serializer's create method will be called here.
-            self.perform_create(serializer)
-            headers = self.get_success_headers(serializer.data)
-            return Response(
-                serializer.data, status=status.HTTP_201_CREATED, headers=headers
-            )
+    Returns one result per requested room. Responds 201 if at least one room
+    was reserved, or 409 if none of them were free. Only customers can book.
+    """
+
+    permission_classes = [IsCustomer]
 
-        finally:
-            # Always release the lock when we're done.
-            if lock.locked():
-                lock.release()
+    def post(self, request):
+        user_profile = getattr(request.user, "customer_profile", None)
+        if user_profile is None:
+            raise PermissionDenied("Only customers can book rooms.")
+        serializer = BulkReservationCreateSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+
+        reservations, unavailable_room_ids = create_bulk_reservations(
+            user_profile=user_profile,
+            rooms=data["rooms"],
+            check_in_date=data["checking_date"],
+            check_out_date=data["checkout_date"],
+            prefered_payment_method=data["prefered_payment_method"],
+            coupon_code=data.get("coupon_code"),
+        )
+
+        reserved = {reservation.room_id: reservation for reservation in reservations}
+        results = []
+        for room in data["rooms"]:
+            reservation = reserved.get(room.id)
+            if reservation is None:
+                results.append({"room": room.id, "status": "unavailable"})
+            else:
+                results.append(
+                    {
+                        "room": room.id,
+                        "status": "reserved",
+                        "reservation_id": reservation.id,
+                        "total_price": reservation.total_price,
+                    }
+                )
+
+        return Response(
+            {
+                "reserved": len(reservations),
+                "unavailable": len(unavailable_room_ids),
+                "results": results,
+            },
+            status=(
+                status.HTTP_201_CREATED if reservations else status.HTTP_409_CONFLICT
+            ),
+        )
 
 
 class UserReservationListView(generics.ListAPIView):
@@ -133,14 +157,12 @@ class UserReservationListView(generics.ListAPIView):
 
     serializer_class = ReservationListSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = BookingDateCursorPagination
+    ordering = ["-booking_date", "-id"]
 
     def get_queryset(self):
-        return (
-            Reservation.objects.select_related(
-                "room", "room__hotel"
-            )
-            .filter(user__user=self.request.user)
-            .order_by("-booking_date")
+        return Reservation.objects.select_related("room", "room__hotel").filter(
+            user__user=self.request.user
         )
 
 
@@ -184,15 +206,46 @@ class HotelOwnerReservationListView(generics.ListAPIView):
 
     permission_classes = [IsAuthenticated]
     serializer_class = OwnerReservationSerializer
+    pagination_class = BookingDateCursorPagination
+    ordering = ["-booking_date", "-id"]
 
     def get_queryset(self):
-        return (
-            Reservation.objects.select_related("room", "user", "user__user")
-            .filter(room__hotel__owner=self.request.user)
-            .order_by("-booking_date")
+        return Reservation.objects.select_related("room", "user", "user__user").filter(
+            room__hotel__owner=self.request.user
         )
 
 
+class HotelOwnerReservationExportView(APIView):
+    """
+    Endpoint: GET /api/v1/reservations/owner/export/?output=csv|ndjson
+
+    Streams every reservation of the owner's hotels for accounting, newest
+    first, without building the list in memory.
+    """
+
+    permission_classes = [IsAuthenticated]
+
+    fields = {
+        "id": "id",
+        "booking_date": "booking_date",
+        "hotel": "room__hotel__name",
+        "room_title": "room__title",
+        "customer_name": "user__full_name",
+        "customer_email": "user__user__email",
+        "customer_phone_number": "user__user__phone_number",
+        "checking_date": "checking_date",
+        "checkout_date": "checkout_date",
+        "booking_status": "booking_status",
+        "total_price": "total_price",
+    }
+
+    def get(self, request):
+        queryset = Reservation.objects.filter(
+            room__hotel__owner=request.user
+        ).order_by("-booking_date", "-id")
+        return stream_export(request, queryset, self.fields, "reservations")
+
+
 class ReservationInvoiceAPIView(generics.RetrieveAPIView):
     """
     Endpoint: GET /api/v1/reservations/<int:pk>/invoice/
@@ -224,6 +277,9 @@ class ReservationReportView(APIView):
     Endpoint: GET /api/v1/reservations/report/
     Provides daily booking count and revenue for hotel owners.
     Optional query params: ?start_date=YYYY-MM-DD&end_date=YYYY-MM-DD
+
+    Reads the pre-aggregated daily rollups (refreshed every few minutes by
+    refresh_reservation_rollups) instead of scanning reservations.
     """
 
     permission_classes = [IsAuthenticated]
@@ -233,19 +289,16 @@ class ReservationReportView(APIView):
         start_date = request.query_params.get("start_date")
         end_date = request.query_params.get("end_date")
 
-        qs = Reservation.objects.filter(
-            room__hotel__owner=user, booking_status=BookingStatus.CONFIRMED
-        )
+        qs = ReservationDailyRollup.objects.filter(hotel__owner=user)
 
         if start_date:
-            qs = qs.filter(booking_date__date__gte=start_date)
+            qs = qs.filter(day__gte=start_date)
         if end_date:
-            qs = qs.filter(booking_date__date__lte=end_date)
+            qs = qs.filter(day__lte=end_date)
 
         data = (
-            qs.annotate(booking_day=TruncDate("booking_date"))
-            .values("booking_day")
-            .annotate(total_bookings=Count("id"), total_revenue=Sum("total_price"))
+            qs.values(booking_day=F("day"))
+            .annotate(total_bookings=Sum("bookings"), total_revenue=Sum("revenue"))
             .order_by("-booking_day")
         )
 
@@ -256,7 +309,7 @@ class MonthlyReservationReportView(APIView):
     """
     GET /report/monthly/?range=month
     Returns booking count and revenue grouped by time periods (month, week, day, quarter, year).
-    Default is monthly.
+    Default is monthly. Periods are re-aggregated from the daily rollups.
     """
 
     permission_classes = [IsAuthenticated]
@@ -275,14 +328,12 @@ class MonthlyReservationReportView(APIView):
 
         truncate = trunc_map.get(period, TruncMonth)
 
-        qs = Reservation.objects.filter(
-            room__hotel__owner=user, booking_status=BookingStatus.CONFIRMED
-        )
+        qs = ReservationDailyRollup.objects.filter(hotel__owner=user)
 
         report = (
-            qs.annotate(period=truncate("booking_date"))
+            qs.annotate(period=truncate("day"))
             .values("period")
-            .annotate(total_bookings=Count("id"), total_revenue=Sum("total_price"))
+            .annotate(total_bookings=Sum("bookings"), total_revenue=Sum("revenue"))
             .order_by("-period")
         )
 
@@ -292,7 +343,8 @@ class MonthlyReservationReportView(APIView):
 class RoomWiseReservationReportView(APIView):
     """
     GET /report/by-room/
-    Returns popularity of rooms (booking count and revenue per room)
+    Returns popularity of rooms (booking count and revenue per room),
+    summed from the daily rollups.
     """
 
     permission_classes = [IsAuthenticated]
@@ -300,14 +352,36 @@ class RoomWiseReservationReportView(APIView):
     def get(self, request):
         user = request.user
 
-        qs = Reservation.objects.filter(
-            room__hotel__owner=user, booking_status=BookingStatus.CONFIRMED
-        )
+        qs = ReservationDailyRollup.objects.filter(hotel__owner=user)
 
         data = (
             qs.values("room__id", "room__title")
-            .annotate(total_bookings=Count("id"), total_revenue=Sum("total_price"))
+            .annotate(total_bookings=Sum("bookings"), total_revenue=Sum("revenue"))
             .order_by("-total_bookings")
         )
 
         return Response(data)
+
+
+class ReservationReportExportView(APIView):
+    """
+    GET /report/export/?output=csv|ndjson
+    Streams the owner's daily rollup buckets (one row per room and day).
+    """
+
+    permission_classes = [IsAuthenticated]
+
+    fields = {
+        "day": "day",
+        "hotel": "hotel__name",
+        "room_id": "room_id",
+        "room_title": "room__title",
+        "bookings": "bookings",
+        "revenue": "revenue",
+    }
+
+    def get(self, request):
+        queryset = ReservationDailyRollup.objects.filter(
+            hotel__owner=request.user
+        ).order_by("-day", "room_id")
+        return stream_export(request, queryset, self.fields, "reservation-report")
@@ -0,0 +1,10 @@
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+
+class ReservationConflict(APIException):
+    """Raised when another booking already holds one of the requested room nights."""
+
+    status_code = status.HTTP_409_CONFLICT
+    default_detail = "Sorry, this room has just been booked for the selected dates."
+    default_code = "conflict"
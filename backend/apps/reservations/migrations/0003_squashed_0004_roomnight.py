@@ -0,0 +1,125 @@
+# Generated by Django 4.2.5 on 2026-10-18 08:17
+
+from datetime import timedelta
+
+from django.db import migrations, models
+from django.db.models import Count
+from django.utils import timezone
+import django.db.models.deletion
+
+
+def backfill_room_nights(apps, schema_editor):
+    """
+    Claims inventory rows for every reservation that still holds its room.
+    Fails if existing bookings overlap, since only one of them can hold a
+    night; those have to be resolved by hand before migrating.
+    """
+    Reservation = apps.get_model("reservations", "Reservation")
+    RoomNight = apps.get_model("reservations", "RoomNight")
+
+    reservations = (
+        Reservation.objects.exclude(booking_status="cancelled")
+        .exclude(checking_date__isnull=True)
+        .exclude(checkout_date__isnull=True)
+        .only("id", "room_id", "checking_date", "checkout_date")
+    )
+
+    expected = {}
+    batch = []
+    for reservation in reservations.iterator(chunk_size=2000):
+        first = timezone.localtime(reservation.checking_date).date()
+        last = timezone.localtime(reservation.checkout_date).date()
+        expected[reservation.id] = max((last - first).days, 0)
+        batch.extend(
+            RoomNight(
+                room_id=reservation.room_id,
+                reservation_id=reservation.id,
+                night=first + timedelta(days=i),
+            )
+            for i in range((last - first).days)
+        )
+        if len(batch) >= 5000:
+            RoomNight.objects.bulk_create(batch, ignore_conflicts=True)
+            batch = []
+
+    RoomNight.objects.bulk_create(batch, ignore_conflicts=True)
+
+    # A night skipped as a conflict belongs to an overlapping booking.
+    claimed = dict(
+        RoomNight.objects.values("reservation_id")
+        .annotate(nights=Count("id"))
+        .values_list("reservation_id", "nights")
+    )
+    overlapping = sorted(
+        reservation_id
+        for reservation_id, nights in expected.items()
+        if claimed.get(reservation_id, 0) < nights
+    )
+    if overlapping:
+        raise RuntimeError(
+            f"{len(overlapping)} reservations overlap another booking of the "
+            f"same room and could not claim all their nights (ids: "
+            f"{', '.join(map(str, overlapping[:50]))}"
+            f"{', ...' if len(overlapping) > 50 else ''}). Cancel or move the "
+            "double bookings, then run the migration again."
+        )
+
+
+class Migration(migrations.Migration):
+
+    replaces = [
+        ("reservations", "0003_reservation_room_dates_index"),
+        ("reservations", "0004_roomnight"),
+    ]
+
+    dependencies = [
+        ("hotel", "0005_alter_hotel_amenities"),
+        ("reservations", "0002_remove_reservation_room_number_and_more"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="RoomNight",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("night", models.DateField()),
+            ],
+            options={
+                "verbose_name": "Room Night",
+                "verbose_name_plural": "Room Nights",
+            },
+        ),
+        migrations.AddField(
+            model_name="roomnight",
+            name="reservation",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="room_nights",
+                to="reservations.reservation",
+            ),
+        ),
+        migrations.AddField(
+            model_name="roomnight",
+            name="room",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="booked_nights",
+                to="hotel.room",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="roomnight",
+            constraint=models.UniqueConstraint(
+                fields=("room", "night"), name="unique_booked_room_night"
+            ),
+        ),
+        migrations.RunPython(backfill_room_nights, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 4.2.5 on 2026-10-18 08:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("reservations", "0003_squashed_0004_roomnight"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="reservation",
+            index=models.Index(
+                fields=["user", "-booking_date", "-id"],
+                name="reservation_user_id_d85e3c_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="reservation",
+            index=models.Index(
+                fields=["-booking_date", "-id"], name="reservation_booking_a8126f_idx"
+            ),
+        ),
+    ]
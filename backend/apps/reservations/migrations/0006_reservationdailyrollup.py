@@ -0,0 +1,76 @@
+# Generated by Django 4.2.5 on 2026-10-18 08:39
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("hotel", "0007_hotelstats"),
+        ("reservations", "0005_reservation_booking_date_indexes"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ReservationDailyRollup",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("day", models.DateField()),
+                ("bookings", models.PositiveIntegerField(default=0)),
+                (
+                    "revenue",
+                    models.DecimalField(decimal_places=2, default=0, max_digits=14),
+                ),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "verbose_name": "Reservation Daily Rollup",
+                "verbose_name_plural": "Reservation Daily Rollups",
+            },
+        ),
+        migrations.AddIndex(
+            model_name="reservation",
+            index=models.Index(
+                fields=["updated_at"], name="reservation_updated_9516d2_idx"
+            ),
+        ),
+        migrations.AddField(
+            model_name="reservationdailyrollup",
+            name="hotel",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="daily_rollups",
+                to="hotel.hotel",
+            ),
+        ),
+        migrations.AddField(
+            model_name="reservationdailyrollup",
+            name="room",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="daily_rollups",
+                to="hotel.room",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="reservationdailyrollup",
+            index=models.Index(
+                fields=["hotel", "day"], name="reservation_hotel_i_56dd60_idx"
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="reservationdailyrollup",
+            constraint=models.UniqueConstraint(
+                fields=("room", "day"), name="unique_room_day_rollup"
+            ),
+        ),
+    ]
@@ -1,5 +1,8 @@
-from django.db import models
+from datetime import datetime, timedelta
+
+from django.db import models, transaction
 from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
 from django.core.exceptions import ValidationError 
 
 from apps.hotel.models import Room
@@ -14,6 +17,14 @@ class BookingStatus(models.TextChoices):
     CHECKED_OUT = "checked_out", "Checked Out"
 
 
+# Bookings in these states count as confirmed business (hotel stats, revenue).
+COUNTED_BOOKING_STATUSES = {
+    BookingStatus.CONFIRMED,
+    BookingStatus.CHECKED_IN,
+    BookingStatus.CHECKED_OUT,
+}
+
+
 class PreferredPaymentStatus(models.TextChoices):
     """User preference for when to pay."""
 
@@ -21,25 +32,44 @@ class PreferredPaymentStatus(models.TextChoices):
     POSTPAID = "Postpaid", "Postpaid"
 
 
+# Unique (room, night) constraint on RoomNight; violating it means another
+# booking holds the night (see services.create_reservation).
+ROOM_NIGHT_CONSTRAINT = "unique_booked_room_night"
+
+
+def to_night(value):
+    """
+    Normalizes a check-in/check-out value (date, datetime or ISO string)
+    to the calendar date it falls on in the project's timezone.
+    """
+    if isinstance(value, str):
+        value = parse_datetime(value) or parse_date(value)
+    if isinstance(value, datetime):
+        if timezone.is_aware(value):
+            value = timezone.localtime(value)
+        return value.date()
+    return value
+
+
+def stay_nights(checkin_date, checkout_date):
+    """Returns the list of nights covered by a stay (check-out day excluded)."""
+    first, last = to_night(checkin_date), to_night(checkout_date)
+    return [first + timedelta(days=i) for i in range((last - first).days)]
+
+
 class ReservationManager(models.Manager):
     def is_room_available(self, room_id, checkin_date, checkout_date):
         """
-        Checks if a room is available for a given date range by looking for conflicting bookings.
-        A conflict exists if the requested date range overlaps with any existing, non-cancelled booking.
+        Checks if a room is available for a given date range.
+        Uses the per-night inventory, so this is an indexed lookup on
+        (room, night) rather than an overlap scan over the reservation history.
         """
-        conflicting_bookings = (
-            self.filter(room_id=room_id)
-            .exclude(booking_status=BookingStatus.CANCELLED)
-            .filter(
-                # An existing booking starts before the new one would end
-                checking_date__lt=checkout_date,
-                # AND the existing booking ends after the new one would start
-                checkout_date__gt=checkin_date,
-            )
-        )
+        booked_nights = RoomNight.objects.booked_between(
+            checkin_date, checkout_date
+        ).filter(room_id=room_id)
 
-        # If the queryset is empty (no conflicts found), the room is available.
-        return not conflicting_bookings.exists()
+        # If no night of the stay is booked, the room is available.
+        return not booked_nights.exists()
 
 
 class Reservation(models.Model):
@@ -98,6 +128,9 @@ class Reservation(models.Model):
             models.Index(fields=["room"]),
             models.Index(fields=["booking_status"]),
             models.Index(fields=["checking_date", "checkout_date"]),
+            models.Index(fields=["user", "-booking_date", "-id"]),
+            models.Index(fields=["-booking_date", "-id"]),
+            models.Index(fields=["updated_at"]),
         ]
 
     def clean(self):
@@ -114,9 +147,46 @@ class Reservation(models.Model):
 
     def save(self, *args, **kwargs):
         self.clean()
+        update_fields = kwargs.get("update_fields")
         if self.booking_status == BookingStatus.CANCELLED and not self.cancelled_at:
             self.cancelled_at = timezone.now()
-        super().save(*args, **kwargs)
+            if update_fields is not None:
+                update_fields = {*update_fields, "cancelled_at"}
+        if update_fields is not None:
+            # auto_now only fires for listed fields, and the report rollups
+            # pick up changes by updated_at (refresh_daily_rollups).
+            kwargs["update_fields"] = {*update_fields, "updated_at"}
+
+        creating = self._state.adding
+        # The reservation and its room-night inventory must change together.
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            self._sync_room_nights(creating, kwargs.get("update_fields"))
+
+    def _sync_room_nights(self, creating, update_fields=None):
+        """
+        Keeps the RoomNight inventory in step with this reservation:
+        - cancelled bookings release every night,
+        - checked-out bookings release the nights from the check-out day on,
+        - new bookings, changed dates/room and status changes (e.g. a
+          cancelled booking reactivated) claim their nights again.
+        """
+        nights = RoomNight.objects.filter(reservation=self)
+
+        if self.booking_status == BookingStatus.CANCELLED:
+            nights.delete()
+        elif self.booking_status == BookingStatus.CHECKED_OUT:
+            nights.filter(night__gte=to_night(self.checkout_date)).delete()
+        elif creating:
+            RoomNight.objects.book(self)
+        elif update_fields is None or {
+            "room",
+            "checking_date",
+            "checkout_date",
+            "booking_status",
+        } & set(update_fields):
+            nights.delete()
+            RoomNight.objects.book(self)
 
     @property
     def calculated_nights(self):
@@ -130,6 +200,97 @@ class Reservation(models.Model):
 
 
 
+class RoomNightManager(models.Manager):
+    def booked_between(self, checkin_date, checkout_date):
+        """Returns the booked nights that fall inside the given stay."""
+        return self.filter(
+            night__gte=to_night(checkin_date), night__lt=to_night(checkout_date)
+        )
+
+    def book(self, reservation):
+        """Claims one inventory row per night of the reservation's stay."""
+        return self.book_many([reservation])
+
+    def book_many(self, reservations):
+        """Claims the nights of several reservations with a single insert."""
+        return self.bulk_create(
+            [
+                self.model(
+                    room_id=reservation.room_id, reservation=reservation, night=night
+                )
+                for reservation in reservations
+                if reservation.checking_date and reservation.checkout_date
+                for night in stay_nights(
+                    reservation.checking_date, reservation.checkout_date
+                )
+            ]
+        )
+
+
+class RoomNight(models.Model):
+    """
+    Precomputed room inventory: one row per room per booked night.
+    Maintained by Reservation.save(), so availability checks are indexed
+    (room, night) lookups instead of overlap scans over all reservations.
+    """
+
+    room = models.ForeignKey(
+        Room, related_name="booked_nights", on_delete=models.CASCADE
+    )
+    reservation = models.ForeignKey(
+        Reservation, related_name="room_nights", on_delete=models.CASCADE
+    )
+    night = models.DateField()
+
+    objects = RoomNightManager()
+
+    class Meta:
+        verbose_name = "Room Night"
+        verbose_name_plural = "Room Nights"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["room", "night"], name=ROOM_NIGHT_CONSTRAINT
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.room_id} booked on {self.night}"
+
+
+class ReservationDailyRollup(models.Model):
+    """
+    Pre-aggregated confirmed bookings and revenue per room and booking day.
+    Filled incrementally by the refresh_reservation_rollups task; owner
+    reports read these buckets instead of scanning reservations.
+    """
+
+    hotel = models.ForeignKey(
+        "hotel.Hotel", related_name="daily_rollups", on_delete=models.CASCADE
+    )
+    room = models.ForeignKey(
+        Room, related_name="daily_rollups", on_delete=models.CASCADE
+    )
+    day = models.DateField()
+    bookings = models.PositiveIntegerField(default=0)
+    revenue = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "Reservation Daily Rollup"
+        verbose_name_plural = "Reservation Daily Rollups"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["room", "day"], name="unique_room_day_rollup"
+            ),
+        ]
+        indexes = [
+            models.Index(fields=["hotel", "day"]),
+        ]
+
+    def __str__(self):
+        return f"{self.room_id} on {self.day}: {self.bookings} bookings"
+
+
 class CheckIn(models.Model):
     """
     Represents the check-in event for a reservation.
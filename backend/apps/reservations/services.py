@@ -1,13 +1,47 @@
 from decimal import Decimal
-from django.db import transaction
+from django.db import IntegrityError, transaction
+from django.db.models import Count, Q, Sum
+from django.db.models.functions import TruncDate
 from rest_framework.exceptions import ValidationError
 
-from apps.reservations.models import Reservation, BookingStatus
+from apps.reservations.exceptions import ReservationConflict
+from apps.reservations.models import (
+    ROOM_NIGHT_CONSTRAINT,
+    Reservation,
+    ReservationDailyRollup,
+    RoomNight,
+    BookingStatus,
+)
+from apps.notifications.tasks import enqueue_notifications
 from apps.hotel.models import Room
 from apps.discount.models import Coupon
 from apps.accounts.models import CustomerProfile
 
 
+def _resolve_coupon(coupon_code):
+    """Returns the (coupon, discount percent) pair for an optional coupon code."""
+    if not coupon_code:
+        return None, Decimal("0")
+    try:
+        coupon = Coupon.objects.get(code=coupon_code)
+    except Coupon.DoesNotExist:
+        raise ValidationError("Coupon not found.")
+    if not coupon.is_valid():
+        raise ValidationError("Invalid or expired coupon.")
+    return coupon, Decimal(coupon.discount_percent)
+
+
+def _is_room_night_conflict(error):
+    """Whether an IntegrityError comes from the RoomNight (room, night) constraint."""
+    diag = getattr(error.__cause__, "diag", None)
+    return getattr(diag, "constraint_name", None) == ROOM_NIGHT_CONSTRAINT
+
+
+def _calculate_total_price(room, nights, discount):
+    base_price = room.price_per_night
+    return base_price * nights * (Decimal("1") - discount / Decimal("100"))
+
+
 @transaction.atomic
 def create_reservation(
     user_profile: CustomerProfile,
@@ -27,7 +61,10 @@ def create_reservation(
     4. Creating the Reservation object.
 
     All operations are wrapped in an atomic transaction to ensure
-    data integrity.
+    data integrity. Double bookings are prevented by the unique
+    (room, night) constraint on the RoomNight inventory: if a concurrent
+    request claimed one of the nights first, ReservationConflict (409)
+    is raised immediately instead of waiting on an application lock.
     """
 
     # 1. Calculate nights
@@ -38,34 +75,174 @@ def create_reservation(
         raise ValidationError("Check-out date must be after check-in date.")
 
     # 2. Validate coupon and calculate discount
-    coupon = None
-    discount = Decimal("0")
-    if coupon_code:
-        try:
-            coupon = Coupon.objects.get(code=coupon_code)
-            if not coupon.is_valid():
-                raise ValidationError("Invalid or expired coupon.")
-            discount = Decimal(coupon.discount_percent)
-        except Coupon.DoesNotExist:
-            raise ValidationError("Coupon not found.")
+    coupon, discount = _resolve_coupon(coupon_code)
 
     # 3. Calculate final price
-    base_price = room.price_per_night
-    total_price = base_price * nights * (Decimal("1") - discount / Decimal("100"))
+    total_price = _calculate_total_price(room, nights, discount)
 
     # 4. Create the Reservation
     # (Note: The incorrect creation of 'CheckIn' has been removed,
     # as Check-In is a separate business process from 'Booking'.)
-    reservation = Reservation.objects.create(
-        user=user_profile,
-        room=room,
-        checking_date=check_in_date,
-        checkout_date=check_out_date,
-        nights=nights,
-        coupon=coupon,
-        prefered_payment_method=prefered_payment_method,
-        total_price=total_price,
-        booking_status=BookingStatus.PENDING,
+    try:
+        # Savepoint, so a lost race only rolls back this insert.
+        with transaction.atomic():
+            reservation = Reservation.objects.create(
+                user=user_profile,
+                room=room,
+                checking_date=check_in_date,
+                checkout_date=check_out_date,
+                nights=nights,
+                coupon=coupon,
+                prefered_payment_method=prefered_payment_method,
+                total_price=total_price,
+                booking_status=BookingStatus.PENDING,
+            )
+    except IntegrityError as error:
+        if not _is_room_night_conflict(error):
+            raise
+        raise ReservationConflict()
+
+    return reservation
+
+
+@transaction.atomic
+def create_bulk_reservations(
+    user_profile: CustomerProfile,
+    rooms,
+    check_in_date,
+    check_out_date,
+    prefered_payment_method: str,
+    coupon_code: str = None,
+):
+    """
+    Books several rooms for the same stay in a single transaction.
+
+    Availability of every requested room is checked with one inventory query,
+    then the reservations and their room nights are inserted with bulk_create.
+    Rooms that are already booked or not available are skipped and
+    reported back.
+
+    Returns a tuple of (created reservations, ids of unavailable rooms).
+    Raises ReservationConflict if a concurrent booking takes one of the
+    free rooms before the batch commits; the whole batch is rolled back.
+    """
+    nights = (check_out_date - check_in_date).days
+    if nights <= 0:
+        raise ValidationError("Check-out date must be after check-in date.")
+
+    coupon, discount = _resolve_coupon(coupon_code)
+
+    unavailable_room_ids = set(
+        RoomNight.objects.booked_between(check_in_date, check_out_date)
+        .filter(room__in=rooms)
+        .values_list("room_id", flat=True)
     )
+    # Rooms the owner took off the market can't be booked either.
+    unavailable_room_ids.update(room.id for room in rooms if not room.is_available)
+    free_rooms = [room for room in rooms if room.id not in unavailable_room_ids]
+
+    reservations = Reservation.objects.bulk_create(
+        [
+            Reservation(
+                user=user_profile,
+                room=room,
+                checking_date=check_in_date,
+                checkout_date=check_out_date,
+                nights=nights,
+                coupon=coupon,
+                prefered_payment_method=prefered_payment_method,
+                total_price=_calculate_total_price(room, nights, discount),
+                booking_status=BookingStatus.PENDING,
+            )
+            for room in free_rooms
+        ]
+    )
+
+    try:
+        with transaction.atomic():
+            RoomNight.objects.book_many(reservations)
+    except IntegrityError as error:
+        if not _is_room_night_conflict(error):
+            raise
+        raise ReservationConflict()
+
+    # bulk_create skips post_save, so notify the owners explicitly.
+    items = [
+        {"event": "new_booking", "reservation_id": reservation.id}
+        for reservation in reservations
+    ]
+    transaction.on_commit(lambda: enqueue_notifications(*items))
+
+    return reservations, sorted(unavailable_room_ids)
+
 
-    return reservation
\ No newline at end of file
+@transaction.atomic
+def refresh_daily_rollups(since=None):
+    """
+    Recomputes ReservationDailyRollup buckets from confirmed reservations.
+
+    With `since`, only the booking days touched by reservations updated at or
+    after it are recomputed; without it everything is rebuilt.
+    Buckets are recomputed from scratch, so running it twice is harmless.
+    Returns the number of buckets written.
+    """
+    rollups = ReservationDailyRollup.objects.all()
+    reservations = Reservation.objects.annotate(day=TruncDate("booking_date"))
+
+    if since is not None:
+        touched = {}
+        for room_id, day in (
+            reservations.filter(updated_at__gte=since)
+            .values_list("room_id", "day")
+            .distinct()
+        ):
+            touched.setdefault(day, set()).add(room_id)
+        if not touched:
+            return 0
+        # A reservation moved to another room leaves its old (room, day)
+        # bucket behind, and nothing records the old room: recompute every
+        # existing bucket of the touched days as well.
+        for room_id, day in rollups.filter(day__in=list(touched)).values_list(
+            "room_id", "day"
+        ):
+            touched[day].add(room_id)
+        buckets = Q()
+        for day, room_ids in touched.items():
+            buckets |= Q(day=day, room_id__in=room_ids)
+        rollups = rollups.filter(buckets)
+        reservations = reservations.filter(buckets)
+
+    rows = list(
+        reservations.filter(booking_status=BookingStatus.CONFIRMED)
+        .order_by()
+        .values("room_id", "room__hotel_id", "day")
+        .annotate(bookings=Count("id"), revenue=Sum("total_price"))
+    )
+
+    # Buckets whose reservations were all cancelled must disappear too.
+    present = {(row["room_id"], row["day"]) for row in rows}
+    stale = [
+        pk
+        for pk, room_id, day in rollups.values_list("pk", "room_id", "day")
+        if (room_id, day) not in present
+    ]
+    ReservationDailyRollup.objects.filter(pk__in=stale).delete()
+
+    written = ReservationDailyRollup.objects.bulk_create(
+        [
+            ReservationDailyRollup(
+                hotel_id=row["room__hotel_id"],
+                room_id=row["room_id"],
+                day=row["day"],
+                bookings=row["bookings"],
+                revenue=row["revenue"],
+            )
+            for row in rows
+        ],
+        batch_size=1000,
+        update_conflicts=True,
+        unique_fields=["room", "day"],
+        # hotel too: a room moved to another hotel takes its buckets along.
+        update_fields=["hotel", "bookings", "revenue", "updated_at"],
+    )
+    return len(written)
@@ -1,7 +1,17 @@
+from datetime import timedelta
+
 from celery import shared_task
+from django.core.cache import cache
 from django.core.mail import send_mail
+from django.utils import timezone
 from apps.reservations.models import Reservation
 from apps.reservations.models import BookingStatus
+from apps.reservations.services import refresh_daily_rollups
+
+# Reservations updated since this moment are not yet in the daily rollups.
+ROLLUP_WATERMARK_KEY = "reservations:daily_rollup:watermark"
+# Re-scan a little before the watermark so rows committed late aren't missed.
+ROLLUP_OVERLAP = timedelta(minutes=5)
 
 
 @shared_task(bind=True, max_retries=5)
@@ -58,3 +68,22 @@ def cancel_unpaid_reservation(reservation_id):
             print(f"Reservation {reservation_id} cancelled due to non-payment.")
     except Reservation.DoesNotExist:
         pass
+
+
+@shared_task
+def refresh_reservation_rollups(full=False):
+    """
+    Brings ReservationDailyRollup up to date for the owner reports.
+
+    Runs incrementally from the watermark kept in the cache (only buckets of
+    reservations updated since then are recomputed). A full rebuild happens
+    when `full` is set or when there is no watermark yet.
+    """
+    started_at = timezone.now()
+    watermark = None if full else cache.get(ROLLUP_WATERMARK_KEY)
+    since = watermark - ROLLUP_OVERLAP if watermark else None
+
+    written = refresh_daily_rollups(since=since)
+
+    cache.set(ROLLUP_WATERMARK_KEY, started_at, timeout=None)
+    return written
@@ -0,0 +1,204 @@
+import asyncio
+import csv
+import io
+import json
+import pytest
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.core.cache import cache
+from django.test import AsyncClient
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from apps.accounts.tests.factories import UserFactory
+from apps.hotel.tests.factories import HotelFactory, RoomFactory
+from apps.reservations.models import (
+    BookingStatus,
+    Reservation,
+    ReservationDailyRollup,
+)
+from apps.reservations.api.v1 import exports
+from apps.reservations.tasks import refresh_reservation_rollups
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture(autouse=True)
+def clear_watermark():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+def _book(room, day, status=BookingStatus.CONFIRMED):
+    guest = UserFactory(role="customer")
+    return Reservation.objects.create(
+        user=guest.customer_profile,
+        room=room,
+        checking_date=date(2030, 1, day),
+        checkout_date=date(2030, 1, day + 1),
+        nights=1,
+        total_price=Decimal("150.00"),
+        booking_status=status,
+    )
+
+
+def test_refresh_rolls_up_confirmed_bookings_incrementally():
+    room = RoomFactory(price_per_night=Decimal("150.00"))
+    _book(room, 1)
+    pending = _book(room, 3, status=BookingStatus.PENDING)
+
+    refresh_reservation_rollups()
+    (bucket,) = ReservationDailyRollup.objects.all()
+    assert (bucket.bookings, bucket.revenue) == (1, Decimal("150.00"))
+
+    pending.booking_status = BookingStatus.CONFIRMED
+    pending.save(update_fields=["booking_status"])
+    refresh_reservation_rollups()
+
+    bucket.refresh_from_db()
+    assert (bucket.bookings, bucket.revenue) == (2, Decimal("300.00"))
+    assert bucket.hotel_id == room.hotel_id
+
+
+def test_cancelled_bookings_leave_the_rollup():
+    room = RoomFactory(price_per_night=Decimal("150.00"))
+    reservation = _book(room, 1)
+    refresh_reservation_rollups()
+
+    reservation.booking_status = BookingStatus.CANCELLED
+    reservation.save(update_fields=["booking_status"])
+    refresh_reservation_rollups()
+
+    assert not ReservationDailyRollup.objects.exists()
+
+
+def test_status_change_long_after_booking_reaches_the_rollup():
+    room = RoomFactory(price_per_night=Decimal("150.00"))
+    pending = _book(room, 1, status=BookingStatus.PENDING)
+    # Booked well before the refresh's overlap window.
+    Reservation.objects.filter(pk=pending.pk).update(
+        updated_at=timezone.now() - timedelta(hours=1)
+    )
+    refresh_reservation_rollups()
+
+    pending.booking_status = BookingStatus.CONFIRMED
+    pending.save(update_fields=["booking_status"])
+    refresh_reservation_rollups()
+
+    (bucket,) = ReservationDailyRollup.objects.all()
+    assert (bucket.bookings, bucket.revenue) == (1, Decimal("150.00"))
+
+
+def test_moving_a_room_moves_its_buckets_to_the_new_hotel():
+    room = RoomFactory(price_per_night=Decimal("150.00"))
+    _book(room, 1)
+    refresh_reservation_rollups()
+    new_hotel = HotelFactory()
+
+    room.hotel = new_hotel
+    room.save(update_fields=["hotel"])
+    refresh_reservation_rollups()
+
+    (bucket,) = ReservationDailyRollup.objects.all()
+    assert bucket.hotel_id == new_hotel.id
+    assert bucket.bookings == 1
+
+
+def test_moving_a_reservation_refreshes_the_old_room_bucket():
+    room = RoomFactory(price_per_night=Decimal("150.00"))
+    other_room = RoomFactory(hotel=room.hotel, price_per_night=Decimal("150.00"))
+    reservation = _book(room, 1)
+    refresh_reservation_rollups()
+
+    reservation.room = other_room
+    reservation.save(update_fields=["room"])
+    refresh_reservation_rollups()
+
+    (bucket,) = ReservationDailyRollup.objects.all()
+    assert bucket.room_id == other_room.id
+    assert (bucket.bookings, bucket.revenue) == (1, Decimal("150.00"))
+
+
+def test_reports_read_rollups():
+    owner = UserFactory(role="hotel_owner")
+    room = RoomFactory(hotel=HotelFactory(owner=owner))
+    _book(room, 1)
+    _book(room, 5)
+    refresh_reservation_rollups()
+    client = APIClient()
+    client.force_authenticate(user=owner)
+
+    daily = client.get(reverse("reservations:v1:reservation-report"))
+    monthly = client.get(reverse("reservations:v1:monthly-reservation-report"))
+    by_room = client.get(reverse("reservations:v1:room-wise-report"))
+
+    assert sum(row["total_bookings"] for row in daily.data) == 2
+    assert [row["total_bookings"] for row in monthly.data] == [2]
+    assert by_room.data[0]["room__id"] == room.id
+    assert by_room.data[0]["total_revenue"] == Decimal("300.00")
+
+
+def _read(response):
+    return b"".join(response.streaming_content).decode()
+
+
+def test_owner_reservations_export_streams_csv_and_ndjson():
+    owner = UserFactory(role="hotel_owner")
+    room = RoomFactory(hotel=HotelFactory(owner=owner))
+    first = _book(room, 1)
+    second = _book(room, 5, status=BookingStatus.PENDING)
+    RoomFactory()  # another owner's room stays out of the export
+    client = APIClient()
+    client.force_authenticate(user=owner)
+    url = reverse("reservations:v1:owner-reservations-export")
+
+    as_csv = client.get(url)
+    as_ndjson = client.get(url, {"output": "ndjson"})
+
+    assert as_csv.streaming and as_csv["Content-Type"] == "text/csv"
+    rows = list(csv.DictReader(io.StringIO(_read(as_csv))))
+    assert [int(row["id"]) for row in rows] == [second.id, first.id]
+    assert rows[0]["room_title"] == room.title
+    lines = [json.loads(line) for line in _read(as_ndjson).splitlines()]
+    assert [line["booking_status"] for line in lines] == ["pending", "confirmed"]
+    assert lines[1]["total_price"] == "150.00"
+
+
+@pytest.mark.django_db(transaction=True)
+def test_export_is_streamed_in_chunks_under_asgi(monkeypatch):
+    monkeypatch.setattr(exports, "EXPORT_CHUNK_SIZE", 2)
+    owner = UserFactory(role="hotel_owner")
+    room = RoomFactory(hotel=HotelFactory(owner=owner))
+    booked = [_book(room, day) for day in (1, 3, 5)]
+    token = AccessToken.for_user(owner)
+
+    async def export():
+        response = await AsyncClient().get(
+            reverse("reservations:v1:owner-reservations-export"),
+            {"output": "ndjson"},
+            headers={"Authorization": f"Bearer {token}"},
+        )
+        return response, [chunk async for chunk in response.streaming_content]
+
+    response, chunks = asyncio.run(export())
+
+    assert response.is_async
+    # Two rows per chunk rather than the whole export in one read.
+    assert [len(chunk.splitlines()) for chunk in chunks] == [2, 1]
+    lines = [json.loads(line) for line in b"".join(chunks).splitlines()]
+    assert [line["id"] for line in lines] == [r.id for r in reversed(booked)]
+
+
+def test_export_rejects_unknown_output():
+    client = APIClient()
+    client.force_authenticate(user=UserFactory(role="hotel_owner"))
+
+    response = client.get(
+        reverse("reservations:v1:owner-reservations-export"), {"output": "xml"}
+    )
+
+    assert response.status_code == 400
@@ -1,6 +1,7 @@
 import pytest
-from unittest.mock import patch, MagicMock
+from unittest.mock import patch
 from datetime import datetime, timedelta
+from django.db import IntegrityError
 from django.utils import timezone
 from django.urls import reverse
 from rest_framework.test import APIClient
@@ -9,6 +10,7 @@ from apps.reservations.models import Reservation, Room, BookingStatus
 from apps.accounts.models import CustomerProfile, HotelOwnerProfile
 from apps.hotel.tests.factories import HotelFactory, RoomFactory
 from apps.accounts.tests.factories import UserFactory
+from apps.reservations.services import create_reservation
 from apps.reservations.tasks import cancel_unpaid_reservation
 
 
@@ -87,62 +89,32 @@ def test_create_reservation_fails_with_date_conflict():
 
 
 @pytest.mark.django_db
-@patch("core.redis_client.redis_client.lock")
-def test_create_reservation_fails_if_lock_cannot_be_acquired(mock_redis_lock):
-    client = APIClient()
-
-    owner_user = UserFactory(role="hotel_owner")
-    customer_user = UserFactory(role="customer")
-
-    HotelOwnerProfile.objects.create(user=owner_user)
-    CustomerProfile.objects.get_or_create(user=customer_user)
-
-    hotel = HotelFactory(owner=owner_user)
-    room = RoomFactory(hotel=hotel)
-
-    mock_lock_instance = MagicMock()
-    mock_lock_instance.acquire.return_value = False
-    mock_redis_lock.return_value = mock_lock_instance
-
-    client.force_authenticate(user=customer_user)
-
-    url = reverse("reservations:v1:room-reserve", kwargs={"room_id": room.id})
-    data = {
-        "checking_date": "2025-12-10",
-        "checkout_date": "2025-12-12",
-        "room": room.id,
-        "prefered_payment_method": "Postpaid",
-        "coupon_code": "",
-    }
-
-    response = client.post(url, data, format="json")
-
-    assert response.status_code == status.HTTP_400_BAD_REQUEST
-    assert "currently being booked" in str(response.data)
-
-
-@pytest.mark.django_db
-@patch("core.redis_client.redis_client.lock")
 @patch("apps.reservations.models.ReservationManager.is_room_available")
-def test_create_reservation_fails_if_room_booked_during_lock(
-    mock_is_available, mock_redis_lock
+def test_create_reservation_returns_conflict_if_room_booked_concurrently(
+    mock_is_available,
 ):
     client = APIClient()
 
     owner_user = UserFactory(role="hotel_owner")
     customer_user = UserFactory(role="customer")
     HotelOwnerProfile.objects.create(user=owner_user)
-    CustomerProfile.objects.get_or_create(user=customer_user)
+    customer_profile, _ = CustomerProfile.objects.get_or_create(user=customer_user)
 
     hotel = HotelFactory(owner=owner_user)
     room = RoomFactory(hotel=hotel)
 
-    mock_lock_instance = MagicMock()
-    mock_lock_instance.acquire.return_value = True
-    mock_lock_instance.release.return_value = None
-    mock_redis_lock.return_value = mock_lock_instance
-
-    mock_is_available.side_effect = [True, False]
+    # Another request already holds the nights, but our availability
+    # pre-check ran before it committed.
+    Reservation.objects.create(
+        user=customer_profile,
+        room=room,
+        checking_date=timezone.make_aware(datetime(2025, 12, 21)),
+        checkout_date=timezone.make_aware(datetime(2025, 12, 23)),
+        total_price=300,
+        prefered_payment_method="Prepaid",
+        nights=2,
+    )
+    mock_is_available.return_value = True
 
     client.force_authenticate(user=customer_user)
 
@@ -156,9 +128,33 @@ def test_create_reservation_fails_if_room_booked_during_lock(
 
     response = client.post(url, data, format="json")
 
-    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert response.status_code == status.HTTP_409_CONFLICT
     assert "has just been booked" in str(response.data)
-    assert mock_is_available.call_count == 2
+    assert Reservation.objects.filter(room=room).count() == 1
+
+
+@pytest.mark.django_db
+def test_create_reservation_reraises_other_integrity_errors():
+    customer_profile, _ = CustomerProfile.objects.get_or_create(
+        user=UserFactory(role="customer")
+    )
+    room = RoomFactory()
+    # The factory leaves a float price on the instance; load the Decimal.
+    room.refresh_from_db()
+
+    with patch.object(
+        Reservation.objects, "create", side_effect=IntegrityError("not null")
+    ) as mock_create:
+        with pytest.raises(IntegrityError, match="not null"):
+            create_reservation(
+                user_profile=customer_profile,
+                room=room,
+                check_in_date=datetime(2030, 1, 1).date(),
+                check_out_date=datetime(2030, 1, 3).date(),
+                prefered_payment_method="Prepaid",
+            )
+
+    mock_create.assert_called_once()
 
 
 @pytest.mark.django_db
@@ -201,3 +197,114 @@ def test_cancel_unpaid_reservation_task_does_not_cancel_confirmed():
     cancel_unpaid_reservation(reservation.id)
     reservation.refresh_from_db()
     assert reservation.booking_status == BookingStatus.CONFIRMED
+
+
+@pytest.mark.django_db
+@patch("apps.notifications.tasks.notify_new_booking.delay")
+def test_bulk_reservation_books_free_rooms_and_reports_taken_ones(mock_notify):
+    client = APIClient()
+
+    customer_user = UserFactory(role="customer")
+    customer_profile, _ = CustomerProfile.objects.get_or_create(user=customer_user)
+    hotel = HotelFactory()
+    free_rooms = RoomFactory.create_batch(3, hotel=hotel)
+    taken_room = RoomFactory(hotel=hotel)
+
+    Reservation.objects.create(
+        user=customer_profile,
+        room=taken_room,
+        checking_date=timezone.make_aware(datetime(2030, 6, 2)),
+        checkout_date=timezone.make_aware(datetime(2030, 6, 4)),
+        total_price=500,
+        prefered_payment_method="Prepaid",
+        nights=2,
+    )
+
+    client.force_authenticate(user=customer_user)
+    url = reverse("reservations:v1:room-reserve-bulk")
+    room_ids = [room.id for room in free_rooms] + [taken_room.id]
+    data = {
+        "rooms": room_ids,
+        "checking_date": "2030-06-01",
+        "checkout_date": "2030-06-03",
+        "prefered_payment_method": "Prepaid",
+    }
+
+    response = client.post(url, data, format="json")
+
+    assert response.status_code == status.HTTP_201_CREATED
+    assert response.data["reserved"] == 3
+    statuses = {r["room"]: r["status"] for r in response.data["results"]}
+    assert statuses == {
+        **{room.id: "reserved" for room in free_rooms},
+        taken_room.id: "unavailable",
+    }
+    for room in free_rooms:
+        assert not Reservation.objects.is_room_available(
+            room.id, datetime(2030, 6, 1).date(), datetime(2030, 6, 3).date()
+        )
+
+
+@pytest.mark.django_db
+def test_bulk_reservation_rejects_unknown_rooms():
+    client = APIClient()
+    customer_user = UserFactory(role="customer")
+    room = RoomFactory()
+
+    client.force_authenticate(user=customer_user)
+    url = reverse("reservations:v1:room-reserve-bulk")
+    data = {
+        "rooms": [room.id, room.id + 1000],
+        "checking_date": "2030-06-01",
+        "checkout_date": "2030-06-03",
+    }
+
+    response = client.post(url, data, format="json")
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert not Reservation.objects.exists()
+
+
+@pytest.mark.django_db
+def test_bulk_reservation_skips_rooms_that_are_not_available():
+    client = APIClient()
+    customer_user = UserFactory(role="customer")
+    CustomerProfile.objects.get_or_create(user=customer_user)
+    hotel = HotelFactory()
+    free_room = RoomFactory(hotel=hotel)
+    closed_room = RoomFactory(hotel=hotel, is_available=False)
+
+    client.force_authenticate(user=customer_user)
+    url = reverse("reservations:v1:room-reserve-bulk")
+    data = {
+        "rooms": [free_room.id, closed_room.id],
+        "checking_date": "2030-06-01",
+        "checkout_date": "2030-06-03",
+    }
+
+    response = client.post(url, data, format="json")
+
+    assert response.status_code == status.HTTP_201_CREATED
+    statuses = {r["room"]: r["status"] for r in response.data["results"]}
+    assert statuses == {free_room.id: "reserved", closed_room.id: "unavailable"}
+    assert not Reservation.objects.filter(room=closed_room).exists()
+
+
+@pytest.mark.django_db
+def test_bulk_reservation_is_forbidden_for_hotel_owners():
+    client = APIClient()
+    owner_user = UserFactory(role="hotel_owner")
+    room = RoomFactory()
+
+    client.force_authenticate(user=owner_user)
+    url = reverse("reservations:v1:room-reserve-bulk")
+    data = {
+        "rooms": [room.id],
+        "checking_date": "2030-06-01",
+        "checkout_date": "2030-06-03",
+    }
+
+    response = client.post(url, data, format="json")
+
+    assert response.status_code == status.HTTP_403_FORBIDDEN
+    assert not Reservation.objects.exists()
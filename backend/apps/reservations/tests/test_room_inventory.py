@@ -0,0 +1,115 @@
+import pytest
+from datetime import date
+from decimal import Decimal
+
+from apps.accounts.models import CustomerProfile
+from apps.accounts.tests.factories import UserFactory
+from apps.hotel.tests.factories import RoomFactory
+from apps.reservations.models import (
+    BookingStatus,
+    CheckIn,
+    CheckOut,
+    Reservation,
+    RoomNight,
+)
+from apps.reservations.services import create_reservation
+
+
+def _customer():
+    user = UserFactory(role="customer")
+    profile, _ = CustomerProfile.objects.get_or_create(user=user)
+    return profile
+
+
+def _room():
+    return RoomFactory(price_per_night=Decimal("100.00"))
+
+
+@pytest.mark.django_db
+def test_create_reservation_claims_one_row_per_night():
+    room = _room()
+    reservation = create_reservation(
+        user_profile=_customer(),
+        room=room,
+        check_in_date=date(2030, 3, 1),
+        check_out_date=date(2030, 3, 4),
+        prefered_payment_method="Prepaid",
+    )
+
+    nights = RoomNight.objects.filter(reservation=reservation).order_by("night")
+    assert [n.night for n in nights] == [
+        date(2030, 3, 1),
+        date(2030, 3, 2),
+        date(2030, 3, 3),
+    ]
+    assert not Reservation.objects.is_room_available(
+        room.id, date(2030, 3, 3), date(2030, 3, 5)
+    )
+    assert Reservation.objects.is_room_available(
+        room.id, date(2030, 3, 4), date(2030, 3, 6)
+    )
+
+
+@pytest.mark.django_db
+def test_cancellation_releases_inventory():
+    room = _room()
+    reservation = create_reservation(
+        user_profile=_customer(),
+        room=room,
+        check_in_date=date(2030, 4, 1),
+        check_out_date=date(2030, 4, 3),
+        prefered_payment_method="Prepaid",
+    )
+
+    reservation.booking_status = BookingStatus.CANCELLED
+    reservation.save(update_fields=["booking_status"])
+
+    assert not RoomNight.objects.filter(reservation=reservation).exists()
+    assert Reservation.objects.is_room_available(
+        room.id, date(2030, 4, 1), date(2030, 4, 3)
+    )
+
+
+@pytest.mark.django_db
+def test_reactivated_reservation_claims_its_nights_again():
+    room = _room()
+    reservation = create_reservation(
+        user_profile=_customer(),
+        room=room,
+        check_in_date=date(2030, 4, 1),
+        check_out_date=date(2030, 4, 3),
+        prefered_payment_method="Prepaid",
+    )
+    reservation.booking_status = BookingStatus.CANCELLED
+    reservation.save(update_fields=["booking_status"])
+
+    reservation.booking_status = BookingStatus.CONFIRMED
+    reservation.save(update_fields=["booking_status"])
+
+    assert RoomNight.objects.filter(reservation=reservation).count() == 2
+    assert not Reservation.objects.is_room_available(
+        room.id, date(2030, 4, 1), date(2030, 4, 3)
+    )
+
+
+@pytest.mark.django_db
+def test_early_check_out_releases_remaining_nights():
+    room = _room()
+    customer = _customer()
+    reservation = create_reservation(
+        user_profile=customer,
+        room=room,
+        check_in_date=date(2030, 5, 1),
+        check_out_date=date(2030, 5, 5),
+        prefered_payment_method="Prepaid",
+    )
+    CheckIn.objects.create(reservation=reservation, customer=customer, room=room)
+    CheckOut.objects.create(
+        reservation=reservation, customer=customer, check_out_date=date(2030, 5, 3)
+    )
+
+    remaining = RoomNight.objects.filter(reservation=reservation)
+    assert sorted(n.night for n in remaining) == [date(2030, 5, 1), date(2030, 5, 2)]
+    assert Reservation.objects.is_room_available(
+        room.id, date(2030, 5, 3), date(2030, 5, 5)
+    )
@@ -3,13 +3,27 @@ from apps.reviews.models import Review
 
 
 class ReviewSerializer(serializers.ModelSerializer):
-    user_name = serializers.CharField(source="user.full_name", read_only=True)
+    user_name = serializers.SerializerMethodField()
     replies = serializers.SerializerMethodField()
 
     class Meta:
         model = Review
         fields = ["id", "user_name", "rating", "comment", "created_at", "replies"]
 
+    def get_user_name(self, obj):
+        profile = getattr(obj.user, "customer_profile", None)
+        return (profile.full_name if profile else "") or obj.user.email
+
     def get_replies(self, obj):
-        children = obj.children.all().order_by("created_at")
-        return ReviewSerializer(children, many=True).data
+        """
+        Replies come from context["replies_by_parent"] (parent id -> replies
+        ordered by created_at) when the view has loaded the whole thread;
+        otherwise they are queried for this review.
+        """
+        replies_by_parent = self.context.get("replies_by_parent")
+        if replies_by_parent is None:
+            children = obj.children.select_related("user__customer_profile")
+            children = children.order_by("created_at")
+        else:
+            children = replies_by_parent.get(obj.id, [])
+        return ReviewSerializer(children, many=True, context=self.context).data
@@ -1,17 +1,17 @@
-from rest_framework import generics, permissions
-from django.shortcuts import get_object_or_404
+from collections import defaultdict
+
+from rest_framework import generics, permissions, status
 from django.core.cache import cache
-from django.db.models import Avg
+from django.shortcuts import get_object_or_404
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticatedOrReadOnly
 from rest_framework.response import Response
 
-from azure.ai.inference.models import SystemMessage, UserMessage
-
 from apps.hotel.models import Hotel
-from apps.reviews.models import Review
+from apps.reviews.models import Review, ReviewSummary
+from apps.reviews.services import SUMMARY_CACHE_TIMEOUT, summary_cache_key
+from apps.reviews.tasks import enqueue_review_summary
 from .serializers import ReviewSerializer
-from .utils import _call_text_summarizer
 
 
 @api_view(["GET"])
@@ -50,6 +50,11 @@ class HotelReviewListView(generics.ListAPIView):
     """
     Endpoint: GET /reviews/hotel/<hotel_id>/list/
     Returns a list of all reviews for a hotel, including parent-child relations
+
+    All replies of the hotel are loaded in one query (a range scan of the
+    (hotel, path) index) and handed to the serializer grouped by parent, so
+    the whole thread costs two queries (top-level reviews + replies) however
+    deep it is.
     """
 
     serializer_class = ReviewSerializer
@@ -57,88 +62,61 @@ class HotelReviewListView(generics.ListAPIView):
 
     def get_queryset(self):
         hotel_id = self.kwargs.get("hotel_id")
-        return Review.objects.filter(hotel__id=hotel_id, parent__isnull=True).order_by(
-            "-created_at"
+        return (
+            Review.objects.filter(hotel__id=hotel_id, parent__isnull=True)
+            .select_related("user__customer_profile")
+            .order_by("-created_at")
         )
 
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        replies = (
+            Review.objects.filter(hotel__id=self.kwargs.get("hotel_id"), depth__gt=0)
+            .select_related("user__customer_profile")
+            .in_thread_order()
+        )
+        replies_by_parent = defaultdict(list)
+        for reply in replies:
+            replies_by_parent[reply.parent_id].append(reply)
+        context["replies_by_parent"] = replies_by_parent
+        return context
+
 
 @api_view(["GET"])
 @permission_classes([IsAuthenticatedOrReadOnly])
 def hotel_reviews_summary(request, hotel_id):
     """
     GET /reviews/hotel/<hotel_id>/summary/
-    Returns a short summary of up to N latest reviews, cached for 5 minutes.
+    Returns the stored summary of the hotel's latest reviews.
     Response JSON shape (example):
       {
         "summary": "...",
         "avg_rating": 4.2,
-        "positive_points": ["..."],
-        "negative_points": ["..."],
+        "pros": ["..."],
+        "cons": ["..."],
         "top_mentions": ["..."],
         "count": 12
       }
-    """
-    cache_key = f"hotel_reviews_summary:{hotel_id}"
-    cached = cache.get(cache_key)
-    if cached:
-        return Response(cached)
-
-    reviews_qs = Review.objects.filter(hotel_id=hotel_id).order_by("-created_at")[:20]
-    if not reviews_qs.exists():
-        result = {"summary": "No reviews available.", "count": 0}
-        cache.set(cache_key, result, 300)
-        return Response(result)
-
-    avg_rating = reviews_qs.aggregate(avg=Avg("rating"))["avg"]
 
-    def clean_text(s, max_len=800):
-        t = (s or "").strip()
-        return (t[:max_len] + "...") if len(t) > max_len else t
-
-    # Filter out empty or very short comments
-    reviews_list = [
-        {"rating": r.rating, "comment": clean_text(r.comment)}
-        for r in reviews_qs
-        if r.comment and len(r.comment.strip()) > 10
-    ]
-
-    if not reviews_list:
-        result = {"summary": "No meaningful reviews available.", "count": 0}
-        cache.set(cache_key, result, 300)
+    Summaries are generated in the background by summarize_hotel_reviews
+    (see apps.reviews.signals), never inside the request. Served from the
+    cache, else from ReviewSummary; if the hotel has reviews but no summary
+    yet, a job is queued and 202 {"status": "pending"} is returned.
+    """
+    cache_key = summary_cache_key(hotel_id)
+    result = cache.get(cache_key)
+    if result is not None:
         return Response(result)
 
-    system = SystemMessage(
-        "You are an assistant that summarizes hotel reviews in English. "
-        "Return output as JSON only with fields: summary (short text), "
-        "avg_rating (numeric), pros (list of positive points), cons (list of negative points), "
-        "top_mentions (list of most-mentioned words/items). Return only valid JSON."
-    )
-
-    reviews_text = "\n\n".join(
-        [f"Rating: {r['rating']}\nComment: {r['comment']}" for r in reviews_list]
-    )
-    user_msg = UserMessage(
-        f"This is a list of {len(reviews_list)} recent reviews for a hotel:\n\n{reviews_text}\n\n"
-        "Provide a concise overall summary, pros, cons, and top mentions. Output must be JSON only."
-    )
-
-    try:
-        resp = _call_text_summarizer([system, user_msg])
-    except Exception as e:
-        return Response({"error": "summarizer_failed", "detail": str(e)}, status=500)
+    summary = ReviewSummary.objects.filter(
+        hotel_id=hotel_id, generated_at__isnull=False
+    ).first()
+    if summary is not None:
+        cache.set(cache_key, summary.data, SUMMARY_CACHE_TIMEOUT)
+        return Response(summary.data)
 
-    # Attach count and avg_rating if model returned valid JSON
-    if isinstance(resp, dict):
-        resp.setdefault("count", len(reviews_list))
-        resp.setdefault(
-            "avg_rating", float(avg_rating) if avg_rating is not None else None
-        )
-    else:
-        resp = {
-            "text": str(resp),
-            "count": len(reviews_list),
-            "avg_rating": float(avg_rating) if avg_rating is not None else None,
-        }
+    if not Review.objects.filter(hotel_id=hotel_id, parent__isnull=True).exists():
+        return Response({"summary": "No reviews available.", "count": 0})
 
-    cache.set(cache_key, resp, 1)
-    return Response(resp)
+    enqueue_review_summary(hotel_id)
+    return Response({"status": "pending"}, status=status.HTTP_202_ACCEPTED)
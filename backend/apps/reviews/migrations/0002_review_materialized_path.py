@@ -0,0 +1,51 @@
+# Generated by Django 4.2.5 on 2026-10-18 08:50
+
+from django.db import migrations, models
+
+# Walk every thread from its root and store each review's path and depth.
+BACKFILL_PATHS = """
+WITH RECURSIVE tree (id, path, depth) AS (
+    SELECT id, LPAD(id::text, 10, '0') || '/', 0
+    FROM reviews_review
+    WHERE parent_id IS NULL
+  UNION ALL
+    SELECT child.id, tree.path || LPAD(child.id::text, 10, '0') || '/', tree.depth + 1
+    FROM reviews_review child
+    JOIN tree ON child.parent_id = tree.id
+)
+UPDATE reviews_review
+SET path = tree.path, depth = tree.depth
+FROM tree
+WHERE reviews_review.id = tree.id
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("reviews", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="review",
+            name="depth",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="review",
+            name="path",
+            field=models.TextField(
+                blank=True, db_collation="C", default="", editable=False
+            ),
+        ),
+        migrations.RunSQL(BACKFILL_PATHS, migrations.RunSQL.noop),
+        migrations.AddIndex(
+            model_name="review",
+            index=models.Index(fields=["path"], name="review_path_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="review",
+            index=models.Index(fields=["hotel", "path"], name="review_hotel_path_idx"),
+        ),
+    ]
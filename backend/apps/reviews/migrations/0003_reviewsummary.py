@@ -0,0 +1,35 @@
+# Generated by Django 4.2.5 on 2026-10-18 08:54
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("hotel", "0007_hotelstats"),
+        ("reviews", "0002_review_materialized_path"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ReviewSummary",
+            fields=[
+                (
+                    "hotel",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="review_summary",
+                        serialize=False,
+                        to="hotel.hotel",
+                    ),
+                ),
+                ("data", models.JSONField(default=dict)),
+                ("review_count", models.PositiveIntegerField(default=0)),
+                ("pending_reviews", models.IntegerField(default=0)),
+                ("generated_at", models.DateTimeField(blank=True, null=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+        ),
+    ]
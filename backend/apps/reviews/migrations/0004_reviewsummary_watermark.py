@@ -0,0 +1,23 @@
+# Generated by Django 4.2.5 on 2026-10-18 08:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("reviews", "0003_reviewsummary"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="reviewsummary",
+            name="last_review_id",
+            field=models.BigIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="reviewsummary",
+            name="rating_sum",
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.5 on 2026-10-18 09:33
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("reviews", "0004_reviewsummary_watermark"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="reviewsummary",
+            name="changed_reviews",
+            field=models.IntegerField(default=0),
+        ),
+    ]
@@ -1,5 +1,7 @@
 # reviews/models.py
-from django.db import models
+from django.db import models, transaction
+from django.db.models import F, Value
+from django.db.models.functions import Concat, Substr
 from django.contrib.auth import get_user_model
 from django.core.validators import MinValueValidator, MaxValueValidator
 
@@ -7,6 +9,19 @@ from apps.hotel.models import Hotel
 
 User = get_user_model()
 
+# Every ancestor contributes one zero-padded id segment to Review.path.
+PATH_SEGMENT = "{:010d}/"
+
+
+class ReviewQuerySet(models.QuerySet):
+    def subtree(self, review):
+        """The review and all of its replies, at any depth (one range scan)."""
+        return self.filter(path__startswith=review.path)
+
+    def in_thread_order(self):
+        """Depth-first order: each review followed by its replies, oldest first."""
+        return self.order_by("path")
+
 
 class Review(models.Model):
     parent = models.ForeignKey(
@@ -18,8 +33,121 @@ class Review(models.Model):
         validators=[MinValueValidator(0), MaxValueValidator(5)]
     )
     comment = models.TextField(blank=True)
+    # Materialized path of the thread, e.g. "0000000012/0000000034/" for a
+    # reply (34) to review 12. The "C" collation makes the plain btree index
+    # serve both prefix LIKE scans and ORDER BY path.
+    path = models.TextField(db_collation="C", blank=True, default="", editable=False)
+    depth = models.PositiveIntegerField(default=0, editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = ReviewQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["path"], name="review_path_idx"),
+            models.Index(fields=["hotel", "path"], name="review_hotel_path_idx"),
+        ]
+
     def __str__(self):
         return f"{self.user} rated {self.hotel.name} ★{self.rating}"
+
+    def _tree_position(self):
+        """(path, depth) this review should have under its current parent."""
+        segment = PATH_SEGMENT.format(self.pk)
+        if self.parent_id is None:
+            return segment, 0
+        return self.parent.path + segment, self.parent.depth + 1
+
+    def save(self, *args, **kwargs):
+        """
+        Keeps path/depth in sync. New reviews get their path right after the
+        insert (it embeds the id); moving a review to another parent rewrites
+        its whole subtree with a single UPDATE.
+        """
+        update_fields = kwargs.get("update_fields")
+        previous = None
+        if self.pk and (update_fields is None or "parent" in update_fields):
+            previous = (
+                Review.objects.filter(pk=self.pk).values_list("parent_id").first()
+            )
+        moved = (
+            bool(self.path) and previous is not None and previous[0] != self.parent_id
+        )
+        if moved and self.parent_id and self.parent.path.startswith(self.path):
+            raise ValueError("A review cannot be moved under one of its own replies.")
+
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            if self.path and not moved:
+                return
+            old_path, old_depth = self.path, self.depth
+            self.path, self.depth = self._tree_position()
+            if moved:
+                Review.objects.filter(path__startswith=old_path).update(
+                    path=Concat(Value(self.path), Substr("path", len(old_path) + 1)),
+                    depth=F("depth") + (self.depth - old_depth),
+                )
+            else:
+                Review.objects.filter(pk=self.pk).update(
+                    path=self.path, depth=self.depth
+                )
+
+
+class ReviewSummaryManager(models.Manager):
+    def add_pending(self, hotel_id):
+        """
+        Count one more review waiting to be summarized for the hotel.
+        Returns (pending reviews, whether a summary was generated before).
+        """
+        if not self.filter(hotel_id=hotel_id).update(
+            pending_reviews=F("pending_reviews") + 1
+        ):
+            self.get_or_create(hotel_id=hotel_id)
+            self.filter(hotel_id=hotel_id).update(
+                pending_reviews=F("pending_reviews") + 1
+            )
+        pending, generated_at = self.filter(hotel_id=hotel_id).values_list(
+            "pending_reviews", "generated_at"
+        )[0]
+        return pending, generated_at is not None
+
+    def mark_changed(self, hotel_id, review_id):
+        """
+        Record that an already summarized review was edited or deleted, so
+        the next refresh starts over. Returns whether one was affected.
+        """
+        return bool(
+            self.filter(hotel_id=hotel_id, last_review_id__gte=review_id).update(
+                changed_reviews=F("changed_reviews") + 1
+            )
+        )
+
+
+class ReviewSummary(models.Model):
+    """
+    The latest AI summary of a hotel's reviews, produced in the background
+    by apps.reviews.tasks.summarize_hotel_reviews and served by the
+    summary endpoint. `pending_reviews` counts reviews written since and
+    `changed_reviews` summarized ones edited or deleted since (which forces
+    a full rerun); review_count/rating_sum cover every review up to the
+    watermark.
+    """
+
+    hotel = models.OneToOneField(
+        Hotel, on_delete=models.CASCADE, primary_key=True, related_name="review_summary"
+    )
+    data = models.JSONField(default=dict)
+    # Watermark: reviews up to this id are already in the summary.
+    last_review_id = models.BigIntegerField(default=0)
+    review_count = models.PositiveIntegerField(default=0)
+    rating_sum = models.PositiveIntegerField(default=0)
+    pending_reviews = models.IntegerField(default=0)
+    changed_reviews = models.IntegerField(default=0)
+    generated_at = models.DateTimeField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    objects = ReviewSummaryManager()
+
+    def __str__(self):
+        return f"Review summary for {self.hotel_id}"
@@ -0,0 +1,106 @@
+from django.core.cache import cache
+from django.db.models import Count, F, Sum
+from django.utils import timezone
+
+from apps.reviews.models import Review, ReviewSummary
+from apps.reviews.summarizers import get_summarizer
+
+# How many of the latest reviews go into one summarizer call.
+SUMMARY_BATCH_SIZE = 20
+# The summary is also kept in the database, so the cache only saves a query.
+SUMMARY_CACHE_TIMEOUT = 60 * 60
+
+
+def summary_cache_key(hotel_id):
+    return f"review_summary:{hotel_id}"
+
+
+def _clean_text(s, max_len=800):
+    t = (s or "").strip()
+    return (t[:max_len] + "...") if len(t) > max_len else t
+
+
+def _meaningful(reviews):
+    # Filter out empty or very short comments
+    return [
+        {"rating": r["rating"], "comment": _clean_text(r["comment"])}
+        for r in reviews
+        if r["comment"] and len(r["comment"].strip()) > 10
+    ]
+
+
+def refresh_review_summary(hotel_id, summarizer=None, full=False):
+    """
+    Brings the stored review summary of a hotel up to date and refreshes
+    the cached copy.
+
+    Incremental by default: only top-level reviews newer than the watermark
+    (ReviewSummary.last_review_id) are sent, in batches of SUMMARY_BATCH_SIZE,
+    together with the previous summary for the summarizer to merge them into,
+    so the cost follows the new content rather than the hotel's history.
+    Without a watermark yet, with full=True, or once summarized reviews were
+    edited or deleted (ReviewSummary.changed_reviews), the text starts over
+    from the latest SUMMARY_BATCH_SIZE reviews; review_count/rating_sum are
+    then recounted over all of them, so avg_rating is the hotel's average.
+    Raises if a summarizer call fails, so nothing is stored.
+    """
+    summarizer = summarizer or get_summarizer()
+    summary, _ = ReviewSummary.objects.get_or_create(hotel_id=hotel_id)
+    reviews = Review.objects.filter(hotel_id=hotel_id, parent__isnull=True).values(
+        "id", "rating", "comment"
+    )
+
+    incremental = not full and summary.last_review_id and not summary.changed_reviews
+    if incremental:
+        new = list(reviews.filter(id__gt=summary.last_review_id).order_by("id"))
+        batches = [
+            new[i : i + SUMMARY_BATCH_SIZE]
+            for i in range(0, len(new), SUMMARY_BATCH_SIZE)
+        ]
+        last_review_id = summary.last_review_id
+        review_count, rating_sum = summary.review_count, summary.rating_sum
+        data = summary.data if summary.data.get("count") else None
+    else:
+        latest = list(reviews.order_by("-id")[:SUMMARY_BATCH_SIZE])
+        batches = [latest[::-1]]
+        last_review_id = latest[0]["id"] if latest else 0
+        totals = reviews.filter(id__lte=last_review_id).aggregate(
+            count=Count("id"), rating_sum=Sum("rating")
+        )
+        review_count, rating_sum = totals["count"], totals["rating_sum"] or 0
+        data = None
+
+    for batch in batches:
+        if not batch:
+            continue
+        reviews_list = _meaningful(batch)
+        if reviews_list:
+            merged = summarizer.summarize(reviews_list, previous=data)
+            if not isinstance(merged, dict):
+                merged = {"text": str(merged)}
+            merged["count"] = len(reviews_list) + (data["count"] if data else 0)
+            data = merged
+        if incremental:
+            last_review_id = batch[-1]["id"]
+            review_count += len(batch)
+            rating_sum += sum(r["rating"] for r in batch)
+
+    if not review_count:
+        data = {"summary": "No reviews available.", "count": 0}
+    elif data is None:
+        data = {"summary": "No meaningful reviews available.", "count": 0}
+    else:
+        data["avg_rating"] = rating_sum / review_count
+
+    # Reviews written while the summarizer ran stay pending.
+    ReviewSummary.objects.filter(hotel_id=hotel_id).update(
+        data=data,
+        review_count=review_count,
+        rating_sum=rating_sum,
+        last_review_id=last_review_id,
+        pending_reviews=F("pending_reviews") - summary.pending_reviews,
+        changed_reviews=F("changed_reviews") - summary.changed_reviews,
+        generated_at=timezone.now(),
+    )
+    cache.set(summary_cache_key(hotel_id), data, SUMMARY_CACHE_TIMEOUT)
+    return data
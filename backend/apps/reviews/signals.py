@@ -0,0 +1,40 @@
+from django.conf import settings
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from apps.hotel.models import Hotel
+
+from .models import Review, ReviewSummary
+from .tasks import enqueue_review_summary
+
+
+@receiver(post_save, sender=Review)
+def schedule_review_summary(sender, instance, created, **kwargs):
+    """
+    Count new top-level reviews and queue a fresh summary once
+    REVIEW_SUMMARY_MIN_NEW_REVIEWS have arrived (or for a hotel's first one).
+    """
+    if not created or instance.parent_id:
+        return
+    pending, summarized = ReviewSummary.objects.add_pending(instance.hotel_id)
+    if not summarized or pending >= settings.REVIEW_SUMMARY_MIN_NEW_REVIEWS:
+        hotel_id = instance.hotel_id
+        transaction.on_commit(lambda: enqueue_review_summary(hotel_id))
+
+
+@receiver(post_save, sender=Review)
+@receiver(post_delete, sender=Review)
+def refresh_summary_of_changed_review(sender, instance, created=False, **kwargs):
+    """
+    Editing or deleting a review that is already in the summary makes the
+    next refresh start over (see refresh_review_summary); queue it now.
+    """
+    origin = kwargs.get("origin")
+    if created or instance.parent_id:
+        return  # new reviews are counted above; replies aren't summarized
+    if isinstance(origin, Hotel) or getattr(origin, "model", None) is Hotel:
+        return  # the hotel's summary is being deleted with it
+    if ReviewSummary.objects.mark_changed(instance.hotel_id, instance.id):
+        hotel_id = instance.hotel_id
+        transaction.on_commit(lambda: enqueue_review_summary(hotel_id))
@@ -0,0 +1,140 @@
+import json
+from abc import ABC, abstractmethod
+from collections import Counter
+from functools import lru_cache
+
+from azure.ai.inference import ChatCompletionsClient
+from azure.ai.inference.models import SystemMessage, UserMessage
+from azure.core.credentials import AzureKeyCredential
+from decouple import config
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+
+class BaseSummarizer(ABC):
+    """
+    Turns a batch of reviews into a summary dict with the keys
+    summary, pros, cons and top_mentions.
+    `reviews` is a list of {"rating": int, "comment": str}. When `previous`
+    (an earlier summary dict) is given, the reviews are new ones to be
+    merged into it.
+    """
+
+    @abstractmethod
+    def summarize(self, reviews, previous=None):
+        """Return the summary dict for `reviews`, merged into `previous`."""
+
+
+class AzureInferenceSummarizer(BaseSummarizer):
+    """
+    Summarizes with the Azure/GitHub inference endpoint configured via env.
+    The client is created once and reused by every call of this instance.
+    """
+
+    SYSTEM_PROMPT = (
+        "You are an assistant that summarizes hotel reviews in English. "
+        "Return output as JSON only with fields: summary (short text), "
+        "avg_rating (numeric), pros (list of positive points), cons (list of negative points), "
+        "top_mentions (list of most-mentioned words/items). Return only valid JSON."
+    )
+
+    def __init__(self):
+        self.endpoint = getattr(
+            settings, "AZURE_INFERENCE_ENDPOINT", "https://models.github.ai/inference"
+        )
+        self.model = getattr(settings, "AZURE_INFERENCE_MODEL", "xai/grok-3-mini")
+        self._client = None
+
+    @property
+    def client(self):
+        if self._client is None:
+            api_token = config("GITHUB_TOKEN")
+            if not api_token:
+                raise RuntimeError("Inference API token not configured")
+            self._client = ChatCompletionsClient(
+                endpoint=self.endpoint, credential=AzureKeyCredential(api_token)
+            )
+        return self._client
+
+    def summarize(self, reviews, previous=None):
+        reviews_text = "\n\n".join(
+            f"Rating: {r['rating']}\nComment: {r['comment']}" for r in reviews
+        )
+        if previous:
+            user_msg = UserMessage(
+                f"This is the current summary of a hotel's reviews:\n\n{json.dumps(previous)}\n\n"
+                f"These are {len(reviews)} new reviews:\n\n{reviews_text}\n\n"
+                "Update the summary, pros, cons, and top mentions to also reflect the new reviews. "
+                "Output must be JSON only, with the same fields."
+            )
+        else:
+            user_msg = UserMessage(
+                f"This is a list of {len(reviews)} recent reviews for a hotel:\n\n{reviews_text}\n\n"
+                "Provide a concise overall summary, pros, cons, and top mentions. Output must be JSON only."
+            )
+        resp = self.client.complete(
+            messages=[SystemMessage(self.SYSTEM_PROMPT), user_msg],
+            model=self.model,
+            temperature=0.2,
+            top_p=1.0,
+        )
+        content = resp.choices[0].message.content
+
+        try:
+            parsed = json.loads(content)
+            if isinstance(parsed, dict) and {
+                "summary",
+                "pros",
+                "cons",
+                "top_mentions",
+            }.issubset(parsed.keys()):
+                return parsed
+        except Exception:
+            pass
+
+        return {"text": content}
+
+
+class StubSummarizer(BaseSummarizer):
+    """
+    Deterministic local backend for tests and offline development:
+    no network, the summary is derived from the reviews themselves.
+    """
+
+    def summarize(self, reviews, previous=None):
+        previous = previous or {}
+        words = Counter(
+            word.strip(".,!?").lower()
+            for review in reviews
+            for word in review["comment"].split()
+            if len(word) > 4
+        )
+        total = len(reviews) + previous.get("count", 0)
+        mentions = [word for word, _ in words.most_common(5)]
+        return {
+            "summary": f"Summary of {total} reviews.",
+            "pros": (
+                [r["comment"] for r in reviews if r["rating"] >= 4]
+                + previous.get("pros", [])
+            )[:3],
+            "cons": (
+                [r["comment"] for r in reviews if r["rating"] <= 2]
+                + previous.get("cons", [])
+            )[:3],
+            "top_mentions": list(
+                dict.fromkeys(mentions + previous.get("top_mentions", []))
+            )[:5],
+        }
+
+
+@lru_cache(maxsize=None)
+def _load_summarizer(path):
+    return import_string(path)()
+
+
+def get_summarizer():
+    """
+    Return the shared instance of settings.REVIEW_SUMMARIZER_BACKEND.
+    One instance per backend and process, so its client is reused.
+    """
+    return _load_summarizer(settings.REVIEW_SUMMARIZER_BACKEND)
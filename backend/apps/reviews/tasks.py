@@ -0,0 +1,50 @@
+from celery import shared_task
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Q
+
+from apps.reviews.models import ReviewSummary
+from apps.reviews.services import refresh_review_summary
+
+# Set while a summary job is queued for the hotel, so bursts of reviews or
+# requests enqueue it only once.
+SUMMARY_QUEUED_KEY = "review_summary:{}:queued"
+SUMMARY_QUEUED_TIMEOUT = 10 * 60
+
+
+def enqueue_review_summary(hotel_id):
+    """Queue summarize_hotel_reviews for the hotel unless it is already queued."""
+    if cache.add(SUMMARY_QUEUED_KEY.format(hotel_id), 1, SUMMARY_QUEUED_TIMEOUT):
+        summarize_hotel_reviews.delay(hotel_id)
+
+
+@shared_task(bind=True, max_retries=3)
+def summarize_hotel_reviews(self, hotel_id, full=False):
+    """
+    Merges the hotel's new reviews into its stored summary
+    (or starts it over with full=True, see refresh_review_summary).
+
+    Retries with exponential backoff when the summarizer backend fails;
+    the previous summary keeps being served meanwhile.
+    """
+    try:
+        refresh_review_summary(hotel_id, full=full)
+    except Exception as exc:
+        raise self.retry(exc=exc, countdown=30 * 2**self.request.retries)
+    cache.delete(SUMMARY_QUEUED_KEY.format(hotel_id))
+
+
+@shared_task
+def summarize_pending_reviews():
+    """
+    Queues a summary for every hotel with enough unsummarized reviews, or
+    with summarized reviews that were edited or deleted since.
+    Catches hotels whose trigger was lost (e.g. the broker was down).
+    """
+    hotel_ids = ReviewSummary.objects.filter(
+        Q(pending_reviews__gte=settings.REVIEW_SUMMARY_MIN_NEW_REVIEWS)
+        | Q(changed_reviews__gt=0)
+    ).values_list("hotel_id", flat=True)
+    for hotel_id in hotel_ids:
+        enqueue_review_summary(hotel_id)
+    return len(hotel_ids)
@@ -1,3 +1,346 @@
-from django.test import TestCase
+import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
 
-# Create your tests here.
+from apps.accounts.tests.factories import UserFactory
+from apps.hotel.tests.factories import HotelFactory
+from apps.reviews import tasks
+from apps.reviews.models import Review, ReviewSummary
+from apps.reviews.services import refresh_review_summary
+from apps.reviews.summarizers import BaseSummarizer, StubSummarizer
+
+
+def _app_queries(context):
+    # Ignore the profiler's own bookkeeping (silk) and transaction noise.
+    return len(
+        [
+            q
+            for q in context.captured_queries
+            if q["sql"].startswith("SELECT") and "silk_" not in q["sql"]
+        ]
+    )
+
+
+@pytest.mark.django_db
+class TestHotelReviewListView:
+    def _thread(self, hotel, user, depth):
+        parent = Review.objects.create(hotel=hotel, user=user, rating=4, comment="Nice")
+        for _ in range(depth):
+            parent = Review.objects.create(
+                hotel=hotel, user=user, parent=parent, rating=5, comment="Thanks"
+            )
+
+    def _get(self, hotel):
+        return APIClient().get(f"/reviews/api/v1/hotel/{hotel.id}/list/")
+
+    def test_replies_are_nested_in_order(self):
+        hotel = HotelFactory()
+        user = UserFactory()
+        root = Review.objects.create(hotel=hotel, user=user, rating=4)
+        first = Review.objects.create(hotel=hotel, user=user, parent=root, rating=5)
+        second = Review.objects.create(hotel=hotel, user=user, parent=root, rating=5)
+        nested = Review.objects.create(hotel=hotel, user=user, parent=first, rating=5)
+
+        response = self._get(hotel)
+
+        assert response.status_code == 200
+        assert [r["id"] for r in response.data] == [root.id]
+        replies = response.data[0]["replies"]
+        assert [r["id"] for r in replies] == [first.id, second.id]
+        assert [r["id"] for r in replies[0]["replies"]] == [nested.id]
+        assert replies[1]["replies"] == []
+
+    def test_user_name_falls_back_to_email(self):
+        hotel = HotelFactory()
+        user = UserFactory()
+        user.customer_profile.full_name = ""
+        user.customer_profile.save()
+        Review.objects.create(hotel=hotel, user=user, rating=4)
+
+        response = self._get(hotel)
+
+        assert response.data[0]["user_name"] == user.email
+
+    def test_query_count_does_not_grow_with_replies(self):
+        hotel = HotelFactory()
+        user = UserFactory()
+        self._thread(hotel, user, depth=1)
+        with CaptureQueriesContext(connection) as small:
+            self._get(hotel)
+
+        for _ in range(3):
+            self._thread(hotel, user, depth=3)
+        with CaptureQueriesContext(connection) as large:
+            response = self._get(hotel)
+
+        assert len(response.data) == 4
+        assert _app_queries(small) == _app_queries(large) == 2
+
+
+@pytest.mark.django_db
+class TestReviewPath:
+    def _review(self, hotel, user, parent=None):
+        return Review.objects.create(hotel=hotel, user=user, parent=parent, rating=4)
+
+    def test_path_and_depth_follow_the_thread(self):
+        hotel, user = HotelFactory(), UserFactory()
+        root = self._review(hotel, user)
+        reply = self._review(hotel, user, parent=root)
+        nested = self._review(hotel, user, parent=reply)
+
+        nested.refresh_from_db()
+        assert root.path == f"{root.id:010d}/"
+        assert nested.path == f"{root.id:010d}/{reply.id:010d}/{nested.id:010d}/"
+        assert (root.depth, reply.depth, nested.depth) == (0, 1, 2)
+
+    def test_subtree_and_thread_order(self):
+        hotel, user = HotelFactory(), UserFactory()
+        first = self._review(hotel, user)
+        second = self._review(hotel, user)
+        reply = self._review(hotel, user, parent=first)
+        nested = self._review(hotel, user, parent=reply)
+        late_reply = self._review(hotel, user, parent=first)
+
+        assert list(Review.objects.subtree(reply).in_thread_order()) == [reply, nested]
+        assert list(Review.objects.filter(hotel=hotel).in_thread_order()) == [
+            first,
+            reply,
+            nested,
+            late_reply,
+            second,
+        ]
+
+    def test_moving_a_review_rewrites_its_subtree(self):
+        hotel, user = HotelFactory(), UserFactory()
+        first = self._review(hotel, user)
+        second = self._review(hotel, user)
+        reply = self._review(hotel, user, parent=first)
+        nested = self._review(hotel, user, parent=reply)
+
+        reply.parent = second
+        reply.save()
+
+        nested.refresh_from_db()
+        assert nested.path == f"{second.id:010d}/{reply.id:010d}/{nested.id:010d}/"
+        assert nested.depth == 2
+        assert Review.objects.subtree(first).count() == 1
+
+    def test_review_cannot_move_under_its_own_reply(self):
+        hotel, user = HotelFactory(), UserFactory()
+        root = self._review(hotel, user)
+        reply = self._review(hotel, user, parent=root)
+
+        root.parent = reply
+        with pytest.raises(ValueError):
+            root.save()
+
+
+@pytest.fixture
+def queued(monkeypatch):
+    """Hotel ids passed to summarize_hotel_reviews.delay()."""
+    cache.clear()
+    calls = []
+    monkeypatch.setattr(tasks.summarize_hotel_reviews, "delay", calls.append)
+    yield calls
+    cache.clear()
+
+
+@pytest.mark.django_db
+class TestReviewSummaryPipeline:
+    @pytest.fixture(autouse=True)
+    def stub_backend(self, settings):
+        settings.REVIEW_SUMMARIZER_BACKEND = "apps.reviews.summarizers.StubSummarizer"
+        settings.REVIEW_SUMMARY_MIN_NEW_REVIEWS = 3
+
+    def _review(self, hotel, rating=4):
+        return Review.objects.create(
+            hotel=hotel,
+            user=UserFactory(),
+            rating=rating,
+            comment="Lovely breakfast and helpful staff.",
+        )
+
+    def _get(self, hotel):
+        return APIClient().get(f"/reviews/api/v1/hotel/{hotel.id}/summary/")
+
+    def test_first_review_queues_a_summary(
+        self, queued, django_capture_on_commit_callbacks
+    ):
+        hotel = HotelFactory()
+        with django_capture_on_commit_callbacks(execute=True):
+            self._review(hotel)
+            self._review(hotel)
+
+        assert queued == [hotel.id]
+
+    def test_new_summary_is_queued_after_enough_reviews(
+        self, queued, django_capture_on_commit_callbacks
+    ):
+        hotel = HotelFactory()
+        self._review(hotel)
+        tasks.summarize_hotel_reviews(hotel.id)
+
+        with django_capture_on_commit_callbacks(execute=True):
+            self._review(hotel)
+            self._review(hotel)
+        assert queued == []
+
+        with django_capture_on_commit_callbacks(execute=True):
+            self._review(hotel)
+        assert queued == [hotel.id]
+
+    def test_task_stores_the_summary(self, queued):
+        hotel = HotelFactory()
+        self._review(hotel, rating=5)
+        self._review(hotel, rating=3)
+
+        tasks.summarize_hotel_reviews(hotel.id)
+
+        summary = ReviewSummary.objects.get(hotel=hotel)
+        assert summary.pending_reviews == 0
+        assert summary.review_count == 2
+        assert summary.data["summary"] == "Summary of 2 reviews."
+        assert summary.data["avg_rating"] == 4.0
+
+    def test_view_serves_the_stored_summary(self, queued):
+        hotel = HotelFactory()
+        self._review(hotel)
+        refresh_review_summary(hotel.id)
+        cache.clear()
+
+        response = self._get(hotel)
+
+        assert response.status_code == 200
+        assert response.data["count"] == 1
+        assert queued == []
+
+    def test_view_queues_a_missing_summary(self, queued):
+        hotel = HotelFactory()
+        self._review(hotel)
+
+        first = self._get(hotel)
+        second = self._get(hotel)
+
+        assert first.status_code == second.status_code == 202
+        assert first.data == {"status": "pending"}
+        assert queued == [hotel.id]
+
+    def test_view_without_reviews(self, queued):
+        response = self._get(HotelFactory())
+
+        assert response.status_code == 200
+        assert response.data["count"] == 0
+        assert queued == []
+
+
+def test_summarizer_without_summarize_cannot_be_instantiated():
+    class IncompleteSummarizer(BaseSummarizer):
+        pass
+
+    with pytest.raises(TypeError):
+        IncompleteSummarizer()
+
+
+class RecordingSummarizer(StubSummarizer):
+    def __init__(self):
+        self.calls = []
+
+    def summarize(self, reviews, previous=None):
+        self.calls.append(([r["rating"] for r in reviews], previous))
+        return super().summarize(reviews, previous=previous)
+
+
+@pytest.mark.django_db
+class TestIncrementalReviewSummary:
+    def _review(self, hotel, rating):
+        return Review.objects.create(
+            hotel=hotel,
+            user=UserFactory(),
+            rating=rating,
+            comment="Lovely breakfast and helpful staff.",
+        )
+
+    def test_only_new_reviews_are_merged(self):
+        hotel, summarizer = HotelFactory(), RecordingSummarizer()
+        self._review(hotel, 5)
+        self._review(hotel, 3)
+        first = refresh_review_summary(hotel.id, summarizer=summarizer)
+        latest = self._review(hotel, 1)
+
+        data = refresh_review_summary(hotel.id, summarizer=summarizer)
+
+        assert summarizer.calls[1] == ([1], first)
+        assert data["count"] == 3
+        assert data["summary"] == "Summary of 3 reviews."
+        assert data["avg_rating"] == 3.0
+        assert ReviewSummary.objects.get(hotel=hotel).last_review_id == latest.id
+
+    def test_nothing_new_skips_the_summarizer(self):
+        hotel, summarizer = HotelFactory(), RecordingSummarizer()
+        self._review(hotel, 4)
+        first = refresh_review_summary(hotel.id, summarizer=summarizer)
+
+        assert refresh_review_summary(hotel.id, summarizer=summarizer) == first
+        assert len(summarizer.calls) == 1
+
+    def test_new_reviews_are_sent_in_batches(self, monkeypatch):
+        monkeypatch.setattr("apps.reviews.services.SUMMARY_BATCH_SIZE", 2)
+        hotel, summarizer = HotelFactory(), RecordingSummarizer()
+        self._review(hotel, 5)
+        refresh_review_summary(hotel.id, summarizer=summarizer)
+        for rating in (1, 2, 3):
+            self._review(hotel, rating)
+
+        data = refresh_review_summary(hotel.id, summarizer=summarizer)
+
+        assert [ratings for ratings, _ in summarizer.calls] == [[5], [1, 2], [3]]
+        assert data["count"] == 4
+
+    def test_full_refresh_starts_over(self, monkeypatch):
+        monkeypatch.setattr("apps.reviews.services.SUMMARY_BATCH_SIZE", 2)
+        hotel, summarizer = HotelFactory(), RecordingSummarizer()
+        for rating in (1, 2, 3):
+            self._review(hotel, rating)
+        refresh_review_summary(hotel.id, summarizer=summarizer)
+
+        data = refresh_review_summary(hotel.id, summarizer=summarizer, full=True)
+
+        assert summarizer.calls[-1] == ([2, 3], None)
+        assert data["count"] == 2
+        # The text covers the latest batch, the average every review.
+        assert data["avg_rating"] == 2.0
+
+    def test_first_summary_counts_every_review(self, monkeypatch):
+        monkeypatch.setattr("apps.reviews.services.SUMMARY_BATCH_SIZE", 2)
+        hotel, summarizer = HotelFactory(), RecordingSummarizer()
+        for rating in (5, 1, 2, 4):
+            self._review(hotel, rating)
+
+        data = refresh_review_summary(hotel.id, summarizer=summarizer)
+        summary = ReviewSummary.objects.get(hotel=hotel)
+
+        assert (summary.review_count, summary.rating_sum) == (4, 12)
+        assert data["avg_rating"] == 3.0
+
+    def test_edited_or_deleted_reviews_force_a_full_rerun(
+        self, queued, django_capture_on_commit_callbacks
+    ):
+        hotel, summarizer = HotelFactory(), RecordingSummarizer()
+        first, second = self._review(hotel, 5), self._review(hotel, 3)
+        refresh_review_summary(hotel.id, summarizer=summarizer)
+
+        with django_capture_on_commit_callbacks(execute=True):
+            first.rating = 1
+            first.save()
+        assert queued == [hotel.id]
+        data = refresh_review_summary(hotel.id, summarizer=summarizer)
+        assert summarizer.calls[-1] == ([1, 3], None)
+        assert data["avg_rating"] == 2.0
+
+        second.delete()
+        data = refresh_review_summary(hotel.id, summarizer=summarizer)
+        summary = ReviewSummary.objects.get(hotel=hotel)
+        assert (summary.review_count, summary.changed_reviews) == (1, 0)
+        assert data["avg_rating"] == 1.0
@@ -0,0 +1,10 @@
+import pytest
+from django.test import override_settings
+
+
+@pytest.fixture(scope="session", autouse=True)
+def media_root(tmp_path_factory):
+    # Factories and the benchmark seed save real image files; keep them out
+    # of the project's media directory.
+    with override_settings(MEDIA_ROOT=str(tmp_path_factory.mktemp("media"))):
+        yield
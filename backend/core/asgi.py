@@ -9,8 +9,15 @@ https://docs.djangoproject.com/en/4.2/howto/deployment/asgi/
 
 import os
 
+from django.conf import settings
+from django.contrib.staticfiles.handlers import ASGIStaticFilesHandler
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "core.settings")
 
 application = get_asgi_application()
+
+# The dev server is uvicorn too (the notification stream needs ASGI), so
+# serve static files the way runserver would.
+if settings.DEBUG:
+    application = ASGIStaticFilesHandler(application)
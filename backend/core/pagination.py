@@ -0,0 +1,190 @@
+import json
+
+from django.db import models
+from django.db.models.lookups import Exact, GreaterThan, LessThan
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import CursorPagination, _reverse_ordering
+
+
+class Row(models.Func):
+    """SQL row constructor, for (a, b) > (x, y) comparisons."""
+
+    function = "ROW"
+    output_field = models.Field()
+
+
+class KeysetCursorPagination(CursorPagination):
+    """
+    CursorPagination whose cursor holds the values of every ordering field,
+    not just the first one. Pages are selected with a row comparison such as
+    (created_at, id) < (c, i), which Postgres answers with a range scan of
+    the matching composite index; DRF's own cursor filters on the first field
+    only and skips ties with an OFFSET. An id tie-breaker is appended to
+    orderings that lack one.
+    """
+
+    def get_ordering(self, request, queryset, view):
+        ordering = super().get_ordering(request, queryset, view)
+        if not any(field.lstrip("-") == "id" for field in ordering):
+            ordering += ("-id" if ordering[0].startswith("-") else "id",)
+        return ordering
+
+    def _get_position_from_instance(self, instance, ordering):
+        values = []
+        for field in ordering:
+            name = field.lstrip("-")
+            value = (
+                instance[name]
+                if isinstance(instance, dict)
+                else getattr(instance, name)
+            )
+            values.append(str(value))
+        return json.dumps(values)
+
+    def _position_filter(self, model, position, reverse):
+        try:
+            values = json.loads(position)
+            fields = [model._meta.get_field(f.lstrip("-")) for f in self.ordering]
+            if len(values) != len(fields):
+                raise ValueError
+            params = [
+                models.Value(field.to_python(value), output_field=field)
+                for field, value in zip(fields, values)
+            ]
+        except Exception:
+            raise NotFound(self.invalid_cursor_message)
+        # Test for: (cursor reversed) XOR (field descending)
+        after = [
+            LessThan if reverse != field.startswith("-") else GreaterThan
+            for field in self.ordering
+        ]
+        columns = [models.F(field.lstrip("-")) for field in self.ordering]
+        if len(set(after)) == 1:
+            return after[0](Row(*columns), Row(*params))
+        # Mixed directions (e.g. ?ordering=-capacity,floor) have no row
+        # comparison; expand it to (a > x) OR (a = x AND b > y) OR ...
+        condition = models.Q()
+        for i, lookup in enumerate(after):
+            step = models.Q(lookup(columns[i], params[i]))
+            for column, param in zip(columns[:i], params[:i]):
+                step &= models.Q(Exact(column, param))
+            condition |= step
+        return condition
+
+    def paginate_queryset(self, queryset, request, view=None):
+        # Same as CursorPagination.paginate_queryset, except for the filter
+        # on the cursor position.
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(request, queryset, view)
+        self.cursor = self.decode_cursor(request)
+        if self.cursor is None:
+            offset, reverse, current_position = (0, False, None)
+        else:
+            offset, reverse, current_position = self.cursor
+
+        if reverse:
+            queryset = queryset.order_by(*_reverse_ordering(self.ordering))
+        else:
+            queryset = queryset.order_by(*self.ordering)
+
+        if current_position is not None:
+            queryset = queryset.filter(
+                self._position_filter(queryset.model, current_position, reverse)
+            )
+
+        results = list(queryset[offset : offset + self.page_size + 1])
+        self.page = list(results[: self.page_size])
+
+        if len(results) > len(self.page):
+            has_following_position = True
+            following_position = self._get_position_from_instance(
+                results[-1], self.ordering
+            )
+        else:
+            has_following_position = False
+            following_position = None
+
+        if reverse:
+            self.page = list(reversed(self.page))
+            self.has_next = (current_position is not None) or (offset > 0)
+            self.has_previous = has_following_position
+            if self.has_next:
+                self.next_position = current_position
+            if self.has_previous:
+                self.previous_position = following_position
+        else:
+            self.has_next = has_following_position
+            self.has_previous = (current_position is not None) or (offset > 0)
+            if self.has_next:
+                self.next_position = following_position
+            if self.has_previous:
+                self.previous_position = current_position
+
+        if (self.has_previous or self.has_next) and self.template is not None:
+            self.display_page_controls = True
+
+        return self.page
+
+
+class CreatedAtCursorPagination(KeysetCursorPagination):
+    """
+    Keyset pagination over (-created_at, -id).
+    The cursor encodes the last seen (created_at, id), so every page is a
+    bounded index range scan no matter how deep it is (no OFFSET).
+    """
+
+    page_size = 20
+    page_size_query_param = "page_size"
+    max_page_size = 100
+    ordering = ("-created_at", "-id")
+
+
+class BookingDateCursorPagination(CreatedAtCursorPagination):
+    """Keyset pagination over (-booking_date, -id) for reservation lists."""
+
+    ordering = ("-booking_date", "-id")
+
+
+class PriceCursorPagination(CreatedAtCursorPagination):
+    """Keyset pagination over (price_per_night, id) for room lists."""
+
+    ordering = ("price_per_night", "id")
+
+
+class KeysetUnion:
+    """
+    The union of several querysets, for the cursor paginations above.
+
+    order_by(), filter() and slicing are applied to every branch, so a page
+    is fetched as
+        (branch ORDER BY .. LIMIT n) UNION (branch ...) ORDER BY .. LIMIT n
+    and each branch stays an index range scan, where a single OR'd filter
+    would have no one index to walk in order.
+    """
+
+    def __init__(self, *querysets, ordering=()):
+        self.querysets = querysets
+        self.ordering = ordering
+        self.model = querysets[0].model
+
+    def order_by(self, *ordering):
+        return KeysetUnion(
+            *(queryset.order_by(*ordering) for queryset in self.querysets),
+            ordering=ordering,
+        )
+
+    def filter(self, *args, **kwargs):
+        return KeysetUnion(
+            *(queryset.filter(*args, **kwargs) for queryset in self.querysets),
+            ordering=self.ordering,
+        )
+
+    def __getitem__(self, k):
+        if not isinstance(k, slice) or k.stop is None or k.step:
+            raise TypeError("KeysetUnion only supports bounded slices.")
+        first, *rest = (queryset[: k.stop] for queryset in self.querysets)
+        return first.union(*rest).order_by(*self.ordering)[k]
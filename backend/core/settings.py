@@ -1,4 +1,5 @@
 from datetime import timedelta
+from celery.schedules import crontab
 from decouple import config, Csv
 from pathlib import Path
 import os
@@ -207,6 +208,30 @@ CELERY_TASK_SERIALIZER = "json"
 
 CELERY_BEAT_SCHEDULER = "django_celery_beat.schedulers:DatabaseScheduler"
 
+CELERY_BEAT_SCHEDULE = {
+    # Owner reports read these rollups, so they lag by at most 5 minutes.
+    "refresh-reservation-rollups": {
+        "task": "apps.reservations.tasks.refresh_reservation_rollups",
+        "schedule": 300.0,
+    },
+    # Nightly full rebuild also drops buckets of deleted reservations.
+    "rebuild-reservation-rollups": {
+        "task": "apps.reservations.tasks.refresh_reservation_rollups",
+        "schedule": crontab(hour=3, minute=30),
+        "kwargs": {"full": True},
+    },
+    # Flushes queued notifications whose scheduled dispatch was lost.
+    "dispatch-queued-notifications": {
+        "task": "apps.notifications.tasks.dispatch_queued_notifications",
+        "schedule": 60.0,
+    },
+    # Picks up hotels whose summary trigger was lost.
+    "summarize-pending-reviews": {
+        "task": "apps.reviews.tasks.summarize_pending_reviews",
+        "schedule": crontab(minute=0),
+    },
+}
+
 
 # sendign email
 
@@ -271,4 +296,22 @@ CACHES = {
     }
 }
 
+# Per-process LRU tier in front of Redis for get_or_set(local=True).
+# Set the size to 0 to disable it.
+SIMPLE_CACHE_LOCAL_MAX_ENTRIES = config(
+    "SIMPLE_CACHE_LOCAL_MAX_ENTRIES", default=256, cast=int
+)
+SIMPLE_CACHE_LOCAL_TIMEOUT = config("SIMPLE_CACHE_LOCAL_TIMEOUT", default=30, cast=int)
+
 GITHUB_TOKEN = config("GITHUB_TOKEN")
+
+# Review summaries are generated by Celery (apps.reviews.tasks) with this
+# backend; use apps.reviews.summarizers.StubSummarizer for tests/offline work.
+REVIEW_SUMMARIZER_BACKEND = config(
+    "REVIEW_SUMMARIZER_BACKEND",
+    default="apps.reviews.summarizers.AzureInferenceSummarizer",
+)
+# A new summary is queued once this many reviews arrived since the last one.
+REVIEW_SUMMARY_MIN_NEW_REVIEWS = config(
+    "REVIEW_SUMMARY_MIN_NEW_REVIEWS", default=5, cast=int
+)
@@ -1,8 +1,275 @@
-from locust import HttpUser, task, between
+"""
+Load-test scenarios for the booking funnel.
 
-class SimpleUser(HttpUser):
-    wait_time = between(1, 3)
+Seed the target first (the users below log in with these accounts):
 
-    @task
-    def load_home(self):
-        self.client.get("/")
\ No newline at end of file
+    python manage.py seed_loadtest --customers 200 --owners 5
+
+Traffic mix (weights are relative):
+- BrowsingUser: anonymous hotel list -> detail -> rooms with filters,
+  plus date-range room searches.
+- BookingCustomer: logs in with JWT, searches, then reserves one of a small
+  set of shared rooms on a narrow date window so requests really contend.
+  "Room taken" answers (the availability-check 400, matched on its
+  message, and 409 from the RoomNight constraint) are expected outcomes,
+  not errors, and are reported as FUNNEL entries; any other 400 fails. Some bookings are cancelled again to free inventory.
+- HotelOwner: reads the reservation list and the rollup reports.
+
+Requests are grouped with `name=` so each funnel step gets its own row, and
+a per-step summary (requests, failures, rps) is printed when the run ends.
+
+Note: with DEBUG=False DRF throttling is on (anon 10/min, user 30/min), so
+raise the rates on the target or 429s will dominate the results.
+
+Environment: LOCUST_CUSTOMERS, LOCUST_OWNERS, LOCUST_PASSWORD must match the
+seed command; LOCUST_CONTENDED_ROOMS sets how many rooms bookings compete for.
+"""
+
+import os
+import random
+from datetime import date, timedelta
+
+from locust import HttpUser, between, events, task
+from locust.runners import WorkerRunner
+
+CUSTOMERS = int(os.getenv("LOCUST_CUSTOMERS", 200))
+OWNERS = int(os.getenv("LOCUST_OWNERS", 5))
+PASSWORD = os.getenv("LOCUST_PASSWORD", "loadtest-pass")
+CONTENDED_ROOMS = int(os.getenv("LOCUST_CONTENDED_ROOMS", 10))
+CITIES = ["Tehran", "Shiraz", "Isfahan", "Tabriz", "Mashhad", "Kish"]
+
+HOTELS_URL = "/hotel/api/v1/hotels/"
+SEARCH_URL = "/hotel/api/v1/rooms/search/"
+TOKEN_URL = "/accounts/api/v1/token/"
+RESERVATIONS_URL = "/reservations/api/v1/"
+
+# Availability error of ReservationCreateSerializer; other 400s are failures.
+ROOM_TAKEN_MESSAGE = "not available for the selected date range"
+
+# Room ids discovered once per worker process and shared by its users.
+_room_ids = []
+
+
+def funnel(name, exception=None):
+    """Record a business outcome as its own row in the locust stats."""
+    events.request.fire(
+        request_type="FUNNEL",
+        name=name,
+        response_time=0,
+        response_length=0,
+        exception=exception,
+        context={},
+    )
+
+
+def stay(window_days=14, offset_days=30):
+    """A 1-3 night stay inside a narrow window, so bookings overlap."""
+    check_in = date.today() + timedelta(
+        days=offset_days + random.randrange(window_days)
+    )
+    check_out = check_in + timedelta(days=random.randint(1, 3))
+    return check_in.isoformat(), check_out.isoformat()
+
+
+class BrowsingUser(HttpUser):
+    weight = 6
+    wait_time = between(1, 4)
+
+    def on_start(self):
+        self.hotel_ids = []
+
+    @task(4)
+    def list_hotels(self):
+        params = {}
+        if random.random() < 0.5:
+            params["location__city"] = random.choice(CITIES)
+        with self.client.get(
+            HOTELS_URL, params=params, name="browse: hotel list", catch_response=True
+        ) as response:
+            if response.status_code != 200:
+                response.failure(f"status {response.status_code}")
+                return
+            self.hotel_ids = [hotel["id"] for hotel in response.json()["results"]]
+
+    @task(3)
+    def hotel_detail_and_rooms(self):
+        if not self.hotel_ids:
+            return self.list_hotels()
+        hotel_id = random.choice(self.hotel_ids)
+        self.client.get(f"{HOTELS_URL}{hotel_id}/", name="browse: hotel detail")
+        params = random.choice(
+            [
+                {},
+                {"min_price": 80, "max_price": 150},
+                {"min_capacity": 2},
+                {"room_type": "Suite"},
+                {"ordering": "-price_per_night"},
+            ]
+        )
+        self.client.get(
+            f"{HOTELS_URL}{hotel_id}/rooms/", params=params, name="browse: rooms"
+        )
+
+    @task(2)
+    def search_rooms(self):
+        check_in, check_out = stay()
+        self.client.get(
+            SEARCH_URL,
+            params={
+                "check_in": check_in,
+                "check_out": check_out,
+                "city": random.choice(CITIES),
+                "guests": random.randint(1, 3),
+            },
+            name="browse: room search",
+        )
+
+
+class AuthenticatedUser(HttpUser):
+    abstract = True
+    email_template = None
+    accounts = 1
+
+    def on_start(self):
+        email = self.email_template.format(random.randrange(self.accounts))
+        with self.client.post(
+            TOKEN_URL,
+            json={"email": email, "password": PASSWORD},
+            name="auth: token",
+            catch_response=True,
+        ) as response:
+            if response.status_code != 200:
+                response.failure(f"login failed for {email}: {response.status_code}")
+                self.stop()
+                return
+            token = response.json()["access"]
+        self.client.headers["Authorization"] = f"Bearer {token}"
+
+
+class BookingCustomer(AuthenticatedUser):
+    weight = 3
+    wait_time = between(2, 5)
+    email_template = "loadtest-customer-{}@example.com"
+    accounts = CUSTOMERS
+
+    def on_start(self):
+        super().on_start()
+        if not _room_ids:
+            self._discover_rooms()
+
+    def _discover_rooms(self):
+        response = self.client.get(HOTELS_URL, name="booking: discover rooms")
+        if response.status_code != 200:
+            return
+        for hotel in response.json()["results"]:
+            rooms = self.client.get(
+                f"{HOTELS_URL}{hotel['id']}/rooms/", name="booking: discover rooms"
+            )
+            if rooms.status_code == 200:
+                _room_ids.extend(room["id"] for room in rooms.json()["results"])
+            if len(_room_ids) >= CONTENDED_ROOMS:
+                break
+        del _room_ids[CONTENDED_ROOMS:]
+
+    @task(5)
+    def search_and_reserve(self):
+        if not _room_ids:
+            return
+        check_in, check_out = stay()
+        self.client.get(
+            SEARCH_URL,
+            params={"check_in": check_in, "check_out": check_out},
+            name="booking: search",
+        )
+        room_id = random.choice(_room_ids)
+        with self.client.post(
+            f"{RESERVATIONS_URL}rooms/{room_id}/reserve/",
+            json={
+                "room": room_id,
+                "checking_date": check_in,
+                "checkout_date": check_out,
+                "prefered_payment_method": "Prepaid",
+                "coupon_code": "",
+            },
+            name="booking: reserve",
+            catch_response=True,
+        ) as response:
+            if response.status_code == 201:
+                funnel("reserve: booked")
+            elif response.status_code == 409 or (
+                response.status_code == 400 and ROOM_TAKEN_MESSAGE in response.text
+            ):
+                # Someone else got the nights first: expected under contention.
+                response.success()
+                funnel(f"reserve: room taken ({response.status_code})")
+            else:
+                # Any other 400 is a real validation error (payload, payment).
+                response.failure(f"status {response.status_code}: {response.text}")
+
+    @task(2)
+    def cancel_latest(self):
+        response = self.client.get(f"{RESERVATIONS_URL}my/", name="booking: my list")
+        if response.status_code != 200:
+            return
+        cancellable = [
+            reservation
+            for reservation in response.json()["results"]
+            if reservation.get("booking_status") in ("pending", "confirmed")
+        ]
+        if not cancellable:
+            return
+        reservation = cancellable[0]
+        with self.client.post(
+            f"{RESERVATIONS_URL}{reservation['id']}/cancel/",
+            name="booking: cancel",
+            catch_response=True,
+        ) as cancel:
+            if cancel.status_code == 200:
+                funnel("cancel: released")
+            else:
+                cancel.failure(f"status {cancel.status_code}")
+
+
+class HotelOwner(AuthenticatedUser):
+    weight = 1
+    wait_time = between(3, 8)
+    email_template = "loadtest-owner-{}@example.com"
+    accounts = OWNERS
+
+    @task(3)
+    def reservations(self):
+        self.client.get(f"{RESERVATIONS_URL}owner/", name="owner: reservations")
+
+    @task(2)
+    def daily_report(self):
+        start = (date.today() - timedelta(days=30)).isoformat()
+        self.client.get(
+            f"{RESERVATIONS_URL}report/",
+            params={"start_date": start},
+            name="owner: daily report",
+        )
+
+    @task(1)
+    def other_reports(self):
+        self.client.get(f"{RESERVATIONS_URL}report/monthly/", name="owner: monthly")
+        self.client.get(f"{RESERVATIONS_URL}report/by-room/", name="owner: by room")
+
+
+@events.quitting.add_listener
+def print_funnel_summary(environment, **kwargs):
+    """Per-step throughput and error rate, aggregated on the master."""
+    if isinstance(environment.runner, WorkerRunner):
+        return
+    stats = environment.stats
+    rows = sorted(stats.entries.values(), key=lambda entry: entry.name)
+    print(f"\n{'step':<40}{'requests':>10}{'failures':>10}{'fail %':>8}{'rps':>8}")
+    for entry in rows:
+        print(
+            f"{entry.name:<40}{entry.num_requests:>10}{entry.num_failures:>10}"
+            f"{100 * entry.fail_ratio:>7.1f}%{entry.total_rps:>8.2f}"
+        )
+    total = stats.total
+    print(
+        f"{'total':<40}{total.num_requests:>10}{total.num_failures:>10}"
+        f"{100 * total.fail_ratio:>7.1f}%{total.total_rps:>8.2f}"
+    )
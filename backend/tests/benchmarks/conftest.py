@@ -0,0 +1,82 @@
+"""
+Query-count and latency budgets for the API endpoints.
+
+    pytest tests/benchmarks                                  # query budgets
+    BENCHMARK_OUTPUT=bench.json pytest tests/benchmarks      # record p50/p95
+    BENCHMARK_BASELINE=bench.json pytest tests/benchmarks    # compare p95
+
+BENCHMARK_SCALE multiplies the seeded data volume (default 1),
+BENCHMARK_ITERATIONS sets the timed requests per endpoint (default 10, at
+least 2, which the p95 quantiles need) and
+BENCHMARK_TOLERANCE the allowed p95 slowdown against the baseline (default 1.5).
+"""
+
+import json
+import os
+
+import pytest
+from django.core.cache import cache
+from django.db import transaction
+from rest_framework.views import APIView
+
+from .seed import seed
+
+RESULTS = {}
+
+
+def _env(name, default, cast=str):
+    return cast(os.environ.get(name, default))
+
+
+@pytest.fixture(scope="module")
+def bench_data(django_db_setup, django_db_blocker):
+    """
+    Seeds the data set once per module inside a transaction that is rolled
+    back afterwards, so the rows never leak into other test modules.
+    """
+    with django_db_blocker.unblock():
+        with transaction.atomic():
+            yield seed(scale=_env("BENCHMARK_SCALE", 1, int))
+            transaction.set_rollback(True)
+
+
+@pytest.fixture(autouse=True)
+def no_throttling(monkeypatch):
+    # Timed loops would trip the anon/user rate limits.
+    monkeypatch.setattr(APIView, "throttle_classes", [])
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.fixture(scope="session")
+def benchmark_settings():
+    baseline_path = _env("BENCHMARK_BASELINE", "")
+    baseline = {}
+    if baseline_path and os.path.exists(baseline_path):
+        with open(baseline_path) as fh:
+            baseline = json.load(fh)
+    return {
+        "iterations": max(_env("BENCHMARK_ITERATIONS", 10, int), 2),
+        "tolerance": _env("BENCHMARK_TOLERANCE", 1.5, float),
+        "baseline": baseline,
+    }
+
+
+@pytest.fixture
+def record_latency():
+    def record(name, stats):
+        RESULTS[name] = stats
+
+    return record
+
+
+def pytest_sessionfinish(session, exitstatus):
+    output = os.environ.get("BENCHMARK_OUTPUT")
+    if output and RESULTS:
+        with open(output, "w") as fh:
+            json.dump(RESULTS, fh, indent=2, sort_keys=True)
@@ -0,0 +1,114 @@
+from datetime import date, timedelta
+from decimal import Decimal
+from types import SimpleNamespace
+
+from apps.accounts.tests.factories import HotelOwnerProfileFactory, UserFactory
+from apps.hotel.tests.factories import (
+    HotelImageFactory,
+    HotelLocationFactory,
+    RoomFactory,
+    RoomImageFactory,
+)
+from apps.notifications.models import Notification
+from apps.reservations.models import BookingStatus, Reservation
+from apps.reservations.services import refresh_daily_rollups
+from apps.reviews.models import Review
+from apps.reviews.services import refresh_review_summary
+from apps.reviews.summarizers import StubSummarizer
+
+CITIES = ["Shiraz", "Tehran", "Isfahan", "Tabriz", "Mashhad"]
+
+
+def _user(role, n):
+    # UserFactory's phone sequence wraps after 10 users, so pass unique ones.
+    return UserFactory(
+        role=role, email=f"{role}{n}@bench.test", phone_number=f"0930{n:07d}"
+    )
+
+
+def seed(scale=1):
+    """
+    Seeds a realistic data set with the app factories and returns the objects
+    the endpoint specs need. `scale` multiplies hotels, guests and rows.
+    """
+    owner = _user("hotel_owner", 0)
+    HotelOwnerProfileFactory(user=owner, is_verified=True)
+    customer = _user("customer", 1)
+    guests = [_user("customer", 100 + n) for n in range(8 * scale)]
+
+    hotels, rooms = [], []
+    start = date(2030, 1, 1)
+    for h in range(5 * scale):
+        hotel = HotelLocationFactory(
+            hotel__owner=owner, city=CITIES[h % len(CITIES)]
+        ).hotel
+        hotels.append(hotel)
+        for r in range(4):
+            room = RoomFactory(hotel=hotel, price_per_night=Decimal(100 + 10 * r))
+            rooms.append(room)
+            for k in range(3):
+                guest = guests[(h + r + k) % len(guests)]
+                check_in = start + timedelta(days=3 * k)
+                Reservation.objects.create(
+                    user=guest.customer_profile,
+                    room=room,
+                    checking_date=check_in,
+                    checkout_date=check_in + timedelta(days=2),
+                    nights=2,
+                    total_price=room.price_per_night * 2,
+                    booking_status=(
+                        BookingStatus.CONFIRMED if k % 2 == 0 else BookingStatus.PENDING
+                    ),
+                )
+        for n in range(4):
+            parent = Review.objects.create(
+                hotel=hotel,
+                user=guests[n % len(guests)],
+                rating=1 + n % 5,
+                comment="Clean rooms, friendly staff and a great breakfast.",
+            )
+            for _ in range(2):
+                Review.objects.create(
+                    hotel=hotel,
+                    user=owner,
+                    parent=parent,
+                    rating=5,
+                    comment="Thank you for staying with us!",
+                )
+
+    reservation = Reservation.objects.create(
+        user=customer.customer_profile,
+        room=rooms[0],
+        checking_date=start + timedelta(days=20),
+        checkout_date=start + timedelta(days=22),
+        nights=2,
+        total_price=rooms[0].price_per_night * 2,
+        booking_status=BookingStatus.CONFIRMED,
+    )
+    Notification.objects.bulk_create(
+        [
+            Notification(
+                user=customer, message=f"Notice {n}", notification_type="custom"
+            )
+            for n in range(20 * scale)
+        ]
+        + [
+            Notification(
+                message=f"Announcement {n}", notification_type="custom", is_global=True
+            )
+            for n in range(5)
+        ]
+    )
+    hotel_image = HotelImageFactory(hotel=hotels[0])
+    RoomImageFactory(room=rooms[0])
+    refresh_daily_rollups()
+    refresh_review_summary(hotels[0].id, summarizer=StubSummarizer())
+
+    return SimpleNamespace(
+        owner=owner,
+        customer=customer,
+        hotel=hotels[0],
+        room=rooms[0],
+        reservation=reservation,
+        hotel_image=hotel_image,
+    )
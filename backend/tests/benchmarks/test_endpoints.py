@@ -0,0 +1,271 @@
+import statistics
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Optional
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+
+@dataclass
+class Endpoint:
+    name: str
+    url: Callable  # data -> path
+    max_queries: int
+    user: Optional[str] = None  # attribute of the seeded data to log in as
+    params: dict = field(default_factory=dict)
+    marks: tuple = ()
+
+
+# Every GET endpoint in core/urls.py. Not benchmarked: endpoints that write
+# (token, registration, activation, password, bookings, notification sends
+# and read marks), since repeating them changes the data or sends mail, and
+# the notification stream, which never ends and needs an ASGI server.
+ENDPOINTS = [
+    Endpoint(
+        "accounts-overview",
+        lambda d: "/accounts/api/v1/",
+        max_queries=0,
+    ),
+    Endpoint(
+        "user-dashboard",
+        lambda d: reverse("accounts:api_v1:user_dashboard"),
+        max_queries=2,  # profile + its reservations
+        user="customer",
+    ),
+    Endpoint(
+        "customer-profile",
+        lambda d: reverse("accounts:api_v1:customer_profile"),
+        max_queries=1,
+        user="customer",
+    ),
+    Endpoint(
+        "hotel-owner-profile",
+        lambda d: reverse("accounts:api_v1:hotel-owner-profile"),
+        max_queries=1,
+        user="owner",
+    ),
+    Endpoint(
+        "hotel-overview",
+        lambda d: reverse("hotel:api_v1:api-overview"),
+        max_queries=0,
+    ),
+    Endpoint(
+        "hotel-list",
+        lambda d: reverse("hotel:api_v1:hotel-list-create"),
+        max_queries=3,
+    ),
+    Endpoint(
+        "hotel-detail",
+        lambda d: reverse("hotel:api_v1:hotel-detail", args=[d.hotel.id]),
+        max_queries=3,
+    ),
+    Endpoint(
+        "hotel-images",
+        lambda d: reverse("hotel:api_v1:hotel-image-list-create", args=[d.hotel.id]),
+        max_queries=1,
+    ),
+    Endpoint(
+        "hotel-image-detail",
+        lambda d: reverse(
+            "hotel:api_v1:hotel-image-detail", args=[d.hotel.id, d.hotel_image.id]
+        ),
+        max_queries=1,
+    ),
+    Endpoint(
+        "hotel-location",
+        lambda d: reverse("hotel:api_v1:hotel-location", args=[d.hotel.id]),
+        max_queries=1,
+        user="owner",
+    ),
+    Endpoint(
+        "hotel-location-detail",
+        lambda d: reverse(
+            "hotel:api_v1:hotel-location-detail", args=[d.hotel.id, d.hotel.location.id]
+        ),
+        max_queries=1,
+    ),
+    Endpoint(
+        "hotel-amenities",
+        lambda d: reverse(
+            "hotel:api_v1:hotel-amenities-list", kwargs={"hotel_id": d.hotel.id}
+        ),
+        max_queries=2,  # the hotel + its amenities
+    ),
+    Endpoint(
+        "room-list",
+        lambda d: reverse("hotel:api_v1:room-list-create", args=[d.hotel.id]),
+        max_queries=1,
+    ),
+    Endpoint(
+        "room-detail",
+        lambda d: reverse("hotel:api_v1:room-detail", args=[d.room.slug]),
+        max_queries=3,
+    ),
+    Endpoint(
+        "room-images",
+        lambda d: reverse("hotel:api_v1:room-images", args=[d.room.id]),
+        max_queries=1,
+    ),
+    Endpoint(
+        "room-search",
+        lambda d: reverse("hotel:api_v1:room-search"),
+        max_queries=1,
+        params={"check_in": "2030-01-01", "check_out": "2030-01-03", "guests": 1},
+    ),
+    Endpoint(
+        "owner-hotels",
+        lambda d: reverse("hotel:api_v1:my-hotels"),
+        max_queries=3,
+        user="owner",
+    ),
+    Endpoint(
+        "reservations-overview",
+        lambda d: reverse("reservations:v1:api-overview"),
+        max_queries=0,
+    ),
+    Endpoint(
+        "user-reservations",
+        lambda d: reverse("reservations:v1:user-reservations"),
+        max_queries=1,
+        user="customer",
+    ),
+    Endpoint(
+        "owner-reservations",
+        lambda d: reverse("reservations:v1:owner-reservations"),
+        max_queries=1,
+        user="owner",
+    ),
+    Endpoint(
+        "reservation-invoice",
+        lambda d: reverse(
+            "reservations:v1:reservation-invoice", args=[d.reservation.id]
+        ),
+        max_queries=1,
+        user="customer",
+    ),
+    Endpoint(
+        "report-daily",
+        lambda d: reverse("reservations:v1:reservation-report"),
+        max_queries=1,
+        user="owner",
+    ),
+    Endpoint(
+        "report-monthly",
+        lambda d: reverse("reservations:v1:monthly-reservation-report"),
+        max_queries=1,
+        user="owner",
+    ),
+    Endpoint(
+        "report-by-room",
+        lambda d: reverse("reservations:v1:room-wise-report"),
+        max_queries=1,
+        user="owner",
+    ),
+    Endpoint(
+        "owner-reservations-export",
+        lambda d: reverse("reservations:v1:owner-reservations-export"),
+        max_queries=1,
+        user="owner",
+    ),
+    Endpoint(
+        "report-export",
+        lambda d: reverse("reservations:v1:reservation-report-export"),
+        max_queries=1,
+        user="owner",
+    ),
+    Endpoint(
+        "reviews-overview",
+        lambda d: "/reviews/api/v1/",
+        max_queries=0,
+    ),
+    Endpoint(
+        "hotel-reviews",
+        lambda d: f"/reviews/api/v1/hotel/{d.hotel.id}/list/",
+        max_queries=2,
+    ),
+    Endpoint(
+        "hotel-reviews-summary",
+        lambda d: f"/reviews/api/v1/hotel/{d.hotel.id}/summary/",
+        max_queries=1,
+    ),
+    Endpoint(
+        "notifications-overview",
+        lambda d: reverse("notifications:api-overview"),
+        max_queries=0,
+    ),
+    Endpoint(
+        "notifications",
+        lambda d: reverse("notifications:list-notifications"),
+        max_queries=2,  # + the user's global read state
+        user="customer",
+    ),
+    Endpoint(
+        "notifications-unread-count",
+        lambda d: reverse("notifications:unread-notification-count"),
+        max_queries=3,  # cold counter: personal, read state, global
+        user="customer",
+    ),
+]
+
+
+# Statements issued by the profiler middleware (silk) or by transactions.
+NOISE_PREFIXES = ("EXPLAIN", "SAVEPOINT", "RELEASE SAVEPOINT")
+
+
+def _app_queries(context):
+    return [
+        q["sql"]
+        for q in context.captured_queries
+        if "silk_" not in q["sql"] and not q["sql"].startswith(NOISE_PREFIXES)
+    ]
+
+
+def _get(client, url, params):
+    response = client.get(url, params)
+    if response.streaming:
+        b"".join(response.streaming_content)
+    return response
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "endpoint",
+    [pytest.param(e, id=e.name, marks=e.marks) for e in ENDPOINTS],
+)
+def test_endpoint_budget(endpoint, bench_data, benchmark_settings, record_latency):
+    client = APIClient()
+    if endpoint.user:
+        client.force_authenticate(user=getattr(bench_data, endpoint.user))
+    url = endpoint.url(bench_data)
+
+    # Cold call (empty cache) is the one held to the query budget.
+    with CaptureQueriesContext(connection) as context:
+        response = _get(client, url, endpoint.params)
+    assert response.status_code == 200, response.content[:500]
+    queries = _app_queries(context)
+    assert len(queries) <= endpoint.max_queries, "\n".join(queries)
+
+    timings = []
+    for _ in range(benchmark_settings["iterations"]):
+        started = time.perf_counter()
+        _get(client, url, endpoint.params)
+        timings.append((time.perf_counter() - started) * 1000)
+    cuts = statistics.quantiles(timings, n=20, method="inclusive")
+    stats = {
+        "p50_ms": round(statistics.median(timings), 3),
+        "p95_ms": round(cuts[18], 3),
+        "queries": len(queries),
+    }
+    record_latency(endpoint.name, stats)
+
+    baseline = benchmark_settings["baseline"].get(endpoint.name)
+    if baseline:
+        allowed = baseline["p95_ms"] * benchmark_settings["tolerance"]
+        assert stats["p95_ms"] <= allowed, (
+            f"p95 {stats['p95_ms']}ms exceeds baseline {baseline['p95_ms']}ms "
+            f"x{benchmark_settings['tolerance']}"
+        )